@@ -1,24 +1,191 @@
-from fastapi import APIRouter, Response
-from app.utils.time import last_24h_window
-from app.services.storage.loader import load_last_24h
-from app.services.processing.signals import compute_composite
-from app.services.processing.visualize import plot_signal
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from app.config import SIGNAL_MAX_BUCKETS
+from app.utils.time import as_utc, last_24h_window
+from app.services.executors import run_cpu, run_io
+from app.services.response_cache import cached_response
+from app.services.storage.signal_store import (
+    bucket_seconds,
+    load_signal_stats,
+    source_level,
+)
+from app.services.storage.export import EXPORT_FORMATS, encode_batches
+from app.services.storage.loader import scan_window
+from app.services.storage.tag_index import scan_tagged, tag_filters
+from app.services.processing.signals import (
+    BREAKDOWN_COLUMNS,
+    SIGNAL_BUCKET,
+    SIGNAL_COLUMNS,
+    compute_breakdown,
+    compute_composite,
+    finalize_stats,
+)
+from app.services.processing.downsample import downsample
+from app.services.processing.visualize import SIGNAL_FORMATS, plot_signal
 
 router = APIRouter(prefix="/analyze", tags=["analyze"])
 
 
+@dataclass
+class SignalWindow:
+    since: Optional[datetime]
+    until: Optional[datetime]
+    bucket: str
+    hashtag: Optional[str] = None
+    mention: Optional[str] = None
+
+    @property
+    def rolling(self) -> bool:
+        return self.until is None
+
+    def filters(self) -> dict:
+        return tag_filters(self.hashtag, self.mention)
+
+    def params(self) -> dict:
+        return {
+            "since": self.since and self.since.isoformat(),
+            "until": self.until and self.until.isoformat(),
+            "bucket": self.bucket,
+            **self.filters(),
+        }
+
+    def resolve(self):
+        since_utc, until_utc = last_24h_window()
+        until_utc = self.until or until_utc
+        since_utc = self.since or until_utc - timedelta(hours=24)
+        return since_utc, until_utc
+
+
+def signal_window(
+    since: Optional[datetime] = Query(None, description="Window start (UTC)"),
+    until: Optional[datetime] = Query(None, description="Window end (UTC)"),
+    bucket: str = Query(SIGNAL_BUCKET, pattern=r"^\d+[mhd]$"),
+    hashtag: Optional[str] = Query(None, description="Only tweets with this tag"),
+    mention: Optional[str] = Query(
+        None, description="Only tweets mentioning this account"
+    ),
+) -> SignalWindow:
+    window = SignalWindow(as_utc(since), as_utc(until), bucket, hashtag, mention)
+    since_utc, until_utc = window.resolve()
+    if since_utc >= until_utc:
+        raise HTTPException(status_code=422, detail="since must be before until")
+    try:
+        step = bucket_seconds(bucket)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if source_level(bucket) is None:
+        raise HTTPException(status_code=422, detail=f"bucket {bucket} is too fine")
+    if (until_utc - since_utc).total_seconds() / step > SIGNAL_MAX_BUCKETS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"window spans more than {SIGNAL_MAX_BUCKETS} {bucket} buckets",
+        )
+    return window
+
+
+def _window_signal(window: SignalWindow):
+    since_utc, until_utc = window.resolve()
+    filters = window.filters()
+    if filters:
+        # Per-tag signals come straight from the rows the tag index points at
+        tagged = scan_tagged(since_utc, until_utc, filters, SIGNAL_COLUMNS)
+        return compute_composite(tagged, every=window.bucket)
+    stats = load_signal_stats(since_utc, until_utc, window.bucket)
+    if stats.is_empty():
+        return stats
+    return finalize_stats(stats)
+
+
 @router.get("/signal")
-async def signal_json():
-    since_utc, until_utc = last_24h_window()
-    df = load_last_24h(since_utc, until_utc)
-    comp = compute_composite(df)
-    return comp.to_dict(as_series=False)
+async def signal_json(
+    request: Request,
+    max_points: Optional[int] = Query(None, ge=4, le=20000),
+    method: str = Query("lttb", pattern="^(lttb|minmax)$"),
+    fmt: str = Query("json", alias="format", pattern="^(json|arrow|parquet|ndjson)$"),
+    window: SignalWindow = Depends(signal_window),
+):
+    async def compute():
+        comp = await run_io(_window_signal, window)
+        if max_points is not None:
+            comp = downsample(comp, max_points, method)
+        if fmt != "json":
+            # The series is small and cached whole; only its encoding is shared
+            # with the bulk export
+            table = comp.to_arrow()
+            body = b"".join(encode_batches(table.to_batches(), table.schema, fmt))
+            return body, EXPORT_FORMATS[fmt][0]
+        body = JSONResponse(jsonable_encoder(comp.to_dict(as_series=False))).body
+        return body, "application/json"
+
+    params = {
+        "max_points": max_points,
+        "method": method,
+        "format": fmt,
+        **window.params(),
+    }
+    return await cached_response(
+        request, "signal", params, compute, rolling=window.rolling
+    )
+
+
+def _window_breakdown(window: SignalWindow, by: str, top_k: int) -> dict:
+    since_utc, until_utc = window.resolve()
+    columns = [*SIGNAL_COLUMNS, BREAKDOWN_COLUMNS[by]]
+    filters = window.filters()
+    if filters:
+        tweets = scan_tagged(since_utc, until_utc, filters, columns)
+    else:
+        tweets = scan_window(since_utc, until_utc, columns)
+    comp = compute_breakdown(tweets, by, window.bucket, top_k)
+    series = []
+    if not comp.is_empty():
+        for sub in comp.partition_by("key", maintain_order=True):
+            series.append(
+                {
+                    "key": sub["key"][0],
+                    "total": int(sub["total"][0]),
+                    **sub.drop(["key", "total"]).to_dict(as_series=False),
+                }
+            )
+    return {"by": by, "bucket": window.bucket, "series": series}
+
+
+@router.get("/signal/breakdown")
+async def signal_breakdown(
+    request: Request,
+    by: str = Query("hashtag", pattern="^(hashtag|author)$"),
+    top_k: int = Query(10, ge=1, le=100, description="Most active keys kept"),
+    window: SignalWindow = Depends(signal_window),
+):
+    async def compute():
+        body = await run_cpu(_window_breakdown, window, by, top_k)
+        return JSONResponse(jsonable_encoder(body)).body, "application/json"
+
+    params = {"by": by, "top_k": top_k, **window.params()}
+    return await cached_response(
+        request, "signal.breakdown", params, compute, rolling=window.rolling
+    )
+
+
+async def _signal_chart(request: Request, fmt: str, window: SignalWindow):
+    async def compute():
+        comp = await run_io(_window_signal, window)
+        return await run_cpu(plot_signal, comp, fmt), SIGNAL_FORMATS[fmt]
+
+    return await cached_response(
+        request, f"signal.{fmt}", window.params(), compute, rolling=window.rolling
+    )
 
 
 @router.get("/signal.png")
-async def signal_png():
-    since_utc, until_utc = last_24h_window()
-    df = load_last_24h(since_utc, until_utc)
-    comp = compute_composite(df)
-    png = plot_signal(comp)
-    return Response(content=png, media_type="image/png")
+async def signal_png(request: Request, window: SignalWindow = Depends(signal_window)):
+    return await _signal_chart(request, "png", window)
+
+
+@router.get("/signal.svg")
+async def signal_svg(request: Request, window: SignalWindow = Depends(signal_window)):
+    return await _signal_chart(request, "svg", window)
@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from app.utils.time import as_utc, last_24h_window
+from app.services.storage.export import (
+    EXPORT_FORMATS,
+    encode_batches,
+    export_schema,
+    window_batches,
+)
+from app.services.storage.schema import TWEET_SCHEMA
+from app.services.storage.tag_index import tag_filters
+
+router = APIRouter(prefix="/data", tags=["data"])
+
+
+@router.get("/tweets")
+async def export_tweets(
+    fmt: str = Query("ndjson", alias="format", pattern="^(arrow|parquet|ndjson)$"),
+    since: Optional[datetime] = Query(None, description="Window start (UTC)"),
+    until: Optional[datetime] = Query(None, description="Window end (UTC)"),
+    hashtag: Optional[str] = Query(None, description="Only tweets with this tag"),
+    mention: Optional[str] = Query(
+        None, description="Only tweets mentioning this account"
+    ),
+    columns: Optional[str] = Query(
+        None, description="Comma-separated columns (default: all)"
+    ),
+):
+    until_utc = as_utc(until) or last_24h_window()[1]
+    since_utc = as_utc(since) or until_utc - timedelta(hours=24)
+    if since_utc >= until_utc:
+        raise HTTPException(status_code=422, detail="since must be before until")
+    cols = [c.strip() for c in columns.split(",") if c.strip()] if columns else None
+    unknown = sorted(set(cols or []) - set(TWEET_SCHEMA.names()))
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"unknown columns: {unknown}")
+
+    media_type, ext = EXPORT_FORMATS[fmt]
+    batches = window_batches(since_utc, until_utc, cols, tag_filters(hashtag, mention))
+    # A plain generator: Starlette iterates it in the thread pool, reading
+    # and encoding one batch at a time as the client drains the response
+    return StreamingResponse(
+        encode_batches(batches, export_schema(cols), fmt),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="tweets.{ext}"'},
+    )
@@ -1,4 +1,6 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+from app.deps import get_backend
+from app.services.response_cache import response_cache
 
 router = APIRouter(prefix="/health", tags=["health"])
 
@@ -6,3 +8,13 @@ router = APIRouter(prefix="/health", tags=["health"])
 @router.get("")
 async def health():
     return {"status": "ok"}
+
+
+@router.get("/browser")
+async def browser_health(backend=Depends(get_backend)):
+    return await backend.pool.health()
+
+
+@router.get("/cache")
+async def cache_health():
+    return response_cache.metrics()
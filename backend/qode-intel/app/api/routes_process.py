@@ -1,20 +1,35 @@
-from fastapi import APIRouter, Query
+from typing import Optional
+from fastapi import APIRouter, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from app.utils.time import last_24h_window
-from app.services.storage.loader import load_last_24h
-from app.services.processing.vectorize import build_tfidf
+from app.services.executors import run_cpu
+from app.services.response_cache import cached_response
+from app.services.storage.tag_index import tag_filters
+from app.services.storage.tfidf_store import window_tfidf_summary
 
 router = APIRouter(prefix="/process", tags=["process"])
 
 
 @router.post("/tfidf")
-async def build_vectors(max_features: int = Query(20000, ge=500, le=50000)):
-    since_utc, until_utc = last_24h_window()
-    df = load_last_24h(since_utc, until_utc)
-    vect, X = build_tfidf(df, max_features=max_features)
-    # Return only light metadata
-    return {
-        "docs": int(df.height),
-        "vocab_size": int(len(vect.vocabulary_)),
-        "shape": list(X.shape),
-        "sample_terms": list(sorted(list(vect.vocabulary_.keys()))[:10]),
-    }
+async def build_vectors(
+    request: Request,
+    max_features: int = Query(20000, ge=500, le=50000),
+    hashtag: Optional[str] = Query(None, description="Only tweets with this tag"),
+    mention: Optional[str] = Query(
+        None, description="Only tweets mentioning this account"
+    ),
+):
+    filters = tag_filters(hashtag, mention)
+
+    async def compute():
+        since_utc, until_utc = last_24h_window()
+        # Only parts without cached hashing features are vectorized here
+        summary = await run_cpu(
+            window_tfidf_summary, since_utc, until_utc, max_features, filters
+        )
+        return JSONResponse(jsonable_encoder(summary)).body, "application/json"
+
+    return await cached_response(
+        request, "tfidf", {"max_features": max_features, **filters}, compute
+    )
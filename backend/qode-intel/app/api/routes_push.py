@@ -0,0 +1,94 @@
+import asyncio
+import re
+from typing import List
+from fastapi import APIRouter, HTTPException, Query, Request, WebSocket
+from fastapi.responses import StreamingResponse
+from starlette.websockets import WebSocketDisconnect
+from app.config import PUSH_HEARTBEAT_SECONDS
+from app.services.broker import Subscription, broker
+
+router = APIRouter(prefix="/push", tags=["push"])
+
+TOPIC = re.compile(r"^(signal|jobs|job:[\w-]+)$")
+# Raised by receive/send once the client is gone, depending on who notices
+DISCONNECTED = (WebSocketDisconnect, RuntimeError, OSError)
+TOPICS_QUERY = Query(
+    "signal,jobs",
+    description="Comma-separated topics: signal, jobs (all jobs) or job:<id>",
+)
+
+
+def _topics(topics: str) -> List[str]:
+    wanted = [t.strip() for t in topics.split(",") if t.strip()]
+    bad = [t for t in wanted if not TOPIC.match(t)]
+    if not wanted or bad:
+        raise HTTPException(status_code=422, detail=f"bad topics: {bad or topics}")
+    return wanted
+
+
+async def _sse(request: Request, topics: List[str]):
+    # Subscribed only once the response streams: a client gone before the
+    # first chunk never leaves a mailbox behind
+    with broker.subscribe(topics) as sub:
+        yield b"retry: 3000\n\n"
+        while not await request.is_disconnected():
+            event = await sub.get(timeout=PUSH_HEARTBEAT_SECONDS)
+            # The heartbeat comment keeps proxies from closing idle streams
+            yield event.sse if event else b": ping\n\n"
+
+
+@router.get("/events")
+async def push_events(request: Request, topics: str = TOPICS_QUERY):
+    """Server-sent events: "signal" bucket deltas and job "progress"/"status"."""
+    return StreamingResponse(
+        _sse(request, _topics(topics)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _send(websocket: WebSocket, sub: Subscription):
+    while True:
+        event = await sub.get(timeout=PUSH_HEARTBEAT_SECONDS)
+        await websocket.send_text(event.ws if event else '{"event": "ping"}')
+
+
+async def _drain(websocket: WebSocket):
+    # Nothing is expected from the client; reading surfaces its close frame
+    while True:
+        await websocket.receive_text()
+
+
+@router.websocket("/ws")
+async def push_ws(websocket: WebSocket, topics: str = "signal,jobs"):
+    """The same events as /push/events over a WebSocket, as JSON messages."""
+    try:
+        wanted = _topics(topics)
+    except HTTPException as e:
+        await websocket.close(code=1008, reason=e.detail)
+        return
+    with broker.subscribe(wanted) as sub:
+        # Subscribed before the handshake completes: nothing published after
+        # the client sees the connection open is missed
+        await websocket.accept()
+        tasks = [
+            asyncio.create_task(_send(websocket, sub)),
+            asyncio.create_task(_drain(websocket)),
+        ]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                # A client going away surfaces as one of these; anything
+                # else is a bug
+                if not isinstance(task.exception(), DISCONNECTED):
+                    task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+@router.get("/stats")
+async def push_stats():
+    """Subscribers per topic and delivery counters"""
+    return broker.metrics()
@@ -1,22 +1,30 @@
+import asyncio
 import uuid
-from typing import Dict
-from fastapi import APIRouter, BackgroundTasks, Query, Depends, HTTPException
+from fastapi import APIRouter, Query, Depends, HTTPException, Request
 from app.config import SCRAPE_HASHTAGS, SCRAPE_MIN_TWEETS
-from app.utils.time import last_24h_window, utc_now
+from app.utils.time import last_24h_window
 from app.utils.logging import logger
-from app.services.processing.clean import clean_tweets
-from app.services.processing.dedupe import dedupe_tweets
-from app.services.storage.writer import to_polars_rows, write_parquet_partitioned
-from app.services.storage.paths import RAW_PATH
-from app.deps import get_backend
+from app.services.broker import broker
+from app.services.executors import run_cpu, run_io, run_io_shielded
+from app.services.processing.pipeline import clean_and_dedupe_tweets
+from app.services.storage.writer import write_parquet_partitioned
+from app.services.storage.signal_store import (
+    rollup_lock,
+    signal_delta,
+    update_signal_store,
+)
+from app.services.storage.dedup_index import get_dedup_index
+from app.services.storage.tfidf_store import update_tfidf_cache
+from app.services.storage.paths import PARQUET_PATH, RAW_PATH
+from app.services.jobs.ingest import ingest_stream
+from app.services.jobs.store import job_view
+from app.deps import get_backend, get_job_store
 import json
 
 from app.models.auth import LoginCredentials, LoginStatus
 
 router = APIRouter(prefix="/scrape", tags=["scrape"])
 
-JOBS: Dict[str, Dict] = {}
-
 
 @router.post("/login", response_model=LoginStatus)
 async def login(credentials: LoginCredentials, backend=Depends(get_backend)):
@@ -47,66 +55,131 @@ async def check_login_status(backend=Depends(get_backend)):
         return LoginStatus(is_logged_in=False, message=str(e))
 
 
-async def _run_job(job_id: str, hashtags, limit, backend):
-    JOBS[job_id]["status"] = "running"
-    try:
-        since_utc, until_utc = last_24h_window()
-        logger.info(f"Window UTC: {since_utc} → {until_utc}")
-
-        tweets = await backend.pw.scrape_async(hashtags, since_utc, until_utc, limit)
-
+def _append_raw(raw_file, tweets):
+    with raw_file.open("a", encoding="utf-8") as f:
+        for t in tweets:
+            f.write(json.dumps(t.model_dump(), ensure_ascii=False, default=str) + "\n")
+
+
+def _commit_batch(index, df, part_id: str):
+    """
+    Drop the tweets earlier batches and jobs already stored, retweets and
+    near-copies, claim the rest in the dedup index, write them as one part
+    and fold them into the signal rollups. One synchronous unit, so
+    cancelling the job cannot land between the claim, the write and the
+    rollup update.
+    """
+    df = index.filter_and_add(df)
+    # Held from the write to the merge: a rollup rebuild in between would
+    # count the part, and the merge would count it again
+    with rollup_lock():
+        try:
+            write_parquet_partitioned(df, job_id=part_id)
+        except BaseException:
+            # Nothing was stored: a retry must be able to take them again
+            index.forget(df)
+            raise
+        update_signal_store(df)
+    return df
+
+
+async def _run_job(job_id: str, hashtags, limit, backend, report) -> dict:
+    since_utc, until_utc = last_24h_window()
+    logger.info(f"Window UTC: {since_utc} → {until_utc}")
+
+    raw_file = RAW_PATH / f"raw_{job_id}.jsonl"
+    index = await run_io(get_dedup_index)
+    totals = {"raw_count": 0, "unique_count": 0, "known_count": 0, "parts": 0}
+    # Unique per run: a retried or re-claimed job must never overwrite the
+    # parts an earlier run of it committed
+    run_id = uuid.uuid4().hex[:12]
+
+    async def commit(tweets):
         # Save raw JSONL for auditing
-        raw_file = RAW_PATH / f"raw_{job_id}.jsonl"
-
-        with raw_file.open("w", encoding="utf-8") as f:
-            for t in tweets:
-                f.write(
-                    json.dumps(t.model_dump(), ensure_ascii=False, default=str) + "\n"
-                )
-
-        # Clean + dedupe
-        cleaned = clean_tweets(tweets)
-        unique = dedupe_tweets(cleaned)
-
-        df = to_polars_rows([u.model_dump() for u in unique])
-        outdir = write_parquet_partitioned(df)
-
-        JOBS[job_id].update(
-            {
-                "status": "done",
-                "raw_count": len(tweets),
-                "unique_count": len(unique),
-                "parquet_dir": outdir,
-            }
-        )
-    except Exception as e:
-        logger.exception("scrape job failed")
-        JOBS[job_id]["status"] = "error"
-        JOBS[job_id]["error"] = str(e)
+        await run_io(_append_raw, raw_file, tweets)
+        # Clean + dedupe off the event loop, then write on the I/O pool
+        df = await run_cpu(clean_and_dedupe_tweets, tweets)
+        batch_unique = df.height
+        # One part per micro-batch
+        part_id = f"{job_id}-{run_id}-{totals['parts']:04d}"
+        # A cancel (or a lost lease) waits for the batch to be committed
+        df = await run_io_shielded(_commit_batch, index, df, part_id)
+        if broker.subscribers("signal"):
+            # Push the new values of the buckets this batch touched
+            delta = await run_io(signal_delta, df)
+            broker.publish("signal", "signal", delta.to_dict(as_series=False))
+        totals["parts"] += 1
+        totals["raw_count"] += len(tweets)
+        totals["unique_count"] += df.height
+        totals["known_count"] += batch_unique - df.height
+        await report(stage="scraping", **totals)
+
+    await report(stage="scraping", **totals)
+    stream = backend.pw.scrape_stream(hashtags, since_utc, until_utc, limit)
+    await ingest_stream(stream, commit)
+    # Vectorize the new parts now so /process/tfidf only sums cached counts
+    await run_cpu(update_tfidf_cache, since_utc, until_utc)
+    await report(stage="done", **totals)
+
+    return {**totals, "parquet_dir": str(PARQUET_PATH)}
+
+
+async def run_scrape_job(job: dict, report) -> dict:
+    """JobWorkerPool handler for queued scrape jobs."""
+    payload = job["payload"]
+    return await _run_job(
+        job["id"],
+        payload["hashtags"],
+        payload["limit"],
+        get_backend(),
+        report,
+    )
 
 
 @router.post("/start")
 async def start_scrape(
-    background: BackgroundTasks,
+    request: Request,
     hashtags: str = Query(
         ",".join(SCRAPE_HASHTAGS),
         description="Comma-separated list of hashtags (include #)",
     ),
     limit: int = Query(SCRAPE_MIN_TWEETS, ge=100, le=20000),
-    backend=Depends(get_backend),
+    priority: int = Query(0, ge=-10, le=10, description="Higher runs first"),
+    store=Depends(get_job_store),
 ):
     tag_list = [h.strip() for h in hashtags.split(",") if h.strip()]
-    job_id = uuid.uuid4().hex
-    JOBS[job_id] = {
-        "status": "queued",
-        "created_at": utc_now().isoformat(),
-        "hashtags": tag_list,
-        "limit": limit,
+    if not tag_list:
+        raise HTTPException(status_code=422, detail="No hashtags given")
+    job = await asyncio.to_thread(store.enqueue, tag_list, limit, priority)
+    request.app.state.job_workers.wake()
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "deduplicated": job["deduplicated"],
     }
-    background.add_task(_run_job, job_id, tag_list, limit, backend)
-    return {"job_id": job_id, "status": JOBS[job_id]["status"]}
 
 
 @router.get("/status/{job_id}")
-async def job_status(job_id: str):
-    return JOBS.get(job_id, {"error": "not found"})
+async def job_status(job_id: str, store=Depends(get_job_store)):
+    job = await asyncio.to_thread(store.get, job_id)
+    return job_view(job) if job else {"error": "not found"}
+
+
+@router.post("/cancel/{job_id}")
+async def cancel_job(job_id: str, store=Depends(get_job_store)):
+    job = await asyncio.to_thread(store.cancel, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="not found")
+    return job_view(job)
+
+
+@router.get("/stats")
+async def scrape_stats(backend=Depends(get_backend)):
+    """Extraction counters of the latest run per hashtag"""
+    return [s.as_dict() for s in backend.pw.stats.values()]
+
+
+@router.get("/limits")
+async def scrape_limits(backend=Depends(get_backend)):
+    """Current adaptive request rate to the site and its feedback counters"""
+    return backend.pw.limiter.as_dict()
@@ -19,3 +19,48 @@ SCRAPE_MIN_TWEETS = int(os.getenv("SCRAPE_MIN_TWEETS", "2000"))
 SCRAPE_MAX_CONCURRENCY = int(os.getenv("SCRAPE_MAX_CONCURRENCY", "4"))
 SCRAPE_BACKEND = os.getenv("SCRAPE_BACKEND", "playwright")
 PLOT_MAX_POINTS = int(os.getenv("PLOT_MAX_POINTS", "800"))
+PARQUET_ROW_GROUP_SIZE = int(os.getenv("PARQUET_ROW_GROUP_SIZE", "65536"))
+COMPACT_INTERVAL_SECONDS = int(os.getenv("COMPACT_INTERVAL_SECONDS", "600"))
+COMPACT_MIN_PARTS = int(os.getenv("COMPACT_MIN_PARTS", "4"))
+COMPACT_TARGET_ROWS = int(os.getenv("COMPACT_TARGET_ROWS", "500000"))
+# How long compacted-away parts stay readable for scans that listed them
+COMPACT_RETIRE_GRACE_SECONDS = int(os.getenv("COMPACT_RETIRE_GRACE_SECONDS", "3600"))
+PARQUET_MIN_ROW_GROUP_SIZE = int(os.getenv("PARQUET_MIN_ROW_GROUP_SIZE", "2048"))
+PARQUET_ROW_GROUP_SPAN = os.getenv("PARQUET_ROW_GROUP_SPAN", "15m")
+PARQUET_SORT_BY = [
+    c.strip() for c in os.getenv("PARQUET_SORT_BY", "timestamp").split(",")
+]
+X_BASE_URL = os.getenv("X_BASE_URL", "https://x.com").rstrip("/")
+BROWSER_MAX_PAGES = int(os.getenv("BROWSER_MAX_PAGES", "6"))
+BROWSER_PAGE_MAX_NAVIGATIONS = int(os.getenv("BROWSER_PAGE_MAX_NAVIGATIONS", "50"))
+BROWSER_MAX_NAVIGATIONS = int(os.getenv("BROWSER_MAX_NAVIGATIONS", "1000"))
+LOGIN_STATUS_TTL_SECONDS = int(os.getenv("LOGIN_STATUS_TTL_SECONDS", "300"))
+SCRAPE_CAPTURE_MODE = os.getenv("SCRAPE_CAPTURE_MODE", "network")
+SCRAPE_FIRST_PAYLOAD_TIMEOUT = float(os.getenv("SCRAPE_FIRST_PAYLOAD_TIMEOUT", "10"))
+JOBS_DB = os.getenv("JOBS_DB", f"{DATA_DIR}/jobs.sqlite3")
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_RETRY_BACKOFF_SECONDS = float(os.getenv("JOB_RETRY_BACKOFF_SECONDS", "30"))
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "120"))
+EXECUTOR_CPU_WORKERS = int(os.getenv("EXECUTOR_CPU_WORKERS", str(os.cpu_count() or 1)))
+EXECUTOR_IO_WORKERS = int(os.getenv("EXECUTOR_IO_WORKERS", "8"))
+DEDUP_HORIZON_HOURS = float(os.getenv("DEDUP_HORIZON_HOURS", "48"))
+DEDUP_SIMHASH_DISTANCE = int(os.getenv("DEDUP_SIMHASH_DISTANCE", "3"))
+DEDUP_MIN_TOKENS = int(os.getenv("DEDUP_MIN_TOKENS", "5"))
+RESPONSE_CACHE_MAX_BYTES = int(
+    os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+)
+SIGNAL_ROLLUP_LEVELS = [
+    s.strip() for s in os.getenv("SIGNAL_ROLLUP_LEVELS", "1m,5m,15m,1h,1d").split(",")
+]
+SIGNAL_MAX_BUCKETS = int(os.getenv("SIGNAL_MAX_BUCKETS", "50000"))
+INGEST_BATCH_TWEETS = int(os.getenv("INGEST_BATCH_TWEETS", "500"))
+INGEST_FLUSH_SECONDS = float(os.getenv("INGEST_FLUSH_SECONDS", "30"))
+SCRAPE_RATE_INITIAL = float(os.getenv("SCRAPE_RATE_INITIAL", "0.5"))
+SCRAPE_RATE_MIN = float(os.getenv("SCRAPE_RATE_MIN", "0.1"))
+SCRAPE_RATE_MAX = float(os.getenv("SCRAPE_RATE_MAX", "10"))
+SCRAPE_RATE_BURST = int(os.getenv("SCRAPE_RATE_BURST", "2"))
+SCRAPE_LATENCY_TARGET = float(os.getenv("SCRAPE_LATENCY_TARGET", "3"))
+SCRAPE_IDLE_SECONDS = float(os.getenv("SCRAPE_IDLE_SECONDS", "6"))
+EXPORT_BATCH_ROWS = int(os.getenv("EXPORT_BATCH_ROWS", "65536"))
+PUSH_QUEUE_SIZE = int(os.getenv("PUSH_QUEUE_SIZE", "64"))
+PUSH_HEARTBEAT_SECONDS = float(os.getenv("PUSH_HEARTBEAT_SECONDS", "15"))
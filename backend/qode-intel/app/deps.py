@@ -1,16 +1,47 @@
+from typing import Optional
+from app.config import JOBS_DB
+from app.services.jobs.store import JobStore
+from app.services.scraper.browser_pool import BrowserPool
 from app.services.scraper.playwright_client import PlaywrightClient
+from app.utils.logging import logger
 
 
 class ScrapeBackend:
     def __init__(self):
-        self.pw = PlaywrightClient()
+        self.pool = BrowserPool(PlaywrightClient.STATE_FILE)
+        self.pw = PlaywrightClient(self.pool)
 
     def get(self):
         return self
 
+    async def start(self):
+        if not self.pool.available:
+            return
+        try:
+            await self.pool.start()
+        except Exception as e:
+            # Leave it to the first lease to retry the launch
+            logger.warning(f"Browser pool failed to start: {e}")
+
+    async def stop(self):
+        if self.pool.available:
+            await self.pool.stop()
+
 
 backend_singleton = ScrapeBackend()
 
 
 def get_backend():
     return backend_singleton
+
+
+# Durable job queue shared by every uvicorn worker; opened on first use so
+# importing the app doesn't create the database
+_job_store: Optional[JobStore] = None
+
+
+def get_job_store() -> JobStore:
+    global _job_store
+    if _job_store is None:
+        _job_store = JobStore(JOBS_DB)
+    return _job_store
@@ -1,6 +1,18 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api import routes_health, routes_scrape, routes_process, routes_analyze
+from app.api import (
+    routes_analyze,
+    routes_data,
+    routes_health,
+    routes_process,
+    routes_push,
+    routes_scrape,
+)
+from app.deps import backend_singleton, get_job_store
+from app.services.executors import start_executors, stop_executors
+from app.services.jobs.worker import JobWorkerPool
+from app.services.storage.compaction import compaction_loop
 import asyncio
 import sys
 import platform
@@ -10,7 +22,24 @@ if platform.system() == "Windows":
     if sys.version_info >= (3, 8):
         asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
 
-app = FastAPI(title="Qode Market Intelligence", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_executors()
+    compactor = asyncio.create_task(compaction_loop())
+    await backend_singleton.start()
+    app.state.job_workers = JobWorkerPool(get_job_store(), routes_scrape.run_scrape_job)
+    await app.state.job_workers.start()
+    try:
+        yield
+    finally:
+        await app.state.job_workers.stop()
+        compactor.cancel()
+        await backend_singleton.stop()
+        stop_executors()
+
+
+app = FastAPI(title="Qode Market Intelligence", version="1.0.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -23,6 +52,8 @@ app.include_router(routes_health.router)
 app.include_router(routes_scrape.router)
 app.include_router(routes_process.router)
 app.include_router(routes_analyze.router)
+app.include_router(routes_data.router)
+app.include_router(routes_push.router)
 
 
 @app.get("/")
@@ -33,8 +64,14 @@ async def root():
             "/health",
             "/scrape/start",
             "/scrape/status/{id}",
+            "/scrape/cancel/{id}",
             "/process/tfidf",
             "/analyze/signal",
+            "/analyze/signal/breakdown",
             "/analyze/signal.png",
+            "/analyze/signal.svg",
+            "/data/tweets",
+            "/push/events",
+            "/push/ws",
         ],
     }
@@ -0,0 +1,130 @@
+import asyncio
+import json
+from collections import deque
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Deque, Dict, Iterable, Optional, Set, Union
+from app.config import PUSH_QUEUE_SIZE
+
+
+def _json_default(value):
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+@dataclass
+class Event:
+    name: str
+    data: str  # JSON, encoded once for every subscriber
+
+    @cached_property
+    def sse(self) -> bytes:
+        return f"event: {self.name}\ndata: {self.data}\n\n".encode()
+
+    @cached_property
+    def ws(self) -> str:
+        return f'{{"event": {json.dumps(self.name)}, "data": {self.data}}}'
+
+
+class Subscription:
+    """
+    One client's bounded mailbox. A full mailbox drops its oldest event
+    rather than blocking the publisher; the client is then sent a "dropped"
+    event with the count, so it knows to refetch instead of trusting deltas.
+    """
+
+    def __init__(self, broker: "Broker", topics: Set[str], maxsize: int):
+        self.broker = broker
+        self.topics = topics
+        self.maxsize = maxsize
+        self.dropped = 0
+        self._missed = 0
+        self._events: Deque[Event] = deque()
+        self._ready = asyncio.Event()
+
+    def put(self, event: Event):
+        if len(self._events) >= self.maxsize:
+            self._events.popleft()
+            self.dropped += 1
+            self._missed += 1
+        self._events.append(event)
+        self._ready.set()
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Event]:
+        """The next event, or None after ``timeout`` seconds without one."""
+        if not self._events:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        if self._missed:
+            missed, self._missed = self._missed, 0
+            return Event("dropped", json.dumps({"count": missed}))
+        return self._events.popleft()
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Broker:
+    """
+    In-process fan-out of push events to SSE/WebSocket subscribers by topic
+    ("signal", "jobs", "job:<id>"). Publishing never waits on a client: each
+    event is encoded once and appended to every matching mailbox. Use it from
+    the event loop only.
+    """
+
+    def __init__(self, queue_size: int = PUSH_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._topics: Dict[str, Set[Subscription]] = {}
+        self.published = self.delivered = 0
+
+    def subscribe(self, topics: Iterable[str]) -> Subscription:
+        sub = Subscription(self, set(topics), self.queue_size)
+        for topic in sub.topics:
+            self._topics.setdefault(topic, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        for topic in sub.topics:
+            subs = self._topics.get(topic)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._topics[topic]
+
+    def subscribers(self, topic: str) -> int:
+        return len(self._topics.get(topic, ()))
+
+    def publish(self, topics: Union[str, Iterable[str]], name: str, payload) -> int:
+        """Send ``payload`` to the subscribers of any of ``topics``, once each."""
+        if isinstance(topics, str):
+            topics = [topics]
+        subs = set().union(*(self._topics.get(t, ()) for t in topics))
+        if not subs:
+            return 0
+        event = Event(name, json.dumps(payload, default=_json_default))
+        for sub in subs:
+            sub.put(event)
+        self.published += 1
+        self.delivered += len(subs)
+        return len(subs)
+
+    def metrics(self) -> dict:
+        subs = set().union(*self._topics.values())
+        return {
+            "subscribers": len(subs),
+            "topics": {t: len(s) for t, s in self._topics.items()},
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": sum(s.dropped for s in subs),
+        }
+
+
+broker = Broker()
@@ -0,0 +1,68 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Optional
+from app.config import EXECUTOR_CPU_WORKERS, EXECUTOR_IO_WORKERS
+from app.utils.logging import logger
+
+# Shared executors, created in the app lifespan: a process pool for
+# CPU-heavy transforms (TF-IDF, rendering, cleaning) and a thread pool for
+# Parquet I/O, so neither blocks the event loop serving other requests.
+_cpu: Optional[ProcessPoolExecutor] = None
+_io: Optional[ThreadPoolExecutor] = None
+
+
+def start_executors(
+    cpu_workers: int = EXECUTOR_CPU_WORKERS, io_workers: int = EXECUTOR_IO_WORKERS
+):
+    global _cpu, _io
+    if cpu_workers > 0 and _cpu is None:
+        # spawn, not fork: Polars' thread pool does not survive a fork
+        _cpu = ProcessPoolExecutor(
+            max_workers=cpu_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+    if _io is None:
+        _io = ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="io")
+    logger.info(f"Executors started: cpu={cpu_workers} io={io_workers}")
+
+
+def stop_executors():
+    global _cpu, _io
+    if _cpu is not None:
+        _cpu.shutdown(cancel_futures=True)
+    if _io is not None:
+        _io.shutdown(cancel_futures=True)
+    _cpu = _io = None
+
+
+async def run_cpu(fn, *args, **kwargs):
+    """
+    Run ``fn`` in the process pool; ``fn`` and its arguments must pickle.
+    Without a pool (EXECUTOR_CPU_WORKERS=0, or outside the app) it runs
+    inline.
+    """
+    if _cpu is None:
+        return fn(*args, **kwargs)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_cpu, partial(fn, *args, **kwargs))
+
+
+async def run_io(fn, *args, **kwargs):
+    """Run blocking I/O in the shared thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_io, partial(fn, *args, **kwargs))
+
+
+async def run_io_shielded(fn, *args, **kwargs):
+    """
+    ``run_io`` for a step that must not be split. A cancellation that
+    arrives meanwhile is held until ``fn`` has finished, then re-raised, so
+    the caller stops after the step rather than halfway through it.
+    """
+    task = asyncio.ensure_future(run_io(fn, *args, **kwargs))
+    try:
+        return await asyncio.shield(task)
+    except asyncio.CancelledError:
+        await asyncio.wait({task})
+        raise
@@ -0,0 +1,69 @@
+import asyncio
+import time
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
+from app.config import INGEST_BATCH_TWEETS, INGEST_FLUSH_SECONDS
+from app.models.tweet import Tweet
+
+CommitFn = Callable[[List[Tweet]], Awaitable[None]]
+
+
+async def ingest_stream(
+    batches: AsyncIterator[List[Tweet]],
+    commit: CommitFn,
+    batch_tweets: int = INGEST_BATCH_TWEETS,
+    flush_seconds: float = INGEST_FLUSH_SECONDS,
+) -> int:
+    """
+    Consume a scraper's tweet batches into micro-batches and ``commit`` each
+    one once it holds ``batch_tweets`` tweets or its oldest tweet has waited
+    ``flush_seconds``; the remainder is committed when the stream ends.
+    At most one batch is read ahead while a commit runs, so memory stays
+    bounded by one micro-batch. Returns the number of commits.
+    """
+    buffer: List[Tweet] = []
+    started: Optional[float] = None
+    commits = 0
+
+    async def flush(size: int):
+        nonlocal buffer, started, commits
+        chunk, buffer = buffer[:size], buffer[size:]
+        if not buffer:
+            started = None
+        await commit(chunk)
+        commits += 1
+
+    # A pending __anext__ survives a timed-out wait, so the generator is
+    # never cancelled mid-step by the flush timer
+    pending = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(batches.__anext__())
+            timeout = None
+            if started is not None:
+                timeout = max(0.0, started + flush_seconds - time.monotonic())
+            done, _ = await asyncio.wait({pending}, timeout=timeout)
+            if not done:
+                await flush(len(buffer))
+                continue
+            try:
+                items = pending.result()
+            except StopAsyncIteration:
+                pending = None
+                break
+            pending = None
+            if items and started is None:
+                started = time.monotonic()
+            buffer.extend(items)
+            while len(buffer) >= batch_tweets:
+                await flush(batch_tweets)
+        if buffer:
+            await flush(len(buffer))
+    finally:
+        if pending is not None:
+            pending.cancel()
+            await asyncio.gather(pending, return_exceptions=True)
+        aclose = getattr(batches, "aclose", None)
+        if aclose is not None:
+            await aclose()
+    return commits
@@ -0,0 +1,319 @@
+import json
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Optional
+from app.config import (
+    JOB_LEASE_SECONDS,
+    JOB_MAX_ATTEMPTS,
+    JOB_RETRY_BACKOFF_SECONDS,
+    SCRAPE_MAX_CONCURRENCY,
+)
+from app.utils.time import utc_now
+
+QUEUED, RUNNING, DONE, ERROR, CANCELLED = (
+    "queued",
+    "running",
+    "done",
+    "error",
+    "cancelled",
+)
+TERMINAL = (DONE, ERROR, CANCELLED)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    payload TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    runs INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    run_after REAL NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    progress TEXT NOT NULL DEFAULT '{}',
+    result TEXT NOT NULL DEFAULT '{}',
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, priority, created_at);
+-- One in-flight (queued or running) job per hashtag, across all workers
+CREATE TABLE IF NOT EXISTS inflight (
+    hashtag TEXT PRIMARY KEY,
+    job_id TEXT NOT NULL
+);
+"""
+
+
+class JobStore:
+    """
+    Durable scrape-job queue in SQLite (WAL). Every state change is a single
+    short transaction, so several uvicorn workers can share one database:
+    claims are atomic, leases expire when a worker dies, and a global cap of
+    ``max_running`` leased jobs holds across processes. ``attempts`` counts
+    the runs charged against ``max_attempts`` (a graceful release gives one
+    back); ``runs`` counts every claim and never goes down.
+    """
+
+    def __init__(self, path: str, max_running: int = SCRAPE_MAX_CONCURRENCY):
+        self.path = path
+        self.max_running = max_running
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(path, timeout=30)
+        try:
+            # WAL is persistent: readers never block the single writer
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(SCHEMA)
+            columns = {r[1] for r in db.execute("PRAGMA table_info(jobs)")}
+            if "runs" not in columns:  # databases created before it existed
+                db.execute(
+                    "ALTER TABLE jobs ADD COLUMN runs INTEGER NOT NULL DEFAULT 0"
+                )
+        finally:
+            db.close()
+
+    @contextmanager
+    def _tx(self):
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        try:
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                yield db
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+        finally:
+            db.close()
+
+    @staticmethod
+    def _row(row: Optional[sqlite3.Row]) -> Optional[dict]:
+        if row is None:
+            return None
+        job = dict(row)
+        for key in ("payload", "progress", "result"):
+            job[key] = json.loads(job[key])
+        return job
+
+    def enqueue(self, hashtags: List[str], limit: int, priority: int = 0) -> dict:
+        """
+        Queue a scrape. Hashtags already covered by an in-flight job are
+        dropped; if none are left the covering job is returned instead,
+        with ``deduplicated`` set.
+        """
+        now = utc_now().isoformat()
+        tags = list(dict.fromkeys(h.lower() for h in hashtags))
+        if not tags:
+            raise ValueError("At least one hashtag is required")
+        with self._tx() as db:
+            busy = {
+                r["hashtag"]: r["job_id"]
+                for r in db.execute(
+                    f"SELECT hashtag, job_id FROM inflight WHERE hashtag IN "
+                    f"({','.join('?' * len(tags))})",
+                    tags,
+                )
+            }
+            fresh = [t for t in tags if t not in busy]
+            if not fresh:
+                job = db.execute(
+                    "SELECT * FROM jobs WHERE id = ?", (busy[tags[0]],)
+                ).fetchone()
+                return {**self._row(job), "deduplicated": True}
+
+            job_id = uuid.uuid4().hex
+            payload = {"hashtags": fresh, "limit": limit}
+            db.execute(
+                "INSERT INTO jobs (id, status, priority, payload, created_at,"
+                " updated_at, max_attempts) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job_id,
+                    QUEUED,
+                    priority,
+                    json.dumps(payload),
+                    now,
+                    now,
+                    JOB_MAX_ATTEMPTS,
+                ),
+            )
+            db.executemany(
+                "INSERT INTO inflight (hashtag, job_id) VALUES (?, ?)",
+                [(t, job_id) for t in fresh],
+            )
+            job = db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return {**self._row(job), "deduplicated": False, "skipped_hashtags": busy}
+
+    def claim(self, owner: str, lease: float = JOB_LEASE_SECONDS) -> Optional[dict]:
+        """Lease the most urgent ready job, unless the global cap is reached."""
+        now = time.time()
+        with self._tx() as db:
+            running = db.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = ? AND lease_expires > ?",
+                (RUNNING, now),
+            ).fetchone()[0]
+            if running >= self.max_running:
+                return None
+            row = db.execute(
+                "SELECT id FROM jobs WHERE status = ? AND run_after <= ?"
+                " ORDER BY priority DESC, created_at LIMIT 1",
+                (QUEUED, now),
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE jobs SET status = ?, lease_owner = ?, lease_expires = ?,"
+                " attempts = attempts + 1, runs = runs + 1, updated_at = ?"
+                " WHERE id = ?",
+                (RUNNING, owner, now + lease, utc_now().isoformat(), row["id"]),
+            )
+            job = db.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+        return self._row(job)
+
+    def heartbeat(
+        self, job_id: str, owner: str, lease: float = JOB_LEASE_SECONDS
+    ) -> str:
+        """
+        Extend a lease. Returns "ok", "cancel" when a cancel was requested,
+        or "lost" when another worker has taken the job over.
+        """
+        with self._tx() as db:
+            row = db.execute(
+                "SELECT status, lease_owner, cancel_requested FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+            if row is None or row["status"] != RUNNING or row["lease_owner"] != owner:
+                return "lost"
+            if row["cancel_requested"]:
+                return "cancel"
+            db.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE id = ?",
+                (time.time() + lease, job_id),
+            )
+        return "ok"
+
+    def update_progress(self, job_id: str, **progress) -> None:
+        with self._tx() as db:
+            row = db.execute(
+                "SELECT progress FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            if row is None:
+                return
+            merged = {**json.loads(row["progress"]), **progress}
+            db.execute(
+                "UPDATE jobs SET progress = ?, updated_at = ? WHERE id = ?",
+                (json.dumps(merged, default=str), utc_now().isoformat(), job_id),
+            )
+
+    def _finish(self, db, job_id: str, status: str, **fields) -> None:
+        sets = ", ".join(f"{k} = ?" for k in fields)
+        db.execute(
+            f"UPDATE jobs SET status = ?, lease_owner = NULL, lease_expires = NULL,"
+            f" updated_at = ?{', ' + sets if sets else ''} WHERE id = ?",
+            (status, utc_now().isoformat(), *fields.values(), job_id),
+        )
+        if status in TERMINAL:
+            db.execute("DELETE FROM inflight WHERE job_id = ?", (job_id,))
+
+    def complete(self, job_id: str, result: dict) -> None:
+        with self._tx() as db:
+            self._finish(
+                db, job_id, DONE, result=json.dumps(result, default=str), error=None
+            )
+
+    def fail(self, job_id: str, error: str) -> str:
+        """Record a failure; requeues with exponential backoff while attempts remain."""
+        with self._tx() as db:
+            row = db.execute(
+                "SELECT attempts, max_attempts, cancel_requested FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+            if row is None:
+                return ERROR
+            if row["cancel_requested"]:
+                status, run_after = CANCELLED, 0
+            elif row["attempts"] < row["max_attempts"]:
+                status = QUEUED
+                backoff = JOB_RETRY_BACKOFF_SECONDS * 2 ** (row["attempts"] - 1)
+                run_after = time.time() + backoff
+            else:
+                status, run_after = ERROR, 0
+            self._finish(db, job_id, status, error=error, run_after=run_after)
+        return status
+
+    def cancel(self, job_id: str) -> Optional[dict]:
+        """Cancel a queued job now; flag a running one for its worker."""
+        with self._tx() as db:
+            row = db.execute(
+                "SELECT status FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row["status"] == QUEUED:
+                self._finish(db, job_id, CANCELLED, cancel_requested=1)
+            elif row["status"] == RUNNING:
+                db.execute(
+                    "UPDATE jobs SET cancel_requested = 1, updated_at = ? WHERE id = ?",
+                    (utc_now().isoformat(), job_id),
+                )
+            job = db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row(job)
+
+    def mark_cancelled(self, job_id: str) -> None:
+        with self._tx() as db:
+            self._finish(db, job_id, CANCELLED)
+
+    def release(self, job_id: str, owner: str) -> None:
+        """
+        Hand a running job back to the queue (graceful shutdown), without
+        charging the interrupted run against ``max_attempts``.
+        """
+        with self._tx() as db:
+            db.execute(
+                "UPDATE jobs SET status = ?, lease_owner = NULL, lease_expires = NULL,"
+                " attempts = MAX(attempts - 1, 0) WHERE id = ? AND lease_owner = ?",
+                (QUEUED, job_id, owner),
+            )
+
+    def requeue_expired(self) -> int:
+        """Requeue running jobs whose worker stopped renewing the lease."""
+        with self._tx() as db:
+            expired = db.execute(
+                "SELECT id, attempts, max_attempts FROM jobs"
+                " WHERE status = ? AND lease_expires <= ?",
+                (RUNNING, time.time()),
+            ).fetchall()
+            for row in expired:
+                if row["attempts"] < row["max_attempts"]:
+                    self._finish(db, row["id"], QUEUED)
+                else:
+                    self._finish(db, row["id"], ERROR, error="worker lease expired")
+        return len(expired)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._tx() as db:
+            row = db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row(row)
+
+
+def job_view(job: dict) -> dict:
+    """The shape /scrape/status has always returned, plus queue details."""
+    view = {
+        "status": job["status"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+        "priority": job["priority"],
+        "attempts": job["attempts"],
+        **job["payload"],
+        "progress": job["progress"],
+        **job["result"],
+    }
+    if job.get("error"):
+        view["error"] = job["error"]
+    return view
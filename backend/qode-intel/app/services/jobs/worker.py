@@ -0,0 +1,117 @@
+import asyncio
+import os
+import socket
+import uuid
+from typing import Awaitable, Callable, List, Optional
+from app.config import JOB_LEASE_SECONDS, SCRAPE_MAX_CONCURRENCY
+from app.services.broker import broker
+from app.services.jobs.store import JobStore
+from app.utils.logging import logger
+
+JobHandler = Callable[[dict, Callable[..., Awaitable[None]]], Awaitable[dict]]
+
+
+class JobWorkerPool:
+    """
+    Bounded pool of asyncio workers pulling from a JobStore. Each running
+    job's lease is renewed in the background; a lost lease or a cancel
+    request cancels the job's task.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        handler: JobHandler,
+        concurrency: int = SCRAPE_MAX_CONCURRENCY,
+        poll_interval: float = 2.0,
+        lease: float = JOB_LEASE_SECONDS,
+    ):
+        self.store = store
+        self.handler = handler
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._wake = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+    def wake(self):
+        self._wake.set()
+
+    async def start(self):
+        await asyncio.to_thread(self.store.requeue_expired)
+        self._tasks = [
+            asyncio.create_task(self._worker()) for _ in range(self.concurrency)
+        ]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _next_job(self) -> Optional[dict]:
+        job = await asyncio.to_thread(self.store.claim, self.owner, self.lease)
+        if job is None:
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                await asyncio.to_thread(self.store.requeue_expired)
+        return job
+
+    async def _worker(self):
+        while True:
+            job = await self._next_job()
+            if job is not None:
+                await self._run(job)
+
+    async def _keep_lease(self, job_id: str, task: asyncio.Task, verdict: dict):
+        while not task.done():
+            await asyncio.sleep(self.lease / 3)
+            state = await asyncio.to_thread(
+                self.store.heartbeat, job_id, self.owner, self.lease
+            )
+            if state != "ok":
+                verdict["state"] = state
+                task.cancel()
+                return
+
+    async def _run(self, job: dict):
+        job_id = job["id"]
+        topics = ("jobs", f"job:{job_id}")
+
+        async def report(**progress):
+            await asyncio.to_thread(self.store.update_progress, job_id, **progress)
+            broker.publish(topics, "progress", {"job_id": job_id, **progress})
+
+        verdict = {"state": "ok"}
+        task = asyncio.create_task(self.handler(job, report))
+        keeper = asyncio.create_task(self._keep_lease(job_id, task, verdict))
+        try:
+            result = await task
+        except asyncio.CancelledError:
+            if verdict["state"] == "ok":
+                # The pool itself is stopping: hand the job back
+                task.cancel()
+                await asyncio.to_thread(self.store.release, job_id, self.owner)
+                raise
+            if verdict["state"] == "cancel":
+                logger.info(f"job {job_id} cancelled")
+                await asyncio.to_thread(self.store.mark_cancelled, job_id)
+                broker.publish(
+                    topics, "status", {"job_id": job_id, "status": "cancelled"}
+                )
+            else:
+                logger.warning(f"job {job_id} lease lost; another worker owns it")
+        except Exception as e:
+            logger.exception(f"job {job_id} failed")
+            status = await asyncio.to_thread(self.store.fail, job_id, str(e))
+            if status == "queued":
+                logger.info(f"job {job_id} will be retried")
+            broker.publish(topics, "status", {"job_id": job_id, "status": status})
+        else:
+            await asyncio.to_thread(self.store.complete, job_id, result)
+            broker.publish(topics, "status", {"job_id": job_id, "status": "done"})
+        finally:
+            keeper.cancel()
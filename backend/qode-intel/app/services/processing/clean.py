@@ -1,6 +1,15 @@
 from typing import Iterable, List
+import numpy as np
+import polars as pl
+import pyarrow as pa
 from app.models.tweet import Tweet
-from app.utils.text import clean_text, extract_entities
+from app.services.storage.schema import TWEET_SCHEMA
+from app.utils.text import (
+    clean_text,
+    extract_entities,
+    normalize_unicode,
+    polars_patterns,
+)
 
 
 def clean_tweets(tweets: Iterable[Tweet]) -> List[Tweet]:
@@ -19,3 +28,79 @@ def clean_tweets(tweets: Iterable[Tweet]) -> List[Tweet]:
             )
         )
     return out
+
+
+def _list_column(name: str, values: List[List[str]]) -> pl.Series:
+    # Building list columns from Python lists is slow; go through flat
+    # offsets and values instead
+    offsets = np.zeros(len(values) + 1, dtype=np.int32)
+    np.cumsum([len(v) for v in values], out=offsets[1:])
+    flat = pa.array([x for v in values for x in v], type=pa.string())
+    return pl.Series(name, pa.ListArray.from_arrays(pa.array(offsets), flat))
+
+
+def tweets_to_frame(tweets: Iterable[Tweet]) -> pl.DataFrame:
+    """Build a TWEET_SCHEMA frame column-wise, without dumping each model."""
+    tweets = list(tweets)
+    cols = []
+    for name, dtype in TWEET_SCHEMA.items():
+        values = [getattr(t, name) for t in tweets]
+        if name == "timestamp":
+            ts = pl.Series(name, values)
+            if ts.dtype == pl.Null:
+                col = ts.cast(dtype)
+            elif ts.dtype.time_zone is None:
+                col = ts.dt.replace_time_zone("UTC").dt.cast_time_unit("us")
+            else:
+                col = ts.dt.convert_time_zone("UTC").dt.cast_time_unit("us")
+        elif dtype == pl.List(pl.String):
+            col = _list_column(name, values)
+        else:
+            col = pl.Series(name, values, dtype=dtype)
+        cols.append(col)
+    return pl.DataFrame(cols)
+
+
+def _nfc(content: pl.Series) -> pl.Series:
+    # ASCII is already NFC; only normalise the rows that can change. (Arrow's
+    # utf8_normalize leaves decomposed text as is on our pinned pyarrow.)
+    idx = content.str.contains(r"[^\x00-\x7F]").arg_true()
+    if idx.is_empty():
+        return content
+    fixed = [normalize_unicode(t) for t in content.gather(idx)]
+    return content.scatter(idx, fixed)
+
+
+def _entities(padded: pl.Expr, pattern: str) -> pl.Expr:
+    # Drop the " @" / " #" prefix the match carries
+    return (
+        padded.str.extract_all(pattern)
+        .list.eval(pl.element().str.slice(2).str.to_lowercase())
+        .list.unique()
+        .list.sort()
+    )
+
+
+def clean_frame(df: pl.DataFrame) -> pl.DataFrame:
+    """
+    Columnar clean_tweets: same text normalisation and entity extraction,
+    applied to the whole 'content' column at once.
+    """
+    if df.is_empty():
+        return df
+    pat = polars_patterns()
+    content = (
+        pl.col("content")
+        .str.replace_all(pat["url"], "")
+        .str.replace_all(pat["whitespace"], " ")
+        .str.strip_chars(" ")
+    )
+    padded = pl.lit(" ") + pl.col("content")
+    return (
+        df.with_columns(_nfc(df.get_column("content")))
+        .with_columns(content)
+        .with_columns(
+            _entities(padded, pat["mention"]).alias("mentions"),
+            _entities(padded, pat["hashtag"]).alias("hashtags"),
+        )
+    )
@@ -1,5 +1,8 @@
 from typing import Iterable, List
+from functools import lru_cache
 from hashlib import blake2b
+import numpy as np
+import polars as pl
 from app.models.tweet import Tweet
 
 
@@ -20,3 +23,86 @@ def dedupe_tweets(tweets: Iterable[Tweet]) -> List[Tweet]:
         seen_hashes.add(h)
         out.append(t)
     return out
+
+
+DEDUPE_KEY = ["username", "timestamp", "content"]
+
+
+def dedupe_frame(df: pl.DataFrame) -> pl.DataFrame:
+    """
+    Columnar dedupe_tweets: keep the first row per id and per
+    (username, timestamp, content), in input order.
+    """
+    if df.is_empty():
+        return df
+    # When every id maps to a single key, dedupe_tweets reduces to keeping the
+    # first row per key. An id reused with different content makes the result
+    # order-dependent, so those (rare) batches take the sequential path.
+    conflicts = df.group_by("id").agg(pl.struct(DEDUPE_KEY).n_unique().alias("k"))
+    if conflicts.get_column("k").max() <= 1:
+        return df.unique(subset=DEDUPE_KEY, keep="first", maintain_order=True)
+    seen_ids, seen_keys, keep = set(), set(), []
+    for row in df.select(["id", *DEDUPE_KEY]).iter_rows():
+        ok = row[0] not in seen_ids and row[1:] not in seen_keys
+        if ok:
+            seen_ids.add(row[0])
+            seen_keys.add(row[1:])
+        keep.append(ok)
+    return df.filter(pl.Series(keep))
+
+
+# Retweets carry the original text behind an "RT @user:" prefix
+RT_PREFIX = r"^rt @\w+:\s*"
+
+
+def hash64(value: str) -> int:
+    return int.from_bytes(
+        blake2b(value.encode("utf-8"), digest_size=8).digest(), "little"
+    )
+
+
+@lru_cache(maxsize=1 << 18)
+def token_hash(token: str) -> int:
+    return hash64(token)
+
+
+def id_hashes(ids: pl.Series) -> np.ndarray:
+    return np.fromiter((hash64(i) for i in ids), dtype=np.uint64, count=len(ids))
+
+
+def simhash_signatures(content: pl.Series, min_tokens: int):
+    """
+    64-bit SimHash of each text's word tokens (lowercased, retweet prefix
+    stripped). Returns (signatures, valid); texts with fewer than
+    ``min_tokens`` tokens are too short to compare and are marked invalid.
+    """
+    tokens = (
+        content.str.to_lowercase()
+        .str.replace(RT_PREFIX, "")
+        .str.extract_all(r"\w+")
+        .fill_null([])
+    )
+    lens = tokens.list.len().to_numpy().astype(np.int64)
+    flat = tokens.explode().drop_nulls()
+    vocab = flat.unique()
+    lookup = pl.DataFrame(
+        {
+            "t": vocab,
+            "h": pl.Series([token_hash(t) for t in vocab], dtype=pl.UInt64),
+        }
+    )
+    hashes = (
+        flat.to_frame("t").join(lookup, on="t", how="left").get_column("h").to_numpy()
+    )
+    # Each token votes on every bit; a bit is set where most tokens have it
+    bits = np.unpackbits(
+        hashes.astype("<u8").view(np.uint8).reshape(-1, 8), axis=1, bitorder="little"
+    )
+    ones = np.zeros((len(lens), 64), dtype=np.int32)
+    nonempty = lens > 0
+    starts = np.cumsum(lens) - lens
+    if nonempty.any():
+        ones[nonempty] = np.add.reduceat(bits, starts[nonempty], axis=0, dtype=np.int32)
+    majority = (2 * ones > lens[:, None]).astype(np.uint8)
+    sigs = np.packbits(majority, axis=1, bitorder="little").view("<u8").ravel()
+    return sigs, lens >= min_tokens
@@ -0,0 +1,84 @@
+import numpy as np
+import polars as pl
+
+DOWNSAMPLE_METHODS = ("lttb", "minmax")
+
+
+def _bucket_edges(n: int, buckets: int) -> np.ndarray:
+    # Edges of ``buckets`` near-equal index ranges over [1, n - 1): the first
+    # and last points are always kept on their own
+    return np.linspace(1, n - 1, buckets + 1).astype(np.int64)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: per bucket, keep the point forming the
+    largest triangle with the previously kept point and the next bucket's
+    mean. Bucket means and bounds are computed up front; the per-bucket step
+    only depends on the previous pick.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = x.astype(np.float64)
+    y = y.astype(np.float64)
+    edges = _bucket_edges(n, n_out - 2)
+    # Next-bucket means via cumulative sums; the last bucket looks at the
+    # final point
+    cx, cy = np.concatenate([[0], np.cumsum(x)]), np.concatenate([[0], np.cumsum(y)])
+    lo, hi = edges[1:], np.append(edges[2:], n)
+    mean_x = (cx[hi] - cx[lo]) / (hi - lo)
+    mean_y = (cy[hi] - cy[lo]) / (hi - lo)
+
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        s, e = edges[i], edges[i + 1]
+        area = np.abs(
+            (x[a] - mean_x[i]) * (y[s:e] - y[a]) - (x[a] - x[s:e]) * (mean_y[i] - y[a])
+        )
+        a = s + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Min/max envelope: the lowest and highest point of each bucket, in time
+    order, so every spike survives. Fully vectorised.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+    bucket = np.arange(n) * (n_out // 2) // n
+    # Stable sort by (bucket, value): each bucket's first and last rows are
+    # its argmin and argmax
+    order = np.lexsort((np.nan_to_num(y, nan=np.inf), bucket))
+    starts = np.flatnonzero(np.diff(bucket[order], prepend=-1))
+    ends = np.append(starts[1:], n) - 1
+    lows = order[starts]
+    highs = order[ends]
+    finite = np.isfinite(y[highs])
+    highs[~finite] = lows[~finite]
+    return np.unique(np.concatenate([lows, highs]))
+
+
+def downsample(
+    df: pl.DataFrame,
+    max_points: int,
+    method: str = "lttb",
+    x: str = "bucket",
+    y: str = "signal",
+) -> pl.DataFrame:
+    """Rows of ``df`` (sorted by ``x``) reduced to at most ``max_points``."""
+    if df.height <= max_points:
+        return df
+    ys = df.get_column(y).cast(pl.Float64).to_numpy()
+    if method == "minmax":
+        idx = minmax_indices(ys, max_points)
+    else:
+        xs = df.get_column(x).to_physical().cast(pl.Float64).to_numpy()
+        # LTTB needs finite values; empty buckets behave as zero signal
+        idx = lttb_indices(xs, np.nan_to_num(ys), max_points)
+    return df[idx]
@@ -0,0 +1,23 @@
+from typing import List
+import polars as pl
+from app.models.tweet import Tweet
+from app.services.processing.clean import clean_frame, tweets_to_frame
+from app.services.processing.dedupe import dedupe_frame
+
+
+def clean_and_dedupe(df: pl.DataFrame) -> pl.DataFrame:
+    """
+    Clean and dedupe a scraped batch (see tweets_to_frame) into a
+    Parquet-ready frame. Top level so it can be shipped to the CPU process
+    pool.
+    """
+    return dedupe_frame(clean_frame(df))
+
+
+def clean_and_dedupe_tweets(tweets: List[Tweet]) -> pl.DataFrame:
+    """
+    ``clean_and_dedupe`` of the scraped models themselves: building the frame
+    happens in the pool too, and the models pickle without being dumped to
+    dicts on the event loop first.
+    """
+    return clean_and_dedupe(tweets_to_frame(tweets))
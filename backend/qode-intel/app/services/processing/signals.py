@@ -1,3 +1,4 @@
+from typing import List, Sequence
 import polars as pl
 from app.utils.logging import logger
 
@@ -35,6 +36,18 @@ BEAR_WORDS = {
     "crash",
 }
 
+# Time bucket of the composite series
+SIGNAL_BUCKET = "15m"
+# Columns the composite needs from the tweet store
+SIGNAL_COLUMNS = [
+    "timestamp",
+    "content",
+    "like_count",
+    "retweet_count",
+    "reply_count",
+    "quote_count",
+]
+
 
 def lexical_signal(text: str) -> float:
     t = text.lower()
@@ -58,49 +71,157 @@ def engagement_weight(row) -> float:
     return 1.0 + math.log1p(s)
 
 
-def compute_composite(df: pl.DataFrame) -> pl.DataFrame:
-    logger.info("In compute composite")
-    if df.is_empty():
-        return df
+def _lexicon_hits(text: pl.Expr, words) -> pl.Expr:
+    # Each lexicon word counts once per tweet, matched as a substring like
+    # lexical_signal does, so every word is a single vectorised scan.
+    return pl.sum_horizontal(
+        [text.str.contains(w, literal=True).cast(pl.Int32) for w in sorted(words)]
+    )
 
-    # Compute lexical signal & weight
-    df2 = df.with_columns(
-        [
-            pl.col("content")
-            .map_elements(lexical_signal, return_dtype=pl.Float64)
-            .alias("lex_signal"),
-            pl.struct(["like_count", "retweet_count", "reply_count", "quote_count"])
-            .map_elements(engagement_weight, return_dtype=pl.Float64)
-            .alias("weight"),
-        ]
+
+def with_lexical_signal(frame, col: str = "content", alias: str = "lex_signal"):
+    """
+    Native-expression equivalent of ``lexical_signal`` over a whole column.
+    Works on DataFrame and LazyFrame; lowercasing and the lexicon scans are
+    staged so each happens once per column rather than once per word.
+    """
+    text = pl.col("_lex_text")
+    bull, bear = pl.col("_lex_bull"), pl.col("_lex_bear")
+    return (
+        frame.with_columns(
+            pl.col(col).fill_null("").str.to_lowercase().alias("_lex_text")
+        )
+        .with_columns(
+            _lexicon_hits(text, BULL_WORDS).alias("_lex_bull"),
+            _lexicon_hits(text, BEAR_WORDS).alias("_lex_bear"),
+        )
+        .with_columns(
+            pl.when(bull + bear == 0)
+            .then(pl.lit(0.0))
+            .otherwise(((bull - bear) / (bull + bear)).clip(-1.0, 1.0))
+            .cast(pl.Float64)
+            .alias(alias)
+        )
+        .drop(["_lex_text", "_lex_bull", "_lex_bear"])
+    )
+
+
+def engagement_weight_expr() -> pl.Expr:
+    """Native-expression equivalent of ``engagement_weight``."""
+    s = (
+        pl.col("like_count").fill_null(0)
+        + 2 * pl.col("retweet_count").fill_null(0)
+        + 0.5 * pl.col("reply_count").fill_null(0)
+        + 1.5 * pl.col("quote_count").fill_null(0)
     )
+    return (1.0 + s.cast(pl.Float64).log1p()).cast(pl.Float64)
 
-    # Time bucket (15m default)
-    df2 = df2.with_columns([pl.col("timestamp").dt.truncate("15m").alias("bucket")])
 
-    # Weighted mean per bucket
-    grp = df2.group_by("bucket").agg(
+def _scored(df, every: str):
+    return with_lexical_signal(df).with_columns(
         [
-            (pl.col("lex_signal") * pl.col("weight")).sum().alias("wsum"),
-            pl.col("weight").sum().alias("w"),
-            pl.len().alias("n"),
-            pl.col("lex_signal").mean().alias("mean_unweighted"),
-            pl.col("lex_signal").std(ddof=1).alias("std_unweighted"),
+            engagement_weight_expr().alias("weight"),
+            pl.col("timestamp").dt.truncate(every).alias("bucket"),
         ]
     )
 
-    grp = (
-        grp.with_columns(
+
+def _stat_aggs() -> List[pl.Expr]:
+    lex = pl.col("lex_signal")
+    return [
+        (lex * pl.col("weight")).sum().alias("wsum"),
+        pl.col("weight").sum().alias("w"),
+        pl.len().cast(pl.Int64).alias("n"),
+        lex.sum().alias("lex_sum"),
+        (lex * lex).sum().alias("lex_sumsq"),
+    ]
+
+
+def bucket_stats(df, every: str = SIGNAL_BUCKET):
+    """
+    Per-bucket sufficient statistics of the composite signal. The columns are
+    additive, so stats of disjoint batches can be merged by summing them.
+    """
+    return _scored(df, every).group_by("bucket").agg(_stat_aggs())
+
+
+def finalize_stats(stats: pl.DataFrame, by: Sequence[str] = ()) -> pl.DataFrame:
+    """
+    Turn merged bucket stats into the composite signal series (one series
+    per value of the ``by`` columns, if any).
+    """
+    n = pl.col("n")
+    mean = pl.col("lex_sum") / n
+    var = (pl.col("lex_sumsq") - pl.col("lex_sum") * mean) / (n - 1)
+    std = pl.when(n > 1).then(var.clip(lower_bound=0.0).sqrt())
+    return (
+        stats.with_columns(
+            [
+                n.cast(pl.UInt32),
+                mean.alias("mean_unweighted"),
+                std.alias("std_unweighted"),
+            ]
+        )
+        .with_columns(
             [
                 (pl.col("wsum") / pl.col("w")).alias("signal"),
                 # 95% CI using unweighted std as conservative estimate
-                (1.96 * (pl.col("std_unweighted") / (pl.col("n") ** 0.5))).alias(
-                    "ci95"
-                ),
+                (1.96 * (pl.col("std_unweighted") / (n**0.5))).alias("ci95"),
             ]
         )
-        .drop(["wsum", "w"])
-        .sort("bucket")
+        .select(
+            [*by, "bucket", "n", "mean_unweighted", "std_unweighted", "signal", "ci95"]
+        )
+        .sort([*by, "bucket"])
     )
 
-    return grp
+
+def compute_composite(df, every: str = SIGNAL_BUCKET) -> pl.DataFrame:
+    logger.info("In compute composite")
+    if isinstance(df, pl.LazyFrame):
+        stats = bucket_stats(df.select(SIGNAL_COLUMNS), every).collect(streaming=True)
+        return finalize_stats(stats) if not stats.is_empty() else stats
+    if df.is_empty():
+        return df
+    return finalize_stats(bucket_stats(df, every))
+
+
+# Breakdown dimension -> tweet column (lists are exploded, one row per entry)
+BREAKDOWN_COLUMNS = {"hashtag": "hashtags", "author": "username"}
+
+
+def compute_breakdown(
+    df, by: str = "hashtag", every: str = SIGNAL_BUCKET, top_k: int = 10
+) -> pl.DataFrame:
+    """
+    Composite signal per ``by`` key and bucket, for the ``top_k`` keys with
+    the most tweets. Tweets are scored once, exploded into one row per key,
+    and every series comes out of a single group_by over (key, bucket);
+    pruning to the top keys happens on the small stats frame.
+    """
+    col = BREAKDOWN_COLUMNS[by]
+    lf = _scored(df.lazy().select([*SIGNAL_COLUMNS, col]), every)
+    if lf.collect_schema()[col] == pl.List(pl.String):
+        # A tag repeated within a tweet counts once
+        lf = lf.with_columns(pl.col(col).list.unique()).explode(col)
+    stats = (
+        lf.rename({col: "key"})
+        .drop_nulls("key")
+        .group_by(["key", "bucket"])
+        .agg(_stat_aggs())
+        .collect(streaming=True)
+    )
+    if stats.is_empty():
+        return stats
+    top = (
+        stats.group_by("key")
+        .agg(pl.col("n").sum().alias("total"))
+        .sort(["total", "key"], descending=[True, False])
+        .head(top_k)
+    )
+    stats = stats.join(top, on="key", how="semi")
+    return (
+        finalize_stats(stats, by=["key"])
+        .join(top, on="key")
+        .sort(["total", "key", "bucket"], descending=[True, False, False])
+    )
@@ -1,23 +1,32 @@
+from functools import lru_cache
+import numpy as np
 import polars as pl
-from sklearn.feature_extraction.text import TfidfVectorizer
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from sklearn.preprocessing import normalize
 
+# Stateless hashing features: parts can be vectorized once, independently
+HASH_FEATURES = 2**20
+TOKEN_PATTERN = r"(?u)\b\w+\b"
 
-def build_tfidf(df: pl.DataFrame, max_features: int = 5000):
+
+def build_tfidf(df, max_features: int = 5000):
     """
-    Build TF-IDF vectors from a Polars dataframe with a 'content' column.
-    Cleans empty rows and avoids empty-vocab errors.
+    Build TF-IDF vectors from a Polars DataFrame or LazyFrame with a 'content'
+    column. Cleans empty rows and avoids empty-vocab errors.
     """
-    if "content" not in df.columns:
+    if "content" not in df.collect_schema().names():
         raise ValueError("❌ DataFrame must contain a 'content' column.")
 
-    # Convert to string, strip whitespace, fill nulls
-    texts = df["content"].map_elements(
-        lambda x: str(x).strip() if x is not None else "", return_dtype=pl.Utf8
+    # Convert to string, strip whitespace, fill nulls, drop empty strings
+    texts = (
+        df.lazy()
+        .select(pl.col("content").cast(pl.Utf8).fill_null("").str.strip_chars())
+        .filter(pl.col("content") != "")
+        .collect(streaming=True)
+        .get_column("content")
     )
 
-    # Filter out empty strings
-    texts = texts.filter(texts != "")
-
     if texts.is_empty():
         raise ValueError("❌ No valid text found in dataframe for TF-IDF.")
 
@@ -33,3 +42,48 @@ def build_tfidf(df: pl.DataFrame, max_features: int = 5000):
     X = vect.fit_transform(text_list)
 
     return vect, X
+
+
+def tfidf_summary(df, max_features: int = 5000) -> dict:
+    """
+    Fit TF-IDF and return only light metadata. Top level so it can run in the
+    CPU process pool without shipping the sparse matrix back.
+    """
+    vect, X = build_tfidf(df, max_features=max_features)
+    return {
+        "docs": int(df.height),
+        "vocab_size": int(len(vect.vocabulary_)),
+        "shape": list(X.shape),
+        "sample_terms": list(sorted(list(vect.vocabulary_.keys()))[:10]),
+    }
+
+
+@lru_cache(maxsize=1)
+def hashing_vectorizer() -> HashingVectorizer:
+    return HashingVectorizer(
+        n_features=HASH_FEATURES,
+        token_pattern=TOKEN_PATTERN,
+        alternate_sign=False,
+        norm=None,
+        dtype=np.float32,
+    )
+
+
+def hash_counts(texts: pl.Series) -> sparse.csr_matrix:
+    """Raw term counts of each text in the hashed feature space."""
+    return hashing_vectorizer().transform(texts.to_list()).tocsr()
+
+
+def document_frequency(X: sparse.csr_matrix) -> np.ndarray:
+    return np.bincount(X.indices, minlength=X.shape[1])
+
+
+def term_frequency(X: sparse.csr_matrix) -> np.ndarray:
+    """Total count of each column over all rows."""
+    return np.bincount(X.indices, weights=X.data, minlength=X.shape[1]).astype(np.int64)
+
+
+def apply_idf(X: sparse.csr_matrix, df: np.ndarray, n_docs: int) -> sparse.csr_matrix:
+    """Smoothed IDF and l2 normalisation, as TfidfVectorizer's defaults."""
+    idf = np.log((1 + n_docs) / (1 + df)) + 1
+    return normalize(X.multiply(idf.astype(np.float32)).tocsr())
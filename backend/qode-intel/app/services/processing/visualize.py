@@ -1,47 +1,84 @@
 import io
-import pandas as pd
+import threading
 import polars as pl
-import matplotlib
-
-matplotlib.use("Agg")  # headless
-import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.dates import AutoDateLocator, ConciseDateFormatter, date2num
+from matplotlib.figure import Figure
+from matplotlib.patches import Patch
 from app.config import PLOT_MAX_POINTS
+from app.services.processing.downsample import downsample
 
+SIGNAL_FORMATS = {"png": "image/png", "svg": "image/svg+xml"}
 
-def downsample(df: pl.DataFrame, max_points: int) -> pl.DataFrame:
-    if df.height <= max_points:
-        return df
-    stride = max(1, df.height // max_points)
-    return df[::stride]
 
+class SignalRenderer:
+    """
+    One pre-built figure (object-oriented Agg API, no pyplot state) whose
+    artists are updated in place for each render. Not thread-safe by itself:
+    use one per thread, see plot_signal.
+    """
+
+    def __init__(self, size=(9, 4), dpi=100):
+        self.fig = Figure(figsize=size, dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.fig)
+        # Fixed margins instead of tight_layout on every render
+        self.fig.subplots_adjust(left=0.08, right=0.98, bottom=0.12, top=0.96)
+        self.ax = self.fig.add_subplot()
+        (self.line,) = self.ax.plot([], [], label="Composite Signal")
+        self.band = None
+        locator = AutoDateLocator()
+        self.ax.xaxis.set_major_locator(locator)
+        self.ax.xaxis.set_major_formatter(ConciseDateFormatter(locator))
+        self.ax.set_xlabel("Time")
+        self.ax.set_ylabel("Signal (-1..1)")
+        self.legend_band = Patch(alpha=0.2, label="95% CI")
+
+    def render(self, df: pl.DataFrame, fmt: str = "png") -> bytes:
+        x = date2num(df.get_column("bucket").dt.replace_time_zone(None).to_numpy())
+        y = df.get_column("signal").to_numpy()
+        ci = df.get_column("ci95").to_numpy()
+
+        if self.band is not None:
+            self.band.remove()
+            self.band = None
+        self.line.set_data(x, y)
+        handles = [self.line]
+        if len(x) < 2:
+            self.line.set_marker("o")
+        else:
+            self.line.set_marker("None")
+            self.band = self.ax.fill_between(
+                x, y - ci, y + ci, alpha=0.2, color=self.line.get_color()
+            )
+            self.legend_band.set_facecolor(self.line.get_color())
+            handles.append(self.legend_band)
+        self.ax.legend(handles=handles, loc="upper left")
+        self.ax.relim()
+        self.ax.autoscale_view()
 
-def plot_signal(df: pl.DataFrame) -> bytes:
-    if df.is_empty():
-        fig = plt.figure(figsize=(1, 1))
         buf = io.BytesIO()
-        plt.savefig(buf, format="png", bbox_inches="tight")
-        plt.close(fig)
+        # Fast zlib level: the chart is mostly flat colour, so it barely grows
+        extra = {"pil_kwargs": {"compress_level": 1}} if fmt == "png" else {}
+        self.canvas.print_figure(buf, format=fmt, **extra)
         return buf.getvalue()
 
-    df2 = df.select(["bucket", "signal", "ci95"]).sort("bucket")
-    df2 = downsample(df2, PLOT_MAX_POINTS)
-
-    x = pd.to_datetime(df2.get_column("bucket").to_pandas())
-    y = df2.get_column("signal").to_numpy()
-    ci = df2.get_column("ci95").to_numpy()
-
-    fig = plt.figure(figsize=(9, 4))
-    ax = plt.gca()
-    if len(x) < 2:
-        ax.plot(x, y, label="Composite Signal", marker="o")
-    else:
-        ax.plot(x, y, label="Composite Signal")
-        ax.fill_between(x, y - ci, y + ci, alpha=0.2, label="95% CI")
-    ax.set_xlabel("Time")
-    ax.set_ylabel("Signal (-1..1)")
-    ax.legend()
-    fig.tight_layout()
+
+_local = threading.local()
+
+
+def _blank(fmt: str) -> bytes:
+    fig = Figure(figsize=(1, 1))
     buf = io.BytesIO()
-    plt.savefig(buf, format="png")
-    plt.close(fig)
+    FigureCanvasAgg(fig).print_figure(buf, format=fmt)
     return buf.getvalue()
+
+
+def plot_signal(df: pl.DataFrame, fmt: str = "png") -> bytes:
+    """Render the composite signal with the calling thread's renderer."""
+    if df.is_empty():
+        return _blank(fmt)
+    renderer = getattr(_local, "renderer", None)
+    if renderer is None:
+        renderer = _local.renderer = SignalRenderer()
+    df2 = df.select(["bucket", "signal", "ci95"]).sort("bucket")
+    return renderer.render(downsample(df2, PLOT_MAX_POINTS), fmt)
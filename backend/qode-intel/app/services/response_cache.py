@@ -0,0 +1,126 @@
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+from hashlib import blake2b
+from typing import Awaitable, Callable, Dict, Hashable, Tuple
+import polars as pl
+from fastapi import Request, Response
+from app.config import RESPONSE_CACHE_MAX_BYTES
+from app.services.processing.signals import SIGNAL_BUCKET
+from app.services.storage.data_version import data_version
+from app.utils.time import last_24h_window
+
+
+@dataclass
+class CachedBody:
+    body: bytes
+    media_type: str
+    etag: str
+
+
+class ResponseCache:
+    """
+    LRU of rendered response bodies bounded by total bytes, with single-flight
+    computation: concurrent misses on one key share a single computation.
+    """
+
+    def __init__(self, max_bytes: int = RESPONSE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, CachedBody]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.bytes = 0
+        self.hits = self.misses = self.coalesced = 0
+        self.evictions = self.not_modified = 0
+
+    async def get(
+        self, key: Hashable, compute: Callable[[], Awaitable[Tuple[bytes, str]]]
+    ) -> CachedBody:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+        task = self._inflight.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(self._fill(key, compute))
+            self._inflight[key] = task
+        else:
+            self.coalesced += 1
+        # A disconnecting client must not cancel the computation others share
+        return await asyncio.shield(task)
+
+    async def _fill(self, key: Hashable, compute) -> CachedBody:
+        try:
+            body, media_type = await compute()
+            entry = CachedBody(
+                body, media_type, f'"{blake2b(body, digest_size=16).hexdigest()}"'
+            )
+            self._store(key, entry)
+            return entry
+        finally:
+            del self._inflight[key]
+
+    def _store(self, key: Hashable, entry: CachedBody):
+        size = len(entry.body)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = entry
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, old = self._entries.popitem(last=False)
+            self.bytes -= len(old.body)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+    def metrics(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "not_modified": self.not_modified,
+            "hit_ratio": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+        }
+
+
+response_cache = ResponseCache()
+
+
+def window_key() -> str:
+    # The rolling 24h window moves on every request; key on its start floored
+    # to the signal bucket so results are reused within a bucket
+    since, _ = last_24h_window()
+    return pl.select(pl.lit(since).dt.truncate(SIGNAL_BUCKET)).item().isoformat()
+
+
+async def cached_response(
+    request: Request,
+    endpoint: str,
+    params: dict,
+    compute: Callable[[], Awaitable[Tuple[bytes, str]]],
+    cache: ResponseCache = response_cache,
+    rolling: bool = True,
+) -> Response:
+    """
+    Serve ``compute()``'s (body, media_type) from the cache, keyed on the
+    endpoint, its params, the data version and, for ``rolling`` (default
+    last-24h) requests, the current window. Honours If-None-Match on GET.
+    """
+    window = window_key() if rolling else None
+    key = (endpoint, tuple(sorted(params.items())), data_version(), window)
+    entry = await cache.get(key, compute)
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if request.method == "GET" and entry.etag in request.headers.get(
+        "if-none-match", ""
+    ):
+        cache.not_modified += 1
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type=entry.media_type, headers=headers)
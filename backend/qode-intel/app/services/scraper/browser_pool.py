@@ -0,0 +1,203 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import Optional
+from app.config import (
+    BROWSER_MAX_NAVIGATIONS,
+    BROWSER_MAX_PAGES,
+    BROWSER_PAGE_MAX_NAVIGATIONS,
+)
+from app.utils.logging import logger
+
+try:
+    from playwright.async_api import async_playwright
+except Exception:  # pragma: no cover
+    async_playwright = None
+
+
+class BrowserPool:
+    """
+    One long-lived Firefox with a reusable context per auth mode and a
+    bounded pool of pages. Pages are recycled after a number of navigations
+    and the whole browser after BROWSER_MAX_NAVIGATIONS, or as soon as it
+    disconnects.
+    """
+
+    def __init__(
+        self,
+        state_file: str,
+        max_pages: int = BROWSER_MAX_PAGES,
+        page_max_navigations: int = BROWSER_PAGE_MAX_NAVIGATIONS,
+        browser_max_navigations: int = BROWSER_MAX_NAVIGATIONS,
+        playwright_factory=None,
+    ):
+        self.state_file = state_file
+        self.max_pages = max_pages
+        self.page_max_navigations = page_max_navigations
+        self.browser_max_navigations = browser_max_navigations
+        self._factory = playwright_factory or async_playwright
+        self._pw = None
+        self._browser = None
+        self._contexts = {}
+        self._idle = {True: [], False: []}
+        self._navs = {}
+        self._owner = {}
+        self._browser_navs = 0
+        self._leased = 0
+        self._slots = asyncio.Semaphore(max_pages)
+        self._lock = asyncio.Lock()
+        self._state_mtime: Optional[float] = None
+        self.launches = 0
+
+    @property
+    def available(self) -> bool:
+        return self._factory is not None
+
+    async def start(self):
+        async with self._lock:
+            await self._ensure_browser()
+
+    async def stop(self):
+        async with self._lock:
+            await self._close_browser()
+            if self._pw is not None:
+                await self._pw.stop()
+                self._pw = None
+
+    async def _ensure_browser(self):
+        if not self.available:
+            raise RuntimeError("Playwright is not installed")
+        if self._pw is None:
+            self._pw = await self._factory().start()
+        if self._browser is not None and self._browser.is_connected():
+            return
+        await self._close_browser()
+        self._browser = await self._pw.firefox.launch(headless=True)
+        self.launches += 1
+        logger.info("Browser pool launched Firefox")
+
+    async def _close_browser(self):
+        browser = self._browser
+        self._browser, self._contexts = None, {}
+        self._idle = {True: [], False: []}
+        self._navs, self._owner, self._browser_navs = {}, {}, 0
+        if browser is not None:
+            try:
+                await browser.close()
+            except Exception:
+                logger.warning("Browser pool failed to close Firefox cleanly")
+
+    async def _context(self, authenticated: bool):
+        if authenticated:
+            if not os.path.exists(self.state_file):
+                raise RuntimeError("No login state found. Please login first.")
+            mtime = os.path.getmtime(self.state_file)
+            if mtime != self._state_mtime:
+                # A fresh login replaced the saved state: rebuild the context
+                await self._retire_context(True)
+                self._state_mtime = mtime
+        if authenticated not in self._contexts:
+            kwargs = {"storage_state": self.state_file} if authenticated else {}
+            self._contexts[authenticated] = await self._browser.new_context(**kwargs)
+        return self._contexts[authenticated]
+
+    async def _retire_context(self, authenticated: bool):
+        """
+        Stop handing out a context. Its idle pages go now; the context itself
+        is closed once the last page leased from it comes back, so running
+        scrapes keep their pages.
+        """
+        context = self._contexts.pop(authenticated, None)
+        idle, self._idle[authenticated] = self._idle[authenticated], []
+        for page in idle:
+            self._navs.pop(page, None)
+            self._owner.pop(page, None)
+            if not page.is_closed():
+                await page.close()
+        if context is not None:
+            await self._close_if_unused(context)
+
+    async def _close_if_unused(self, context):
+        if any(owner is context for owner in self._owner.values()):
+            return
+        try:
+            await context.close()
+        except Exception:
+            logger.warning("Browser pool failed to close a retired context")
+
+    def _track(self, page, context):
+        self._navs[page] = 0
+        self._owner[page] = context
+
+        def on_nav(frame):
+            if frame == page.main_frame:
+                self._navs[page] = self._navs.get(page, 0) + 1
+                self._browser_navs += 1
+
+        page.on("framenavigated", on_nav)
+
+    async def _acquire(self, authenticated: bool):
+        async with self._lock:
+            await self._ensure_browser()
+            if self._browser_navs >= self.browser_max_navigations and not self._leased:
+                logger.info("Browser pool recycling Firefox")
+                await self._close_browser()
+                await self._ensure_browser()
+            context = await self._context(authenticated)
+            idle = self._idle[authenticated]
+            while idle:
+                page = idle.pop()
+                if not page.is_closed():
+                    break
+            else:
+                page = await context.new_page()
+                self._track(page, context)
+            self._leased += 1
+            return page
+
+    async def _release(self, page, authenticated: bool):
+        async with self._lock:
+            self._leased -= 1
+            stale = self._navs.get(page, 0) >= self.page_max_navigations
+            owner = self._owner.get(page)
+            current = owner is self._contexts.get(authenticated)
+            if page.is_closed() or stale or not current:
+                self._navs.pop(page, None)
+                self._owner.pop(page, None)
+                if not page.is_closed():
+                    await page.close()
+                if owner is not None and not current:
+                    # The last page of a retired context closes it
+                    await self._close_if_unused(owner)
+                return
+            self._idle[authenticated].append(page)
+
+    @asynccontextmanager
+    async def page(self, authenticated: bool = True):
+        """Lease a page; at most ``max_pages`` are leased at once."""
+        async with self._slots:
+            page = await self._acquire(authenticated)
+            try:
+                yield page
+            finally:
+                await self._release(page, authenticated)
+
+    async def invalidate_auth(self):
+        """
+        Stop using the authenticated context (e.g. after a new login); pages
+        already leased from it keep working until they are released.
+        """
+        async with self._lock:
+            self._state_mtime = None
+            await self._retire_context(True)
+
+    async def health(self) -> dict:
+        """Counters plus liveness; a dead browser is relaunched on next lease."""
+        connected = self._browser is not None and self._browser.is_connected()
+        return {
+            "connected": connected,
+            "launches": self.launches,
+            "leased_pages": self._leased,
+            "idle_pages": sum(len(v) for v in self._idle.values()),
+            "navigations": self._browser_navs,
+        }
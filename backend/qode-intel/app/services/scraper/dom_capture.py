@@ -0,0 +1,163 @@
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional, Set, Tuple
+from app.models.tweet import Tweet
+from app.utils.text import extract_entities
+
+# Installed once per page and called once per scroll: a MutationObserver
+# queues articles that were added or re-rendered, a WeakMap remembers which
+# status link each article was last read with, and only cards that are new
+# since the previous call are serialised back. The same call then scrolls,
+# so each scroll step costs exactly one IPC hop.
+COLLECT_NEW_CARDS_JS = """(scrollStep) => {
+  let c = window.__qodeCursor;
+  if (!c) {
+    c = window.__qodeCursor = { read: new WeakMap(), links: new Set(), queue: new Set() };
+    const enqueue = (node) => {
+      const el = node.nodeType === 1 ? node : node.parentElement;
+      if (!el) return;
+      const art = el.closest("article");
+      if (art) c.queue.add(art);
+      if (el.querySelectorAll) el.querySelectorAll("article").forEach((a) => c.queue.add(a));
+    };
+    new MutationObserver((records) => {
+      for (const r of records) {
+        enqueue(r.target);
+        r.addedNodes.forEach(enqueue);
+      }
+    }).observe(document.body, { childList: true, subtree: true, characterData: true });
+    document.querySelectorAll("article").forEach((a) => c.queue.add(a));
+  }
+  const cards = [];
+  let skipped = 0;
+  for (const el of c.queue) {
+    if (!el.isConnected) continue;
+    const link = el.querySelector("a[href*='/status/']")?.getAttribute("href");
+    if (!link || c.read.get(el) === link) continue;
+    c.read.set(el, link);
+    if (c.links.has(link)) { skipped++; continue; }
+    const content = [...el.querySelectorAll("div[data-testid='tweetText']")]
+      .map((n) => n.innerText).join(" ").trim();
+    if (!content) continue;
+    c.links.add(link);
+    cards.push({
+      content,
+      link,
+      user: el.querySelector("a[href^='/']")?.getAttribute("href") || "",
+      time: el.querySelector("time")?.getAttribute("datetime") || null,
+      counts: Object.fromEntries(["reply", "retweet", "like"].map((k) => [
+        k,
+        el.querySelector(`[data-testid='${k}'], [data-testid='un${k}']`)
+          ?.getAttribute("aria-label") || "",
+      ])),
+    });
+  }
+  c.queue.clear();
+  const height = document.body.scrollHeight;
+  if (scrollStep) window.scrollBy(0, scrollStep);
+  return { cards, skipped, height };
+}"""
+
+# Action buttons are labelled like "1,234 Likes. Like"
+COUNT_RE = re.compile(r"^\s*([\d,]+)")
+
+SCROLL_JS = """(scrollStep) => {
+  const height = document.body.scrollHeight;
+  window.scrollBy(0, scrollStep);
+  return height;
+}"""
+
+
+@dataclass
+class ScrapeStats:
+    """Per-hashtag extraction counters."""
+
+    hashtag: str
+    mode: str = "dom"
+    cards: int = 0
+    duplicates_skipped: int = 0
+    undated: int = 0  # cards without a <time>, not kept
+    ipc_calls: int = 0
+    scrolls: int = 0
+    started: float = field(default_factory=time.monotonic)
+    finished: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.monotonic()) - self.started
+
+    def as_dict(self) -> dict:
+        seen = self.cards + self.duplicates_skipped
+        return {
+            "hashtag": self.hashtag,
+            "mode": self.mode,
+            "cards": self.cards,
+            "cards_per_second": self.cards / self.elapsed if self.elapsed else 0.0,
+            "ipc_calls_per_scroll": self.ipc_calls / max(1, self.scrolls),
+            "duplicate_skip_ratio": self.duplicates_skipped / seen if seen else 0.0,
+            "undated": self.undated,
+        }
+
+
+def _count(label: str) -> int:
+    m = COUNT_RE.match(label or "")
+    return int(m.group(1).replace(",", "")) if m else 0
+
+
+def card_to_tweet(card: dict, hashtag: str) -> Optional[Tweet]:
+    """
+    The tweet of a serialised card, or None without a timestamp: stamping it
+    with the scrape time would put it in the wrong signal bucket.
+    """
+    if not card.get("time"):
+        return None
+    mentions, hashtags = extract_entities(card["content"])
+    counts = card.get("counts") or {}
+    return Tweet(
+        id=card["link"].split("/status/")[-1].split("?")[0],
+        username=card["user"].strip("/"),
+        timestamp=datetime.fromisoformat(card["time"].replace("Z", "+00:00")),
+        content=card["content"],
+        like_count=_count(counts.get("like")),
+        retweet_count=_count(counts.get("retweet")),
+        reply_count=_count(counts.get("reply")),
+        mentions=mentions,
+        hashtags=list({*hashtags, hashtag.strip("#").lower()}),
+    )
+
+
+async def collect_new_cards(
+    page,
+    hashtag: str,
+    since_utc: datetime,
+    until_utc: datetime,
+    seen: Set[str],
+    stats: ScrapeStats,
+    scroll_step: int = 0,
+) -> Tuple[List[Tweet], int]:
+    """
+    Tweets from the cards rendered since the previous call, then scroll by
+    ``scroll_step``; returns the tweets and the page height before scrolling.
+    """
+    result = await page.evaluate(COLLECT_NEW_CARDS_JS, scroll_step)
+    stats.ipc_calls += 1
+    stats.duplicates_skipped += result["skipped"]
+    tweets: List[Tweet] = []
+    for card in result["cards"]:
+        try:
+            tweet = card_to_tweet(card, hashtag)
+        except (KeyError, ValueError):
+            continue
+        if tweet is None:
+            stats.undated += 1
+            continue
+        stats.cards += 1
+        if tweet.id in seen:
+            stats.duplicates_skipped += 1
+            continue
+        seen.add(tweet.id)
+        if since_utc <= tweet.timestamp <= until_utc:
+            tweets.append(tweet)
+    return tweets, result["height"]
@@ -1,11 +1,24 @@
-from typing import List
-from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List, Optional
+from datetime import datetime
+from app.config import (
+    LOGIN_STATUS_TTL_SECONDS,
+    SCRAPE_CAPTURE_MODE,
+    SCRAPE_FIRST_PAYLOAD_TIMEOUT,
+    SCRAPE_IDLE_SECONDS,
+    X_BASE_URL,
+)
 from app.models.tweet import Tweet
-from app.utils.text import extract_entities
+from app.services.scraper.browser_pool import BrowserPool
+from app.services.scraper.dom_capture import SCROLL_JS, ScrapeStats, collect_new_cards
+from app.services.scraper.rate_limiter import limiter_for, retry_after_seconds
+from app.services.scraper.scheduler import ScrollScheduler
+from app.services.scraper.timeline import TimelineCapture
+from app.utils.logging import logger
 import asyncio
 import sys
 import platform
 import os
+import time
 
 # Fix Windows event loop policy
 if platform.system() == "Windows":
@@ -21,22 +34,44 @@ except Exception:  # pragma: no cover
 class PlaywrightClient:
     STATE_FILE = "/app/twitter_state.json"
 
+    def __init__(self, pool: Optional[BrowserPool] = None):
+        self.pool = pool or BrowserPool(self.STATE_FILE)
+        self._login_cache = None  # (state mtime, checked at, is_valid)
+        self.stats: Dict[str, ScrapeStats] = {}  # latest run per hashtag
+        # Shared by every page: all navigations and scrolls go through it
+        self.limiter = limiter_for(X_BASE_URL)
+
+    async def _goto(self, page, url: str, key: str = "", **kwargs):
+        await self.limiter.acquire(key)
+        t0 = time.monotonic()
+        try:
+            response = await page.goto(url, **kwargs)
+        except Exception:
+            self.limiter.record(latency=time.monotonic() - t0, empty=True)
+            raise
+        status = response.status if response is not None else None
+        self.limiter.record(
+            status=status,
+            latency=time.monotonic() - t0,
+            retry_after=retry_after_seconds(response.headers) if response else None,
+        )
+        return response
+
     async def login_and_save_state(self, username: str, password: str) -> bool:
         """Login to Twitter and save the authentication state"""
         if not username or not password:
             raise ValueError("Username and password are required")
 
-        async with async_playwright() as p:
-            browser = await p.firefox.launch(headless=True)
-            context = await browser.new_context()
-            page = await context.new_page()
+        async with self.pool.page(authenticated=False) as page:
+            await page.context.clear_cookies()
             try:
                 return await self._perform_login(page, username, password)
             finally:
-                await browser.close()
+                self._login_cache = None
+                await self.pool.invalidate_auth()
 
     async def _perform_login(self, page, username: str, password: str) -> bool:
-        await page.goto("https://x.com/login", timeout=60000)
+        await self._goto(page, f"{X_BASE_URL}/login", "session", timeout=60000)
 
         # Username
         await page.fill('input[name="text"]', username)
@@ -68,152 +103,202 @@ class PlaywrightClient:
     async def check_login_state(self) -> bool:
         if not os.path.exists(self.STATE_FILE):
             return False
-        async with async_playwright() as p:
-            browser = await p.firefox.launch(headless=True)
-            try:
-                context = await browser.new_context(storage_state=self.STATE_FILE)
-                page = await context.new_page()
-                await page.goto("https://x.com/home", timeout=15000)
-                return "login" not in page.url
-            except Exception:
-                return False
-            finally:
-                await browser.close()
+        # Pollers hit this constantly: navigate at most once per TTL per state
+        mtime = os.path.getmtime(self.STATE_FILE)
+        cached = self._login_cache
+        if (
+            cached
+            and cached[0] == mtime
+            and time.monotonic() - cached[1] < LOGIN_STATUS_TTL_SECONDS
+        ):
+            return cached[2]
+        try:
+            async with self.pool.page() as page:
+                await self._goto(page, f"{X_BASE_URL}/home", "session", timeout=15000)
+                is_valid = "login" not in page.url
+        except Exception:
+            return False
+        self._login_cache = (mtime, time.monotonic(), is_valid)
+        return is_valid
 
-    async def _get_authenticated_context(self, playwright):
+    async def _ensure_authenticated(self):
         if not os.path.exists(self.STATE_FILE):
             raise RuntimeError("No login state found. Please login first.")
-
-        browser = await playwright.firefox.launch(headless=True)
-        try:
-            context = await browser.new_context(storage_state=self.STATE_FILE)
-            page = await context.new_page()
-            await page.goto("https://x.com/home", timeout=15000)
-
-            if "login" in page.url:
-                await browser.close()
-                raise RuntimeError("Session expired. Please login again.")
-            return browser, context
-        except Exception as e:
-            await browser.close()
-            raise RuntimeError(f"Failed to authenticate: {e}")
-
-    async def _scrape_hashtag(
-        self, page, hashtag: str, since_utc: datetime, until_utc: datetime, limit: int
-    ) -> List[Tweet]:
+        if not await self.check_login_state():
+            raise RuntimeError("Session expired. Please login again.")
+
+    async def _stream_hashtag(
+        self,
+        page,
+        hashtag: str,
+        since_utc: datetime,
+        until_utc: datetime,
+        limit: int,
+        before: Optional[datetime] = None,
+    ) -> AsyncIterator[List[Tweet]]:
+        """
+        Yield the new in-window tweets of every scroll step, up to ``limit``.
+        With ``before`` the search starts below that time, resuming a
+        preempted scroll where it stopped.
+        """
         q = f"%23{hashtag.strip('#')}%20lang%3Aen"
-        url = f"https://x.com/search?q={q}&src=typed_query&f=live"
-        tweets: List[Tweet] = []
+        if before is not None and before < until_utc:
+            q += f"%20until_time%3A{int(before.timestamp())}"
+            until_utc = before
+        url = f"{X_BASE_URL}/search?q={q}&src=typed_query&f=live"
+        count = 0
         seen = set()
+        stats = ScrapeStats(hashtag)
+        self.stats[hashtag] = stats
 
-        await page.goto(url, timeout=60000)
+        # Prefer the timeline JSON the page fetches itself; the DOM is only a
+        # fallback when no payload shows up after the first load.
+        capture = None
+        if SCRAPE_CAPTURE_MODE == "network":
+            capture = TimelineCapture(hashtag)
+            page.on("response", capture.on_response)
+            stats.mode = "network"
 
-        last_height, no_new_count = 0, 0
-        MAX_NO_NEW_SCROLLS = 3
-        SCROLL_STEP = 2000
-        WAIT_AFTER_SCROLL = 2
+        try:
+            await self._goto(page, url, hashtag, timeout=60000)
+            if capture is not None and not await capture.wait_first(
+                SCRAPE_FIRST_PAYLOAD_TIMEOUT
+            ):
+                logger.info(f"No timeline payload for {hashtag}; using DOM capture")
+                page.remove_listener("response", capture.on_response)
+                capture = None
+                stats.mode = "dom"
+            if capture is None:
+                await page.wait_for_selector("article", timeout=10000)
 
-        sem = asyncio.Semaphore(20)
+            last_height, no_new_count = 0, 0
+            last_new = time.monotonic()
+            throttled = 0
+            MAX_NO_NEW_SCROLLS = 3
+            SCROLL_STEP = 2000
 
-        async def process_card(card):
-            async with sem:
+            while count < limit:
+                # Paced by the shared limiter instead of a fixed sleep
+                await self.limiter.acquire(hashtag)
+                t0 = time.monotonic()
                 try:
-                    data = await card.evaluate(
-                        """(el) => {
-                        const content = [...el.querySelectorAll("div[data-testid='tweetText']")]
-                            .map(n => n.innerText).join(" ").trim();
-                        const link = el.querySelector("a[href*='/status/']")?.getAttribute("href");
-                        const user = el.querySelector("a[href^='/']")?.getAttribute("href") || "";
-                        return { content, link, user };
-                    }"""
-                    )
-                    if not data or not data["content"] or not data["link"]:
-                        return None
-
-                    tid = data["link"].split("/status/")[-1].split("?")[0]
-                    if tid in seen:
-                        return None
-                    seen.add(tid)
-
-                    ts = datetime.now(timezone.utc)
-                    if not (since_utc <= ts <= until_utc):
-                        return None
-
-                    mentions, hashtags_ex = extract_entities(data["content"])
-                    return Tweet(
-                        id=tid,
-                        username=data["user"].strip("/"),
-                        timestamp=ts,
-                        content=data["content"],
-                        mentions=mentions,
-                        hashtags=list({*hashtags_ex, hashtag.strip("#").lower()}),
-                    )
+                    # One IPC per step: extract what is new, then scroll
+                    if capture is not None:
+                        new_items = []
+                        for t in await capture.drain():
+                            stats.cards += 1
+                            if t.id in seen:
+                                stats.duplicates_skipped += 1
+                                continue
+                            seen.add(t.id)
+                            if since_utc <= t.timestamp <= until_utc:
+                                new_items.append(t)
+                        new_height = await page.evaluate(SCROLL_JS, SCROLL_STEP)
+                        stats.ipc_calls += 1
+                    else:
+                        new_items, new_height = await collect_new_cards(
+                            page,
+                            hashtag,
+                            since_utc,
+                            until_utc,
+                            seen,
+                            stats,
+                            SCROLL_STEP,
+                        )
+                    stats.scrolls += 1
+                    new_items = new_items[: limit - count]
+                    count += len(new_items)
                 except Exception:
-                    return None
-
-        while len(tweets) < limit:
-            try:
-                await page.wait_for_selector("article", timeout=10000)
-                cards = await page.locator("article").all()
+                    self.limiter.record(latency=time.monotonic() - t0, empty=True)
+                    break
 
-                results = await asyncio.gather(*[process_card(c) for c in cards])
-                new_items = [r for r in results if r]
-                tweets.extend(new_items)
+                status, retry_after = None, None
+                if capture is not None and capture.throttled > throttled:
+                    throttled = capture.throttled
+                    status, retry_after = 429, capture.retry_after
+                self.limiter.record(
+                    status=status,
+                    latency=time.monotonic() - t0,
+                    empty=new_height == last_height and not new_items,
+                    retry_after=retry_after,
+                )
 
-                if len(tweets) >= limit:
+                if new_items:
+                    yield new_items
+                if count >= limit:
                     break
 
-                await page.evaluate(f"window.scrollBy(0, {SCROLL_STEP})")
-                await asyncio.sleep(WAIT_AFTER_SCROLL)
+                # Live search is newest-first: past the window, stop
+                if capture is not None and capture.oldest is not None:
+                    if capture.oldest < since_utc:
+                        break
 
-                new_height = await page.evaluate("() => document.body.scrollHeight")
                 if new_height == last_height and not new_items:
                     no_new_count += 1
-                    if no_new_count >= MAX_NO_NEW_SCROLLS:
+                    # Quick steps may simply outrun the page: also require a
+                    # quiet spell before giving up
+                    if (
+                        no_new_count >= MAX_NO_NEW_SCROLLS
+                        and time.monotonic() - last_new >= SCRAPE_IDLE_SECONDS
+                    ):
                         break
                 else:
                     no_new_count = 0
+                    last_new = time.monotonic()
                 last_height = new_height
+        finally:
+            stats.finished = time.monotonic()
+            if capture is not None:
+                page.remove_listener("response", capture.on_response)
 
-            except Exception:
-                break
-
-        return tweets[:limit]
+    async def _scrape_hashtag(
+        self, page, hashtag: str, since_utc: datetime, until_utc: datetime, limit: int
+    ) -> List[Tweet]:
+        tweets: List[Tweet] = []
+        async for items in self._stream_hashtag(
+            page, hashtag, since_utc, until_utc, limit
+        ):
+            tweets.extend(items)
+        return tweets
 
-    async def scrape_async(
+    async def scrape_stream(
         self, hashtags: List[str], since_utc: datetime, until_utc: datetime, limit: int
-    ) -> List[Tweet]:
+    ) -> AsyncIterator[List[Tweet]]:
+        """
+        Yield batches of new tweets (unique across hashtags) as the pages
+        scroll, up to ``limit`` in total. Hashtags are scheduled over the
+        page pool by ScrollScheduler; a slow consumer pauses the scrolling
+        instead of buffering tweets.
+        """
         if async_playwright is None:
-            return []
+            return
 
-        tweets: List[Tweet] = []
-        per = max(1, limit // max(1, len(hashtags)))
-        BATCH_SIZE = 3
+        await self._ensure_authenticated()
+
+        async def open_stream(hashtag: str, before: Optional[datetime]):
+            async with self.pool.page() as page:
+                steps = self._stream_hashtag(
+                    page, hashtag, since_utc, until_utc, limit, before
+                )
+                try:
+                    async for items in steps:
+                        yield items
+                finally:
+                    await steps.aclose()  # detach its listeners before release
 
-        browser = None
+        scheduler = ScrollScheduler(hashtags, limit, self.pool.max_pages, open_stream)
+        batches = scheduler.run()
         try:
-            async with async_playwright() as p:
-                browser, context = await self._get_authenticated_context(p)
-
-                for i in range(0, len(hashtags), BATCH_SIZE):
-                    batch = hashtags[i : i + BATCH_SIZE]
-                    pages = [await context.new_page() for _ in batch]
-                    tasks = [
-                        self._scrape_hashtag(pages[j], h, since_utc, until_utc, per)
-                        for j, h in enumerate(batch)
-                    ]
-
-                    results = await asyncio.gather(*tasks, return_exceptions=True)
-                    for page in pages:
-                        await page.close()
-
-                    for r in results:
-                        if isinstance(r, Exception):
-                            continue
-                        tweets.extend(r)
+            async for batch in batches:
+                yield batch
         finally:
-            if browser:
-                await browser.close()
+            # Stop the pages now rather than whenever the generator is collected
+            await batches.aclose()
 
-        uniq = {t.id: t for t in tweets}
-        return list(uniq.values())[:limit]
+    async def scrape_async(
+        self, hashtags: List[str], since_utc: datetime, until_utc: datetime, limit: int
+    ) -> List[Tweet]:
+        tweets: List[Tweet] = []
+        async for items in self.scrape_stream(hashtags, since_utc, until_utc, limit):
+            tweets.extend(items)
+        return tweets
@@ -1,24 +1,185 @@
 import asyncio
 import time
+from collections import OrderedDict, deque
+from typing import Awaitable, Callable, Deque, Dict, Optional
+from urllib.parse import urlsplit
+from app.config import (
+    SCRAPE_LATENCY_TARGET,
+    SCRAPE_RATE_BURST,
+    SCRAPE_RATE_INITIAL,
+    SCRAPE_RATE_MAX,
+    SCRAPE_RATE_MIN,
+)
+
+THROTTLE_STATUSES = {429, 503}
+Clock = Callable[[], float]
+Sleep = Callable[[float], Awaitable[None]]
 
 
 class TokenBucket:
-    def __init__(self, rate: float, capacity: int):
+    def __init__(
+        self,
+        rate: float,
+        capacity: int,
+        clock: Clock = time.monotonic,
+        sleep: Sleep = asyncio.sleep,
+    ):
         self.rate = rate
         self.capacity = capacity
+        self.clock = clock
+        self.sleep = sleep
         self._tokens = capacity
-        self._last = time.monotonic()
+        self._last = clock()
         self._lock = asyncio.Lock()
 
+    def _refill(self):
+        now = self.clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def set_rate(self, rate: float):
+        self._refill()  # tokens earned so far accrue at the old rate
+        self.rate = rate
+
+    def pause(self, seconds: float):
+        """Withhold tokens for ``seconds`` (e.g. a Retry-After)."""
+        self._refill()
+        self._tokens = min(self._tokens, -seconds * self.rate)
+
     async def take(self, tokens: int = 1):
+        # Debit up front, possibly into debt, and sleep the debt off outside
+        # the lock: concurrent callers queue behind each other's debt instead
+        # of all waking at once on the same refill
         async with self._lock:
-            now = time.monotonic()
-            elapsed = now - self._last
-            self._last = now
-            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
-            if self._tokens >= tokens:
-                self._tokens -= tokens
-                return
-            need = tokens - self._tokens
-            wait = need / self.rate
-        await asyncio.sleep(wait)
+            self._refill()
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            await self.sleep(wait)
+
+
+class AdaptiveLimiter:
+    """
+    Request pacing for one remote domain. The rate follows AIMD: it grows by
+    ``increase`` per fast, productive request and is cut multiplicatively on
+    throttling (429/503, honouring Retry-After), on slow responses and on
+    empty loads, at most once per ``cut_interval``. Waiting callers are
+    served round-robin per key (hashtag), so one busy key cannot starve
+    the others; the wait itself is the backpressure on the scroll loops.
+    ``clock`` and ``sleep`` are injectable, to run it in simulated time.
+    """
+
+    def __init__(
+        self,
+        rate: float = SCRAPE_RATE_INITIAL,
+        min_rate: float = SCRAPE_RATE_MIN,
+        max_rate: float = SCRAPE_RATE_MAX,
+        burst: int = SCRAPE_RATE_BURST,
+        latency_target: float = SCRAPE_LATENCY_TARGET,
+        increase: float = 0.1,
+        throttle_factor: float = 0.5,
+        slow_factor: float = 0.8,
+        cut_interval: float = 1.0,
+        clock: Clock = time.monotonic,
+        sleep: Sleep = asyncio.sleep,
+    ):
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.latency_target = latency_target
+        self.increase = increase
+        self.throttle_factor = throttle_factor
+        self.slow_factor = slow_factor
+        self.cut_interval = cut_interval
+        self.clock = clock
+        self.bucket = TokenBucket(rate, burst, clock, sleep)
+        self.counts = {"granted": 0, "throttled": 0, "slow": 0, "empty": 0}
+        self._queues: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._last_cut = 0.0
+
+    @property
+    def rate(self) -> float:
+        return self.bucket.rate
+
+    def _set_rate(self, rate: float):
+        self.bucket.set_rate(min(self.max_rate, max(self.min_rate, rate)))
+
+    async def acquire(self, key: str = ""):
+        fut = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(key, deque()).append(fut)
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        await fut
+
+    def _next_waiter(self) -> Optional[asyncio.Future]:
+        """Pop the next live waiter, round-robin over the keys."""
+        while self._queues:
+            # Serve the first key, then move it to the back
+            key, waiters = self._queues.popitem(last=False)
+            while waiters and waiters[0].done():
+                waiters.popleft()  # cancelled while queued
+            if waiters:
+                fut = waiters.popleft()
+                if waiters:
+                    self._queues[key] = waiters
+                return fut
+        return None
+
+    async def _dispatch(self):
+        while self._queues:
+            await self.bucket.take()
+            # The token goes to whoever is next once it is here, so a waiter
+            # cancelled in the meantime hands it on rather than wasting it
+            fut = self._next_waiter()
+            if fut is not None:
+                fut.set_result(None)
+                self.counts["granted"] += 1
+
+    def _cut(self, factor: float):
+        now = self.clock()
+        if now - self._last_cut >= self.cut_interval:
+            self._last_cut = now
+            self._set_rate(self.rate * factor)
+
+    def record(
+        self,
+        status: Optional[int] = None,
+        latency: Optional[float] = None,
+        empty: bool = False,
+        retry_after: Optional[float] = None,
+    ):
+        """Feed back the outcome of one granted request."""
+        if status in THROTTLE_STATUSES:
+            self.counts["throttled"] += 1
+            self._cut(self.throttle_factor)
+            if retry_after:
+                self.bucket.pause(retry_after)
+        elif latency is not None and latency > self.latency_target:
+            self.counts["slow"] += 1
+            self._cut(self.slow_factor)
+        elif empty:
+            self.counts["empty"] += 1
+            self._cut(self.slow_factor)
+        else:
+            self._set_rate(self.rate + self.increase)
+
+    def as_dict(self) -> dict:
+        return {"rate": round(self.rate, 3), **self.counts}
+
+
+_limiters: Dict[str, AdaptiveLimiter] = {}
+
+
+def limiter_for(url: str) -> AdaptiveLimiter:
+    """The process-wide limiter of ``url``'s host."""
+    host = urlsplit(url).netloc or url
+    if host not in _limiters:
+        _limiters[host] = AdaptiveLimiter()
+    return _limiters[host]
+
+
+def retry_after_seconds(headers: dict) -> Optional[float]:
+    try:
+        return float(headers.get("retry-after", ""))
+    except ValueError:
+        return None
@@ -0,0 +1,114 @@
+import asyncio
+from collections import deque
+from datetime import datetime
+from typing import AsyncIterator, Callable, Deque, Dict, List, Optional, Set
+from app.models.tweet import Tweet
+from app.utils.logging import logger
+
+# (hashtag, resume cursor) -> scroll stream of the tweets older than the cursor
+StreamFactory = Callable[[str, Optional[datetime]], AsyncIterator[List[Tweet]]]
+
+
+class ScrollScheduler:
+    """
+    Work-stealing scheduling of hashtag scroll streams over ``workers``
+    pages. A free page takes the next waiting hashtag; while others are
+    waiting, a hashtag gives its page up once it reaches its quota and is
+    parked for later. The quota is a fair share of what is left of ``limit``
+    after the exhausted hashtags, so their unused share flows to the
+    productive ones. With nobody waiting, pages keep scrolling past quota.
+    A parked hashtag resumes below the oldest tweet it produced (live search
+    is newest-first) instead of re-scrolling from the top. Everything stops
+    once ``limit`` unique tweets are out.
+    """
+
+    def __init__(
+        self,
+        hashtags: List[str],
+        limit: int,
+        workers: int,
+        open_stream: StreamFactory,
+    ):
+        self.limit = limit
+        self.workers = max(1, min(workers, len(hashtags)))
+        self.open_stream = open_stream
+        self.pending: Deque[str] = deque(hashtags)
+        self.parked: Deque[str] = deque()
+        self.got: Dict[str, int] = dict.fromkeys(hashtags, 0)
+        self.exhausted: Set[str] = set()
+        self.cursor: Dict[str, Optional[datetime]] = dict.fromkeys(hashtags)
+        self.seen: Set[str] = set()
+        self.emitted = 0
+
+    def quota(self) -> float:
+        live = len(self.got) - len(self.exhausted)
+        spent = sum(self.got[h] for h in self.exhausted)
+        return (self.limit - spent) / max(1, live)
+
+    def _next(self):
+        if self.emitted >= self.limit:
+            return None
+        if self.pending:
+            return self.pending.popleft()
+        if self.parked:
+            return self.parked.popleft()
+        return None
+
+    def _fresh(self, hashtag: str, items: List[Tweet]) -> List[Tweet]:
+        fresh = []
+        oldest = min(t.timestamp for t in items) if items else None
+        if oldest is not None:
+            cursor = self.cursor[hashtag]
+            self.cursor[hashtag] = oldest if cursor is None else min(cursor, oldest)
+        for t in items:
+            if t.id not in self.seen:
+                self.seen.add(t.id)
+                fresh.append(t)
+        fresh = fresh[: self.limit - self.emitted]
+        self.got[hashtag] += len(fresh)
+        self.emitted += len(fresh)
+        return fresh
+
+    async def _scroll(self, hashtag: str, out: asyncio.Queue) -> bool:
+        """Run one hashtag on a page; False if it was preempted or cut off."""
+        stream = self.open_stream(hashtag, self.cursor[hashtag])
+        try:
+            async for items in stream:
+                fresh = self._fresh(hashtag, items)
+                if fresh:
+                    await out.put(fresh)
+                if self.emitted >= self.limit:
+                    return False
+                if self.pending and self.got[hashtag] >= self.quota():
+                    return False
+        except Exception as e:
+            logger.warning(f"Scrape of {hashtag} failed: {e}")
+        finally:
+            await stream.aclose()
+        return True
+
+    async def _worker(self, out: asyncio.Queue):
+        while (hashtag := self._next()) is not None:
+            if await self._scroll(hashtag, out):
+                self.exhausted.add(hashtag)
+            elif self.emitted < self.limit:
+                self.parked.append(hashtag)
+        await out.put(None)
+
+    async def run(self) -> AsyncIterator[List[Tweet]]:
+        """Yield batches of unique tweets as the pages produce them."""
+        # Small queue: a slow consumer pauses the pages (backpressure)
+        out: asyncio.Queue = asyncio.Queue(maxsize=self.workers)
+        tasks = [asyncio.create_task(self._worker(out)) for _ in range(self.workers)]
+        try:
+            running = len(tasks)
+            while running:
+                batch = await out.get()
+                if batch is None:
+                    running -= 1
+                else:
+                    yield batch
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
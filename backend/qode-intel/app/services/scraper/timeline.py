@@ -0,0 +1,150 @@
+import asyncio
+import re
+from datetime import datetime
+from typing import Iterator, List, Optional
+from app.models.tweet import Tweet
+from app.services.scraper.rate_limiter import THROTTLE_STATUSES, retry_after_seconds
+from app.utils.text import extract_entities
+from app.utils.logging import logger
+
+# GraphQL endpoints that carry timeline entries (SearchTimeline, HomeTimeline...)
+TIMELINE_URL_RE = re.compile(r"/i/api/graphql/[^/]+/\w*Timeline")
+CREATED_AT_FORMAT = "%a %b %d %H:%M:%S %z %Y"
+
+
+def is_timeline_url(url: str) -> bool:
+    return bool(TIMELINE_URL_RE.search(url))
+
+
+def _tweet_results(node) -> Iterator[dict]:
+    # Entries nest differently per timeline/module type; walk them all
+    stack = [node]
+    while stack:
+        cur = stack.pop()
+        if isinstance(cur, dict):
+            result = cur.get("tweet_results", {}).get("result")
+            if isinstance(result, dict):
+                yield result
+                continue
+            stack.extend(cur.values())
+        elif isinstance(cur, list):
+            stack.extend(reversed(cur))
+
+
+def _screen_name(result: dict) -> str:
+    user = result.get("core", {}).get("user_results", {}).get("result", {})
+    return (
+        user.get("legacy", {}).get("screen_name")
+        or user.get("core", {}).get("screen_name")
+        or ""
+    )
+
+
+def parse_tweet_result(result: dict, hashtag: Optional[str] = None) -> Optional[Tweet]:
+    if result.get("__typename") == "TweetWithVisibilityResults":
+        result = result.get("tweet", {})
+    legacy = result.get("legacy")
+    if not legacy:
+        return None
+    note = (
+        result.get("note_tweet", {})
+        .get("note_tweet_results", {})
+        .get("result", {})
+        .get("text")
+    )
+    content = note or legacy.get("full_text", "")
+    tid = legacy.get("id_str") or result.get("rest_id")
+    if not tid or not content:
+        return None
+
+    entities = legacy.get("entities", {})
+    mentions, hashtags = extract_entities(content)
+    mentions = {
+        *mentions,
+        *(m["screen_name"].lower() for m in entities.get("user_mentions", [])),
+    }
+    hashtags = {*hashtags, *(h["text"].lower() for h in entities.get("hashtags", []))}
+    if hashtag:
+        hashtags.add(hashtag.strip("#").lower())
+
+    return Tweet(
+        id=tid,
+        username=_screen_name(result),
+        timestamp=datetime.strptime(legacy["created_at"], CREATED_AT_FORMAT),
+        content=content,
+        like_count=legacy.get("favorite_count", 0),
+        retweet_count=legacy.get("retweet_count", 0),
+        reply_count=legacy.get("reply_count", 0),
+        quote_count=legacy.get("quote_count", 0),
+        mentions=list(mentions),
+        hashtags=list(hashtags),
+        lang=legacy.get("lang"),
+    )
+
+
+def parse_timeline_payload(payload: dict, hashtag: Optional[str] = None) -> List[Tweet]:
+    """All tweets of one timeline JSON response, with real timestamps/counts."""
+    tweets = []
+    for result in _tweet_results(payload):
+        try:
+            tweet = parse_tweet_result(result, hashtag)
+        except (KeyError, ValueError, TypeError):
+            continue
+        if tweet is not None:
+            tweets.append(tweet)
+    return tweets
+
+
+class TimelineCapture:
+    """Collects tweets from a page's timeline XHR/fetch responses."""
+
+    def __init__(self, hashtag: Optional[str] = None):
+        self.hashtag = hashtag
+        self.payloads = 0
+        self.throttled = 0
+        self.retry_after: Optional[float] = None
+        self.oldest: Optional[datetime] = None
+        self._pending: List[asyncio.Future] = []
+        self._tweets: List[Tweet] = []
+        self._first = asyncio.Event()
+
+    def on_response(self, response):
+        if not is_timeline_url(response.url):
+            return
+        if response.status in THROTTLE_STATUSES:
+            self.throttled += 1
+            self.retry_after = retry_after_seconds(response.headers)
+        else:
+            self._pending.append(asyncio.ensure_future(self._read(response)))
+
+    async def _read(self, response):
+        try:
+            payload = await response.json()
+        except Exception as e:
+            logger.debug(f"Unreadable timeline response {response.url}: {e}")
+            return
+        self.feed(payload)
+
+    def feed(self, payload: dict) -> List[Tweet]:
+        tweets = parse_timeline_payload(payload, self.hashtag)
+        self.payloads += 1
+        self._tweets.extend(tweets)
+        for t in tweets:
+            if self.oldest is None or t.timestamp < self.oldest:
+                self.oldest = t.timestamp
+        self._first.set()
+        return tweets
+
+    async def wait_first(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self._first.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def drain(self) -> List[Tweet]:
+        pending, self._pending = self._pending, []
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        out, self._tweets = self._tweets, []
+        return out
@@ -0,0 +1,104 @@
+import asyncio
+import time
+import uuid
+from pathlib import Path
+from typing import List
+import polars as pl
+from app.config import (
+    COMPACT_INTERVAL_SECONDS,
+    COMPACT_MIN_PARTS,
+    COMPACT_RETIRE_GRACE_SECONDS,
+    COMPACT_TARGET_ROWS,
+)
+from app.services.storage.paths import PARQUET_PATH
+from app.services.storage.part_index import index_path, live_parts, retired_path
+from app.services.storage.schema import conform
+from app.services.storage.signal_store import rollup_lock
+from app.services.storage.tag_index import tags_path
+from app.services.storage.writer import part_file_name, write_part
+from app.utils.filelock import file_lock
+from app.utils.logging import logger
+
+
+def _num_rows(path: Path) -> int:
+    return pl.scan_parquet(path).select(pl.len()).collect().item()
+
+
+def _plan_groups(day_dir: Path, target_rows: int) -> List[List[Path]]:
+    # Greedily pack small parts (oldest first) into groups of ~target_rows
+    groups, current, rows = [], [], 0
+    for path in sorted(live_parts(day_dir), key=lambda p: p.stat().st_mtime):
+        n = _num_rows(path)
+        if n >= target_rows:
+            continue
+        if current and rows + n > target_rows:
+            groups.append(current)
+            current, rows = [], 0
+        current.append(path)
+        rows += n
+    groups.append(current)
+    return [g for g in groups if len(g) > 1]
+
+
+def _purge_retired(day_dir: Path, grace: float) -> int:
+    # Parts retired longer than ``grace`` ago: no scan still listing them
+    purged = 0
+    for marker in day_dir.glob("*.retired"):
+        if time.time() - marker.stat().st_mtime < grace:
+            continue
+        part = marker.with_suffix(".parquet")
+        part.unlink(missing_ok=True)
+        index_path(part).unlink(missing_ok=True)
+        tags_path(part).unlink(missing_ok=True)
+        marker.unlink(missing_ok=True)
+        purged += 1
+    return purged
+
+
+def compact_partition(
+    day_dir: Path,
+    min_parts: int = COMPACT_MIN_PARTS,
+    target_rows: int = COMPACT_TARGET_ROWS,
+    grace: float = COMPACT_RETIRE_GRACE_SECONDS,
+) -> int:
+    """
+    Merge small part files of one day partition into larger files with tuned
+    row groups. The sources are retired rather than deleted: listings skip
+    them from then on, but scans and exports that listed them earlier can
+    still read them until they are purged ``grace`` seconds later. A
+    concurrent reader may briefly see rows twice, between the merged part
+    appearing and its sources being retired, but never misses any. A
+    per-day file lock keeps workers in other processes from compacting
+    the same parts.
+    Returns the number of part files retired.
+    """
+    with file_lock(day_dir / "_compact.lock"):
+        _purge_retired(day_dir, grace)
+        groups = _plan_groups(day_dir, target_rows)
+        if sum(len(g) for g in groups) < min_parts:
+            return 0
+        retired = 0
+        for group in groups:
+            df = pl.concat([conform(pl.read_parquet(p)) for p in group])
+            # A signal rollup rebuild must see the merged part or its
+            # sources, never both
+            with rollup_lock():
+                write_part(df, day_dir / part_file_name(f"compact-{uuid.uuid4().hex}"))
+                for p in group:
+                    retired_path(p).touch()
+            retired += len(group)
+    logger.info(f"Compacted {retired} parts in {day_dir.name}")
+    return retired
+
+
+def compact_partitions() -> int:
+    return sum(compact_partition(d) for d in sorted(PARQUET_PATH.glob("date=*")))
+
+
+async def compaction_loop(interval: int = COMPACT_INTERVAL_SECONDS):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(compact_partitions)
+        except Exception:
+            logger.exception("parquet compaction failed")
@@ -0,0 +1,23 @@
+import os
+import uuid
+from app.services.storage.paths import DATA_PATH
+
+# Opaque token that changes whenever stored tweets or derived stats change;
+# response caches key on it
+VERSION_FILE = DATA_PATH / "data_version"
+
+
+def data_version() -> str:
+    try:
+        return VERSION_FILE.read_text().strip()
+    except FileNotFoundError:
+        return "0"
+
+
+def bump_data_version() -> str:
+    # A fresh token, not a counter: concurrent writers never need to agree
+    version = uuid.uuid4().hex
+    tmp = VERSION_FILE.with_name(f".{VERSION_FILE.name}.{version}.tmp")
+    tmp.write_text(version)
+    os.replace(tmp, VERSION_FILE)
+    return version
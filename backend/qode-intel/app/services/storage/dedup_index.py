@@ -0,0 +1,243 @@
+import os
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+import numpy as np
+import polars as pl
+from app.config import DEDUP_HORIZON_HOURS, DEDUP_MIN_TOKENS, DEDUP_SIMHASH_DISTANCE
+from app.services.processing.dedupe import id_hashes, simhash_signatures
+from app.services.storage.loader import scan_window
+from app.services.storage.paths import PROCESSED_PATH
+from app.utils.filelock import file_lock
+from app.utils.logging import logger
+
+# Cross-job dedup state: hashed tweet ids and SimHash signatures of everything
+# written within the horizon
+INDEX_FILE = PROCESSED_PATH / "dedup_index.npz"
+BANDS = 4  # 4 x 16-bit bands: signatures within 3 bits share at least one
+QUERY_CHUNK = 4096
+
+
+def _epoch_us(ts: pl.Series) -> np.ndarray:
+    return ts.dt.epoch("us").fill_null(0).to_numpy().astype(np.int64)
+
+
+class _Bands:
+    """Per-band sorted views of a signature array for candidate lookup."""
+
+    def __init__(self, sigs: np.ndarray):
+        self.sigs = sigs
+        self.keys, self.order = [], []
+        for b in range(BANDS):
+            key = ((sigs >> np.uint64(16 * b)) & np.uint64(0xFFFF)).astype(np.uint16)
+            order = np.argsort(key, kind="stable")  # radix sort for 16-bit keys
+            self.keys.append(key[order])
+            self.order.append(order)
+
+    def hits(
+        self, query: np.ndarray, max_distance: int, earlier_only: bool = False
+    ) -> np.ndarray:
+        """
+        Mask of ``query`` signatures within ``max_distance`` bits of a stored
+        one. With ``earlier_only`` the query is this same array and only
+        matches against lower positions count.
+        """
+        found = np.zeros(len(query), dtype=bool)
+        for start in range(0, len(query), QUERY_CHUNK):
+            q = query[start : start + QUERY_CHUNK]
+            pos = np.arange(start, start + len(q))
+            for b in range(BANDS):
+                key = ((q >> np.uint64(16 * b)) & np.uint64(0xFFFF)).astype(np.uint16)
+                lo = np.searchsorted(self.keys[b], key, "left")
+                hi = np.searchsorted(self.keys[b], key, "right")
+                counts = hi - lo
+                if not counts.any():
+                    continue
+                # Expand every query into its candidate range
+                qi = np.repeat(np.arange(len(q)), counts)
+                offs = np.arange(counts.sum()) - np.repeat(
+                    np.cumsum(counts) - counts, counts
+                )
+                cand = self.order[b][np.repeat(lo, counts) + offs]
+                near = np.bitwise_count(self.sigs[cand] ^ q[qi]) <= max_distance
+                if earlier_only:
+                    near &= cand < pos[qi]
+                found[start + qi[near]] = True
+        return found
+
+
+class DedupIndex:
+    """
+    Persistent exact-id and near-duplicate (SimHash) index over the tweets
+    written in the last ``horizon``. Entries older than that are evicted
+    whenever the index is updated, which bounds its size. Updates hold a
+    file lock and first reload what other processes saved, so every uvicorn
+    or job worker can share one index file.
+    """
+
+    def __init__(
+        self,
+        path: Path = INDEX_FILE,
+        horizon: timedelta = timedelta(hours=DEDUP_HORIZON_HOURS),
+        max_distance: int = DEDUP_SIMHASH_DISTANCE,
+        min_tokens: int = DEDUP_MIN_TOKENS,
+    ):
+        self.path = Path(path)
+        self.horizon = horizon
+        self.max_distance = max_distance
+        self.min_tokens = min_tokens
+        self.lock_path = self.path.with_suffix(".lock")
+        self._lock = threading.RLock()
+        self.ids = np.empty(0, dtype=np.uint64)  # sorted
+        self.id_ts = np.empty(0, dtype=np.int64)
+        self.sigs = np.empty(0, dtype=np.uint64)
+        self.sig_ts = np.empty(0, dtype=np.int64)
+        self._bands: Optional[_Bands] = None
+        self._mtime: Optional[int] = None
+        self._refresh()
+
+    def _refresh(self):
+        """Reload the file if another process (or index) has saved it since."""
+        try:
+            mtime = self.path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime != self._mtime:
+            with np.load(self.path) as z:
+                self.ids, self.id_ts = z["ids"], z["id_ts"]
+                self.sigs, self.sig_ts = z["sigs"], z["sig_ts"]
+            self._bands = None
+            self._mtime = mtime
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def bands(self) -> _Bands:
+        if self._bands is None:
+            self._bands = _Bands(self.sigs)
+        return self._bands
+
+    def _known_ids(self, hashed: np.ndarray) -> np.ndarray:
+        if not len(self.ids):
+            return np.zeros(len(hashed), dtype=bool)
+        pos = np.searchsorted(self.ids, hashed)
+        pos[pos == len(self.ids)] = 0
+        return self.ids[pos] == hashed
+
+    def duplicates(self, df: pl.DataFrame) -> np.ndarray:
+        """
+        Mask of rows already in the index (same id, or content within
+        ``max_distance`` bits), or duplicating an earlier row of ``df``.
+        """
+        if df.is_empty():
+            return np.zeros(0, dtype=bool)
+        hashed = id_hashes(df.get_column("id"))
+        sigs, valid = simhash_signatures(df.get_column("content"), self.min_tokens)
+        with self._lock:
+            dup = self._known_ids(hashed)
+            dup[valid] |= self.bands.hits(sigs[valid], self.max_distance)
+        dup |= ~pl.Series(hashed).is_first_distinct().to_numpy()
+        dup[valid] |= _Bands(sigs[valid]).hits(
+            sigs[valid], self.max_distance, earlier_only=True
+        )
+        return dup
+
+    def filter_new(self, df: pl.DataFrame) -> pl.DataFrame:
+        if df.is_empty():
+            return df
+        return df.filter(pl.Series(~self.duplicates(df)))
+
+    def filter_and_add(
+        self, df: pl.DataFrame, now: Optional[datetime] = None
+    ) -> pl.DataFrame:
+        """
+        ``filter_new`` and ``add`` as one locked step, so concurrent jobs
+        (in this process or another) can't both let the same tweet through.
+        """
+        with self._lock, file_lock(self.lock_path):
+            self._refresh()
+            fresh = self.filter_new(df)
+            if not fresh.is_empty():
+                self._add(fresh, now)
+        return fresh
+
+    def add(self, df: pl.DataFrame, now: Optional[datetime] = None):
+        """Record a written batch, evict expired entries and persist."""
+        with self._lock, file_lock(self.lock_path):
+            self._refresh()
+            self._add(df, now)
+
+    def forget(self, df: pl.DataFrame):
+        """Undo ``filter_and_add`` of a batch that could not be written."""
+        if df.is_empty():
+            return
+        hashed = id_hashes(df.get_column("id"))
+        sigs, valid = simhash_signatures(df.get_column("content"), self.min_tokens)
+        with self._lock, file_lock(self.lock_path):
+            self._refresh()
+            keep = ~np.isin(self.ids, hashed)
+            self.ids, self.id_ts = self.ids[keep], self.id_ts[keep]
+            keep = ~np.isin(self.sigs, sigs[valid])
+            self.sigs, self.sig_ts = self.sigs[keep], self.sig_ts[keep]
+            self._bands = None
+            self._save()
+
+    def _add(self, df: pl.DataFrame, now: Optional[datetime]):
+        now = now or datetime.now(timezone.utc)
+        cutoff = int((now - self.horizon).timestamp() * 1_000_000)
+        hashed = id_hashes(df.get_column("id"))
+        sigs, valid = simhash_signatures(df.get_column("content"), self.min_tokens)
+        ts = _epoch_us(df.get_column("timestamp"))
+        keep = self.id_ts >= cutoff
+        ids, id_ts = self.ids[keep], self.id_ts[keep]
+        new = ts >= cutoff
+        order = np.argsort(hashed[new])
+        pos = np.searchsorted(ids, hashed[new][order])
+        self.ids = np.insert(ids, pos, hashed[new][order])
+        self.id_ts = np.insert(id_ts, pos, ts[new][order])
+        sigs = np.concatenate([self.sigs, sigs[valid]])
+        sig_ts = np.concatenate([self.sig_ts, ts[valid]])
+        keep = sig_ts >= cutoff
+        self.sigs, self.sig_ts = sigs[keep], sig_ts[keep]
+        self._bands = None
+        self._save()
+
+    def _save(self):
+        tmp = self.path.with_name(f".{self.path.name}.{uuid.uuid4().hex}.tmp.npz")
+        np.savez(
+            tmp, ids=self.ids, id_ts=self.id_ts, sigs=self.sigs, sig_ts=self.sig_ts
+        )
+        os.replace(tmp, self.path)
+        self._mtime = self.path.stat().st_mtime_ns
+        logger.debug(f"Dedup index saved: {len(self.ids)} ids, {len(self.sigs)} sigs")
+
+
+_index: Optional[DedupIndex] = None
+_index_lock = threading.Lock()
+
+
+def rebuild_dedup_index(path: Path = INDEX_FILE) -> DedupIndex:
+    """Seed the index from the partitions within the horizon (bootstrap)."""
+    index = DedupIndex(path)
+    until = datetime.now(timezone.utc)
+    df = scan_window(
+        until - index.horizon, until, columns=["id", "content", "timestamp"]
+    ).collect(streaming=True)
+    logger.info(f"Rebuilding dedup index from {df.height} stored tweets")
+    index.add(df, now=until)
+    return index
+
+
+def get_dedup_index() -> DedupIndex:
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = (
+                DedupIndex(INDEX_FILE)
+                if INDEX_FILE.exists()
+                else rebuild_dedup_index(INDEX_FILE)
+            )
+        return _index
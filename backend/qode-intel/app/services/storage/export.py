@@ -0,0 +1,143 @@
+import io
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+import numpy as np
+import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
+from app.config import EXPORT_BATCH_ROWS
+from app.services.storage.loader import partition_files
+from app.services.storage.part_index import overlapping_row_groups, read_part_index
+from app.services.storage.schema import TWEET_ARROW_SCHEMA, TWEET_SCHEMA, conform
+from app.services.storage.tag_index import TAG_FIELDS, normalize_tag, part_rows
+
+# format -> (media type, file extension)
+EXPORT_FORMATS = {
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+}
+
+
+def export_schema(columns: Optional[Sequence[str]] = None) -> pa.Schema:
+    return pa.schema(
+        [TWEET_ARROW_SCHEMA.field(c) for c in (columns or TWEET_SCHEMA.names())]
+    )
+
+
+def _row_groups(part, since_us: int, until_us: int) -> Optional[List[int]]:
+    index = read_part_index(part)
+    if index is None:
+        return None
+    live = {g["offset"] for g in overlapping_row_groups(index, since_us, until_us)}
+    return [i for i, g in enumerate(index["row_groups"]) if g["offset"] in live]
+
+
+def _tagged_batches(
+    reader: pq.ParquetFile,
+    rows: np.ndarray,
+    groups: Optional[List[int]],
+    columns: List[str],
+    batch_rows: int,
+) -> Iterator[pa.RecordBatch]:
+    """
+    Just ``rows`` (sorted part row numbers, from the tag index) of the part,
+    reading only the row groups among ``groups`` that hold any of them.
+    """
+    meta = reader.metadata
+    sizes = [meta.row_group(i).num_rows for i in range(meta.num_row_groups)]
+    starts = np.concatenate([[0], np.cumsum(sizes, dtype=np.int64)])
+    hit = np.unique(np.searchsorted(starts, rows, side="right") - 1)
+    if groups is not None:
+        hit = np.intersect1d(hit, groups)
+    for g in hit.tolist():
+        pos = starts[g]
+        for batch in reader.iter_batches(
+            batch_size=batch_rows, row_groups=[g], columns=columns
+        ):
+            lo, hi = np.searchsorted(rows, [pos, pos + batch.num_rows])
+            if hi > lo:
+                yield batch.take(pa.array(rows[lo:hi] - pos))
+            pos += batch.num_rows
+
+
+def window_batches(
+    since_utc: datetime,
+    until_utc: datetime,
+    columns: Optional[Sequence[str]] = None,
+    filters: Optional[Dict[str, str]] = None,
+    batch_rows: int = EXPORT_BATCH_ROWS,
+) -> Iterator[pa.RecordBatch]:
+    """
+    Tweets in [since_utc, until_utc] matching ``filters``, as Arrow record
+    batches of ``export_schema(columns)``. Parts are read one row group
+    slice of at most ``batch_rows`` rows at a time, so memory stays bounded
+    whatever the size of the window. With ``filters``, parts with a tag
+    index only read the row groups and rows its postings point at; older
+    parts fall back to checking their tag columns.
+    """
+    columns = list(columns or TWEET_SCHEMA.names())
+    filters = filters or {}
+    window_cols = list(dict.fromkeys([*columns, "timestamp"]))
+    scan_cols = list(dict.fromkeys([*window_cols, *(TAG_FIELDS[f] for f in filters)]))
+    in_window = pl.col("timestamp").is_between(pl.lit(since_utc), pl.lit(until_utc))
+    tagged = in_window
+    for field, value in filters.items():
+        tagged &= pl.col(TAG_FIELDS[field]).list.contains(normalize_tag(value))
+    since_us = int(since_utc.timestamp() * 1_000_000)
+    until_us = int(until_utc.timestamp() * 1_000_000)
+    for part in partition_files(since_utc, until_utc):
+        groups = _row_groups(part, since_us, until_us)
+        if groups == []:
+            continue
+        rows = part_rows(part, filters) if filters else None
+        if rows is not None and not rows.size:
+            continue
+        reader = pq.ParquetFile(part)
+        read_cols, keep = (
+            (scan_cols, tagged) if rows is None else (window_cols, in_window)
+        )
+        present = [c for c in read_cols if c in reader.schema_arrow.names]
+        if rows is None:
+            batches = reader.iter_batches(
+                batch_size=batch_rows, row_groups=groups, columns=present
+            )
+        else:
+            batches = _tagged_batches(
+                reader, rows.astype(np.int64), groups, present, batch_rows
+            )
+        for batch in batches:
+            # Older parts are upgraded batch by batch
+            df = conform(pl.from_arrow(batch), read_cols).filter(keep)
+            if df.height:
+                yield from conform(df, columns).to_arrow().to_batches()
+
+
+def _drain(buf: io.BytesIO) -> bytes:
+    data = buf.getvalue()
+    buf.seek(0)
+    buf.truncate()
+    return data
+
+
+def encode_batches(
+    batches: Iterable[pa.RecordBatch], schema: pa.Schema, fmt: str
+) -> Iterator[bytes]:
+    """
+    ``batches`` encoded as ``fmt``, one chunk per batch: an Arrow IPC stream,
+    a Parquet file with one row group per batch, or newline-delimited JSON.
+    """
+    if fmt == "ndjson":
+        for batch in batches:
+            yield pl.from_arrow(batch).write_ndjson().encode()
+        return
+    buf = io.BytesIO()
+    if fmt == "arrow":
+        writer = pa.ipc.new_stream(buf, schema)
+    else:
+        writer = pq.ParquetWriter(buf, schema, compression="zstd")
+    with writer:
+        for batch in batches:
+            writer.write_batch(batch)
+            yield _drain(buf)
+    yield _drain(buf)  # footer / end-of-stream marker
@@ -1,22 +1,116 @@
 import polars as pl
-from datetime import datetime
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
 from app.services.storage.paths import PARQUET_PATH
+from app.services.storage.part_index import (
+    live_parts,
+    overlapping_row_groups,
+    read_part_index,
+)
+from app.services.storage.schema import (
+    SCHEMA_VERSION,
+    TWEET_SCHEMA,
+    conform,
+    schema_version,
+)
 
 
-def load_last_24h(since_utc: datetime, until_utc: datetime) -> pl.DataFrame:
-    # Load only likely partitions
-    dates = set([since_utc.date().isoformat(), until_utc.date().isoformat()])
-    dfs = []
-    for d in dates:
-        path = PARQUET_PATH / f"date={d}" / "tweets.parquet"
-        if path.exists():
-            dfs.append(pl.read_parquet(path))
-    if not dfs:
-        return pl.DataFrame([])
-    df = pl.concat(dfs, how="vertical_relaxed")
-    # Filter exact window
-    df = df.filter(
-        (pl.col("timestamp") >= pl.lit(since_utc))
-        & (pl.col("timestamp") <= pl.lit(until_utc))
+def window_days(since_utc: datetime, until_utc: datetime) -> List[str]:
+    day, last = since_utc.date(), until_utc.date()
+    days = []
+    while day <= last:
+        days.append(day.isoformat())
+        day += timedelta(days=1)
+    return days
+
+
+def _epoch_us(ts: datetime) -> int:
+    return int(ts.timestamp() * 1_000_000)
+
+
+def _window_parts(
+    since_utc: datetime, until_utc: datetime
+) -> List[Tuple[Path, Optional[dict]]]:
+    since_us, until_us = _epoch_us(since_utc), _epoch_us(until_utc)
+    parts = []
+    for d in window_days(since_utc, until_utc):
+        for path in live_parts(PARQUET_PATH / f"date={d}"):
+            index = read_part_index(path)
+            if index is None or overlapping_row_groups(index, since_us, until_us):
+                parts.append((path, index))
+    return parts
+
+
+def partition_files(since_utc: datetime, until_utc: datetime) -> List[Path]:
+    """
+    Committed part files of the window's days (legacy tweets.parquet too),
+    minus the parts whose sidecar index shows no rows in the window.
+    Row groups inside the kept parts are pruned by the scan's statistics.
+    """
+    return [path for path, _ in _window_parts(since_utc, until_utc)]
+
+
+def _schema_version(path: Path, index: Optional[dict]) -> int:
+    # Recorded in the sidecar; parts indexed before that have their footer read
+    if index is not None and "schema_version" in index:
+        return index["schema_version"]
+    return schema_version(path)
+
+
+def planned_read_bytes(
+    since_utc: datetime,
+    until_utc: datetime,
+    columns: Optional[Sequence[str]] = None,
+) -> int:
+    """Compressed bytes of the row groups and columns a window scan touches."""
+    since_us, until_us = _epoch_us(since_utc), _epoch_us(until_utc)
+    total = 0
+    for path in partition_files(since_utc, until_utc):
+        index = read_part_index(path)
+        if index is None:
+            total += path.stat().st_size
+            continue
+        for g in overlapping_row_groups(index, since_us, until_us):
+            total += sum(
+                size
+                for col, size in g["bytes"].items()
+                if columns is None or col in columns
+            )
+    return total
+
+
+def scan_window(
+    since_utc: datetime,
+    until_utc: datetime,
+    columns: Optional[Sequence[str]] = None,
+) -> pl.LazyFrame:
+    """
+    Lazy scan of the tweets in [since_utc, until_utc]. Only the window's day
+    partitions are listed, and the timestamp filter and column selection are
+    pushed down into the Parquet reader, so callers can compose further
+    expressions before a single ``collect(streaming=True)``.
+    """
+    columns = list(columns or TWEET_SCHEMA.names())
+    parts = _window_parts(since_utc, until_utc)
+    if not parts:
+        return pl.LazyFrame(schema={c: TWEET_SCHEMA[c] for c in columns})
+
+    window = (pl.col("timestamp") >= pl.lit(since_utc)) & (
+        pl.col("timestamp") <= pl.lit(until_utc)
     )
-    return df
+    # Current parts share TWEET_SCHEMA exactly and scan as one; parts of
+    # other schema versions are upgraded one by one
+    current, other = [], []
+    for path, index in parts:
+        if _schema_version(path, index) == SCHEMA_VERSION:
+            current.append(path)
+        else:
+            other.append(path)
+    scans = [pl.scan_parquet(current, hive_partitioning=False)] if current else []
+    scans += [pl.scan_parquet(f, hive_partitioning=False) for f in other]
+    return pl.concat([conform(lf.filter(window), columns) for lf in scans])
+
+
+def load_last_24h(since_utc: datetime, until_utc: datetime) -> pl.DataFrame:
+    return scan_window(since_utc, until_utc).collect(streaming=True)
@@ -0,0 +1,91 @@
+import json
+import os
+from pathlib import Path
+from typing import List, Optional
+import polars as pl
+import pyarrow.parquet as pq
+from app.services.storage.schema import footer_schema_version
+
+# Sidecar next to every part file: the part's schema version, and row group
+# -> time range, size, hashtag set
+INDEX_VERSION = 1
+
+
+def index_path(part: Path) -> Path:
+    return part.with_suffix(".index.json")
+
+
+def retired_path(part: Path) -> Path:
+    """Marker of a part compacted away, kept until readers are done with it."""
+    return part.with_suffix(".retired")
+
+
+def live_parts(day_dir: Path) -> List[Path]:
+    """Part files of a day partition, minus the retired ones."""
+    return sorted(p for p in day_dir.glob("*.parquet") if not retired_path(p).exists())
+
+
+def _epoch_us(value) -> Optional[int]:
+    return None if value is None else int(value.timestamp() * 1_000_000)
+
+
+def build_part_index(df: pl.DataFrame, parquet_file: Path) -> dict:
+    """Index of a part file, built from the frame it was written from."""
+    meta = pq.read_metadata(parquet_file)
+    groups, offset = [], 0
+    for i in range(meta.num_row_groups):
+        rg = meta.row_group(i)
+        sub = df.slice(offset, rg.num_rows)
+        tags = []
+        if "hashtags" in sub.columns:
+            tags = sub.get_column("hashtags").explode().drop_nulls().unique()
+        sizes: dict = {}
+        for j in range(rg.num_columns):
+            col = rg.column(j)
+            name = col.path_in_schema.split(".")[0]
+            sizes[name] = sizes.get(name, 0) + col.total_compressed_size
+        groups.append(
+            {
+                "offset": offset,
+                "rows": rg.num_rows,
+                "ts_min": _epoch_us(sub.get_column("timestamp").min()),
+                "ts_max": _epoch_us(sub.get_column("timestamp").max()),
+                "bytes": sizes,
+                "hashtags": sorted(tags),
+            }
+        )
+        offset += rg.num_rows
+    return {
+        "version": INDEX_VERSION,
+        "rows": meta.num_rows,
+        "schema_version": footer_schema_version(meta.metadata),
+        "ts_min": min((g["ts_min"] for g in groups if g["ts_min"]), default=None),
+        "ts_max": max((g["ts_max"] for g in groups if g["ts_max"]), default=None),
+        "row_groups": groups,
+    }
+
+
+def write_part_index(index: dict, part: Path) -> Path:
+    path = index_path(part)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(json.dumps(index), encoding="utf-8")
+    os.replace(tmp, path)
+    return path
+
+
+def read_part_index(part: Path) -> Optional[dict]:
+    try:
+        index = json.loads(index_path(part).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return index if index.get("version") == INDEX_VERSION else None
+
+
+def overlapping_row_groups(index: dict, since_us: int, until_us: int) -> list:
+    return [
+        g
+        for g in index["row_groups"]
+        if g["ts_min"] is not None
+        and g["ts_min"] <= until_us
+        and g["ts_max"] >= since_us
+    ]
@@ -1,4 +1,8 @@
+from pathlib import Path
+from typing import Optional, Sequence, TypeVar
 import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 TWEET_SCHEMA = pl.Schema(
     {
@@ -15,3 +19,53 @@ TWEET_SCHEMA = pl.Schema(
         "lang": pl.Utf8,
     }
 )
+TWEET_ARROW_SCHEMA = pl.DataFrame(schema=TWEET_SCHEMA).to_arrow().schema
+
+# Bump when TWEET_SCHEMA changes. Every part records the version it was
+# written with; parts without one (v1) come from writers that inferred dtypes.
+SCHEMA_VERSION = 2
+SCHEMA_VERSION_KEY = b"qode.schema_version"
+# Low-cardinality columns, dictionary-encoded in the Parquet pages. They read
+# back as plain strings, so frames never mix Categorical sources.
+DICTIONARY_COLUMNS = ["username", "lang", "hashtags.list.element"]
+
+Frame = TypeVar("Frame", pl.DataFrame, pl.LazyFrame)
+
+
+def conform(frame: Frame, columns: Optional[Sequence[str]] = None) -> Frame:
+    """
+    ``frame`` as TWEET_SCHEMA (or its ``columns``), in schema order: columns
+    cast to their schema dtype, missing ones added as typed nulls, others
+    dropped.
+    """
+    present = frame.collect_schema()
+    return frame.select(
+        [
+            (
+                pl.col(c)
+                if present[c] == TWEET_SCHEMA[c]
+                else pl.col(c).cast(TWEET_SCHEMA[c])
+            )
+            if c in present
+            else pl.lit(None, dtype=TWEET_SCHEMA[c]).alias(c)
+            for c in (columns or TWEET_SCHEMA.names())
+        ]
+    )
+
+
+def tweet_table(df: pl.DataFrame) -> pa.Table:
+    """``df`` conformed to TWEET_SCHEMA as Arrow, tagged with SCHEMA_VERSION."""
+    return (
+        conform(df)
+        .to_arrow()
+        .replace_schema_metadata({SCHEMA_VERSION_KEY: str(SCHEMA_VERSION)})
+    )
+
+
+def footer_schema_version(metadata: Optional[dict]) -> int:
+    """SCHEMA_VERSION recorded in a file's key-value metadata (1 if none)."""
+    return int((metadata or {}).get(SCHEMA_VERSION_KEY, 1))
+
+
+def schema_version(path: Path) -> int:
+    return footer_schema_version(pq.read_schema(path).metadata)
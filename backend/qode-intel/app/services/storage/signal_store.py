@@ -0,0 +1,183 @@
+import re
+import threading
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+import polars as pl
+from app.config import SIGNAL_ROLLUP_LEVELS
+from app.services.processing.signals import (
+    SIGNAL_BUCKET,
+    SIGNAL_COLUMNS,
+    bucket_stats,
+    finalize_stats,
+)
+from app.services.storage.data_version import bump_data_version
+from app.services.storage.part_index import live_parts
+from app.services.storage.paths import PARQUET_PATH, PROCESSED_PATH
+from app.services.storage.writer import write_parquet_atomic
+from app.utils.filelock import file_lock
+from app.utils.logging import logger
+
+# Rollup pyramid of per-bucket sufficient statistics of the composite signal:
+# one file per level, finest first, kept next to the Parquet partitions. The
+# stats are additive, so every level is updated by merging a batch's rollup.
+STAT_COLUMNS = ["wsum", "w", "n", "lex_sum", "lex_sumsq"]
+UNIT_SECONDS = {"m": 60, "h": 3600, "d": 86400}
+# The single 15m store the pyramid replaced; removed once the pyramid is built
+LEGACY_STORE_FILE = PROCESSED_PATH / "signal_15m.parquet"
+
+
+def bucket_seconds(bucket: str) -> int:
+    m = re.fullmatch(r"(\d+)([mhd])", bucket)
+    if m is None or int(m.group(1)) == 0:
+        raise ValueError(f"unsupported bucket size {bucket!r}")
+    return int(m.group(1)) * UNIT_SECONDS[m.group(2)]
+
+
+LEVELS = sorted(SIGNAL_ROLLUP_LEVELS, key=bucket_seconds)
+
+
+def rollup_file(level: str) -> Path:
+    return PARQUET_PATH / "_rollups" / f"signal_{level}.parquet"
+
+
+_held = threading.local()
+
+
+def _lock_file() -> Path:
+    return PARQUET_PATH / "_rollups.lock"
+
+
+@contextmanager
+def rollup_lock():
+    """
+    Serializes the read-merge-write of the levels across uvicorn and job
+    worker processes, not just threads. Reentrant within a thread, so a
+    writer can hold it from a part write through the update_signal_store
+    that folds the part in: a rebuild in between would count it twice.
+    """
+    depth = getattr(_held, "depth", 0)
+    with file_lock(_lock_file()) if depth == 0 else nullcontext():
+        _held.depth = depth + 1
+        try:
+            yield
+        finally:
+            _held.depth = depth
+
+
+def _pyramid_complete() -> bool:
+    return all(rollup_file(lv).exists() for lv in LEVELS)
+
+
+def source_level(bucket: str) -> Optional[str]:
+    """Coarsest stored level that ``bucket`` is a whole multiple of."""
+    secs = bucket_seconds(bucket)
+    fits = [lv for lv in LEVELS if secs % bucket_seconds(lv) == 0]
+    return fits[-1] if fits else None
+
+
+def merge_stats(*frames: pl.DataFrame) -> pl.DataFrame:
+    frames = [f for f in frames if not f.is_empty()]
+    if not frames:
+        return pl.DataFrame()
+    return (
+        pl.concat([f.select(["bucket", *STAT_COLUMNS]) for f in frames])
+        .group_by("bucket")
+        .agg([pl.col(c).sum() for c in STAT_COLUMNS])
+        .sort("bucket")
+    )
+
+
+def rollup(stats, every: str):
+    """Coarsen bucket stats (DataFrame or LazyFrame) to ``every``."""
+    return (
+        stats.with_columns(pl.col("bucket").dt.truncate(every))
+        .group_by("bucket")
+        .agg([pl.col(c).sum() for c in STAT_COLUMNS])
+        .sort("bucket")
+    )
+
+
+def _write_levels(base: pl.DataFrame, merge: bool):
+    for level in LEVELS:
+        path = rollup_file(level)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        batch = rollup(base, level)
+        if merge and path.exists():
+            batch = merge_stats(pl.read_parquet(path), batch)
+        write_parquet_atomic(batch, path, statistics=True)
+
+
+def update_signal_store(df: pl.DataFrame) -> int:
+    """
+    Fold a batch that has just been written to the partitions into every
+    level of the pyramid. Returns the number of base buckets touched.
+    """
+    if df.is_empty():
+        return 0
+    base = bucket_stats(df, LEVELS[0])
+    with rollup_lock():
+        if _pyramid_complete():
+            _write_levels(base, merge=True)
+        elif rebuild_signal_store().is_empty():
+            # First store ever and the partitions don't hold this batch
+            _write_levels(base, merge=False)
+    # Responses computed between the part commit and this merge are stale
+    bump_data_version()
+    return base.height
+
+
+def rebuild_signal_store() -> pl.DataFrame:
+    """Recompute the pyramid from every raw partition (bootstrap / repair)."""
+    files = [p for d in sorted(PARQUET_PATH.glob("date=*")) for p in live_parts(d)]
+    if not files:
+        return pl.DataFrame()
+    logger.info(f"Rebuilding signal rollups from {len(files)} partition files")
+    base = merge_stats(
+        *(
+            bucket_stats(pl.scan_parquet(f).select(SIGNAL_COLUMNS), LEVELS[0]).collect()
+            for f in files
+        )
+    )
+    _write_levels(base, merge=False)
+    LEGACY_STORE_FILE.unlink(missing_ok=True)
+    return base
+
+
+def load_signal_stats(
+    since_utc: datetime, until_utc: datetime, bucket: str = SIGNAL_BUCKET
+) -> pl.DataFrame:
+    """
+    Bucket stats at ``bucket`` overlapping [since_utc, until_utc], read from
+    the coarsest pyramid level that divides it (rolled up further if needed).
+    Raw tweets are only read to bootstrap a missing pyramid.
+    """
+    level = source_level(bucket)
+    if level is None:
+        raise ValueError(f"bucket {bucket!r} is finer than the rollup levels")
+    with rollup_lock():
+        if not _pyramid_complete() and rebuild_signal_store().is_empty():
+            return pl.DataFrame()
+    start = pl.lit(since_utc).dt.truncate(bucket)
+    stats = pl.scan_parquet(rollup_file(level)).filter(
+        (pl.col("bucket") >= start) & (pl.col("bucket") <= pl.lit(until_utc))
+    )
+    if level != bucket:
+        stats = rollup(stats, bucket)
+    return stats.collect()
+
+
+def signal_delta(df: pl.DataFrame, bucket: str = SIGNAL_BUCKET) -> pl.DataFrame:
+    """
+    Current composite signal of the ``bucket`` buckets a batch just folded in
+    by update_signal_store touched.
+    """
+    if df.is_empty():
+        return pl.DataFrame()
+    ts = df.get_column("timestamp")
+    stats = load_signal_stats(ts.min(), ts.max(), bucket)
+    if stats.is_empty():
+        return stats
+    touched = ts.dt.truncate(bucket).unique()
+    return finalize_stats(stats.filter(pl.col("bucket").is_in(touched)))
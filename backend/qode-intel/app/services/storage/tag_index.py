@@ -0,0 +1,156 @@
+import os
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+import polars as pl
+import pyarrow.parquet as pq
+from app.services.storage.loader import partition_files
+from app.services.storage.part_index import overlapping_row_groups, read_part_index
+from app.services.storage.schema import TWEET_SCHEMA, conform
+
+# Inverted index sidecar next to every part: for each of TAG_FIELDS, the
+# sorted distinct values (lowercase, no #/@) and, CSR-style, the sorted row
+# numbers of the part that carry each of them
+TAG_FIELDS = {"hashtag": "hashtags", "mention": "mentions"}
+
+
+def tags_path(part: Path) -> Path:
+    return part.with_suffix(".tags.npz")
+
+
+def normalize_tag(value: str) -> str:
+    return value.strip().lstrip("#@").lower()
+
+
+def tag_filters(
+    hashtag: Optional[str] = None, mention: Optional[str] = None
+) -> Dict[str, str]:
+    """Normalized field -> value filters of the given query parameters."""
+    given = {"hashtag": hashtag, "mention": mention}
+    return {field: normalize_tag(v) for field, v in given.items() if v}
+
+
+def _postings(values: pl.Series) -> Dict[str, np.ndarray]:
+    pairs = (
+        pl.DataFrame({"key": values, "row": pl.int_range(len(values), eager=True)})
+        .explode("key")
+        .drop_nulls()
+        .unique()
+        .sort(["key", "row"])
+    )
+    keys, counts = np.unique(pairs.get_column("key").to_numpy(), return_counts=True)
+    offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return {
+        "keys": keys.astype(str),
+        "offsets": offsets,
+        "rows": pairs.get_column("row").to_numpy().astype(np.uint32),
+    }
+
+
+def build_tag_index(df: pl.DataFrame) -> Dict[str, np.ndarray]:
+    """Postings of ``df`` in the row order it is written in."""
+    entry = {}
+    for field, col in TAG_FIELDS.items():
+        values = (
+            df.get_column(col)
+            if col in df.columns
+            else pl.Series([], dtype=pl.List(pl.String))
+        )
+        for k, v in _postings(values).items():
+            entry[f"{field}_{k}"] = v
+    return entry
+
+
+def write_tag_index(entry: Dict[str, np.ndarray], part: Path) -> Path:
+    path = tags_path(part)
+    tmp = path.with_name(f".{path.stem}.{uuid.uuid4().hex}.tmp.npz")
+    np.savez(tmp, **entry)
+    os.replace(tmp, path)
+    return path
+
+
+def matching_rows(part: Path, field: str, value: str) -> Optional[np.ndarray]:
+    """Sorted row numbers of ``part`` tagged ``value``; None without an index."""
+    path = tags_path(part)
+    if not path.exists():
+        return None
+    with np.load(path) as z:
+        keys = z[f"{field}_keys"]
+        i = np.searchsorted(keys, normalize_tag(value))
+        if i == len(keys) or keys[i] != normalize_tag(value):
+            return np.empty(0, dtype=np.uint32)
+        lo, hi = z[f"{field}_offsets"][i : i + 2]
+        return z[f"{field}_rows"][lo:hi]
+
+
+def part_rows(part: Path, filters: Dict[str, str]) -> Optional[np.ndarray]:
+    """Rows matching every field=value filter (intersection), or None."""
+    rows = None
+    for field, value in filters.items():
+        found = matching_rows(part, field, value)
+        if found is None:
+            return None
+        rows = found if rows is None else np.intersect1d(rows, found)
+    return rows
+
+
+def _read_rows(
+    part: Path, rows: np.ndarray, columns: List[str], since_us: int, until_us: int
+) -> pl.DataFrame:
+    index = read_part_index(part)
+    if index is None:
+        return pl.from_arrow(pq.read_table(part, columns=columns).take(rows))
+    # Only the in-window row groups holding matches are read, then the rows
+    # are taken out of them
+    starts = np.array([g["offset"] for g in index["row_groups"]])
+    group = np.searchsorted(starts, rows, side="right") - 1
+    live = [g["offset"] for g in overlapping_row_groups(index, since_us, until_us)]
+    keep = np.isin(starts[group], live)
+    rows, group = rows[keep], group[keep]
+    wanted = np.unique(group)
+    sizes = np.array([index["row_groups"][g]["rows"] for g in wanted], dtype=np.int64)
+    base = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    local = rows - starts[group] + base[np.searchsorted(wanted, group)]
+    table = pq.ParquetFile(part).read_row_groups(wanted.tolist(), columns=columns)
+    return pl.from_arrow(table.take(local))
+
+
+def scan_tagged(
+    since_utc: datetime,
+    until_utc: datetime,
+    filters: Dict[str, str],
+    columns: Optional[Sequence[str]] = None,
+) -> pl.DataFrame:
+    """
+    Tweets in [since_utc, until_utc] matching ``filters`` (e.g.
+    {"hashtag": "banknifty"}). Parts with an inverted index only read the
+    rows it points at; older parts fall back to a filtered scan.
+    """
+    columns = list(columns or TWEET_SCHEMA.names())
+    read_cols = list(dict.fromkeys([*columns, "timestamp"]))
+    since_us = int(since_utc.timestamp() * 1_000_000)
+    until_us = int(until_utc.timestamp() * 1_000_000)
+    frames = []
+    for part in partition_files(since_utc, until_utc):
+        rows = part_rows(part, filters)
+        if rows is None:
+            lf = conform(pl.scan_parquet(part))
+            for field, value in filters.items():
+                lf = lf.filter(
+                    pl.col(TAG_FIELDS[field]).list.contains(normalize_tag(value))
+                )
+            df = lf.select(read_cols).collect()
+        elif rows.size:
+            df = _read_rows(part, rows.astype(np.int64), read_cols, since_us, until_us)
+        else:
+            continue
+        frames.append(df)
+    if not frames:
+        return pl.DataFrame(schema={c: TWEET_SCHEMA[c] for c in columns})
+    window = pl.col("timestamp").is_between(pl.lit(since_utc), pl.lit(until_utc))
+    return conform(
+        pl.concat([conform(f, read_cols) for f in frames]).filter(window), columns
+    )
@@ -0,0 +1,197 @@
+import os
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import polars as pl
+from scipy import sparse
+from app.services.processing.vectorize import (
+    HASH_FEATURES,
+    apply_idf,
+    document_frequency,
+    hash_counts,
+    hashing_vectorizer,
+    term_frequency,
+)
+from app.services.storage.loader import partition_files
+from app.services.storage.paths import PROCESSED_PATH
+from app.services.storage.schema import conform
+from app.services.storage.tag_index import TAG_FIELDS, normalize_tag, part_rows
+from app.utils.logging import logger
+
+# Hashed term counts per Parquet part. Parts are immutable, so a cache file is
+# valid for as long as its part exists. Per-column totals are kept sparse
+# (the part's nonzero columns only): a micro-batch part touches a few
+# thousand of the 2**20 hashed columns.
+TFIDF_PATH = PROCESSED_PATH / "tfidf"
+SAMPLE_DOCS = 200
+
+
+def cache_file(part: Path) -> Path:
+    return TFIDF_PATH / part.parent.name / f"{part.stem}.npz"
+
+
+def vectorize_part(part: Path) -> dict:
+    df = (
+        pl.scan_parquet(part)
+        .select(
+            pl.int_range(pl.len(), dtype=pl.UInt32).alias("row"),
+            pl.col("timestamp").dt.epoch("us").alias("ts"),
+            pl.col("content").cast(pl.Utf8).fill_null("").str.strip_chars(),
+        )
+        .filter(pl.col("content") != "")
+        .collect()
+    )
+    texts = df.get_column("content")
+    X = hash_counts(texts)
+    # A few real terms with their hashed columns, for display only
+    analyzer = hashing_vectorizer().build_analyzer()
+    terms = sorted({t for text in texts.head(SAMPLE_DOCS) for t in analyzer(text)})
+    dfreq, tfreq = document_frequency(X), term_frequency(X)
+    cols = np.flatnonzero(dfreq)
+    entry = {
+        "data": X.data,
+        "indices": X.indices,
+        "indptr": X.indptr,
+        "ts": df.get_column("ts").to_numpy(),
+        "rows": df.get_column("row").to_numpy(),  # part rows, for tag filters
+        "cols": cols.astype(np.int32),
+        "col_df": dfreq[cols].astype(np.int32),
+        "col_tf": tfreq[cols].astype(np.int32),
+        "terms": np.array(terms, dtype=str),
+        "term_cols": hash_counts(pl.Series(terms)).indices,
+    }
+    out = cache_file(part)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_name(f".{out.stem}.{uuid.uuid4().hex}.tmp.npz")
+    np.savez_compressed(tmp, **entry)
+    os.replace(tmp, out)
+    return entry
+
+
+def load_part(part: Path) -> dict:
+    path = cache_file(part)
+    if not path.exists():
+        return vectorize_part(part)
+    with np.load(path) as z:
+        entry = {k: z[k] for k in z.files}
+    # Caches written before row numbers or sparse term totals were kept
+    return entry if "rows" in entry and "cols" in entry else vectorize_part(part)
+
+
+def _matrix(entry: dict) -> sparse.csr_matrix:
+    return sparse.csr_matrix(
+        (entry["data"], entry["indices"], entry["indptr"]),
+        shape=(len(entry["ts"]), HASH_FEATURES),
+    )
+
+
+def _tagged(part: Path, filters: Dict[str, str], rows: np.ndarray) -> np.ndarray:
+    """Mask of the cached rows that match ``filters``."""
+    tagged = part_rows(part, filters)
+    if tagged is None:
+        # Part without an inverted index: check its tag columns directly
+        hit = (
+            conform(pl.scan_parquet(part), list(TAG_FIELDS.values()))
+            .select(
+                pl.all_horizontal(
+                    pl.col(TAG_FIELDS[field]).list.contains(normalize_tag(value))
+                    for field, value in filters.items()
+                )
+                .fill_null(False)
+                .alias("hit")
+            )
+            .collect()
+        )
+        tagged = np.flatnonzero(hit.get_column("hit").to_numpy())
+    return np.isin(rows, tagged)
+
+
+def update_tfidf_cache(since_utc: datetime, until_utc: datetime) -> int:
+    """
+    Vectorize the window's parts that have no cache yet and drop cache files
+    of parts that no longer exist (compacted away). Returns parts vectorized.
+    """
+    parts = partition_files(since_utc, until_utc)
+    built = 0
+    for part in parts:
+        if not cache_file(part).exists():
+            vectorize_part(part)
+            built += 1
+    for day in {p.parent for p in parts}:
+        for cached in (TFIDF_PATH / day.name).glob("*.npz"):
+            if not (day / f"{cached.stem}.parquet").exists():
+                cached.unlink(missing_ok=True)
+    if built:
+        logger.info(f"Vectorized {built} new parts for TF-IDF")
+    return built
+
+
+def window_tfidf(
+    since_utc: datetime,
+    until_utc: datetime,
+    max_features: int,
+    filters: Optional[Dict[str, str]] = None,
+) -> Tuple[sparse.csr_matrix, np.ndarray, List[str]]:
+    """
+    TF-IDF of the window's tweets over its ``max_features`` most frequent
+    hashed terms, ranked by total count across the window as
+    TfidfVectorizer(max_features=...) does. Term totals and document
+    frequencies are the cached per-part counts; only parts straddling a
+    window edge are re-counted from their masked rows.
+    ``filters`` (e.g. {"hashtag": "sensex"}) restrict the documents to the
+    rows the parts' inverted indexes point at.
+    Returns (matrix, selected columns, sample terms).
+    """
+    since_us = int(since_utc.timestamp() * 1_000_000)
+    until_us = int(until_utc.timestamp() * 1_000_000)
+    dfreq = np.zeros(HASH_FEATURES, dtype=np.int64)
+    tfreq = np.zeros(HASH_FEATURES, dtype=np.int64)
+    blocks, terms = [], {}
+    for part in partition_files(since_utc, until_utc):
+        entry = load_part(part)
+        ts, X = entry["ts"], _matrix(entry)
+        mask = None
+        if filters:
+            mask = _tagged(part, filters, entry["rows"])
+        if not (ts.size and ts.min() >= since_us and ts.max() <= until_us):
+            in_window = (ts >= since_us) & (ts <= until_us)
+            mask = in_window if mask is None else mask & in_window
+        if mask is None:
+            np.add.at(dfreq, entry["cols"], entry["col_df"])
+            np.add.at(tfreq, entry["cols"], entry["col_tf"])
+        else:
+            X = X[mask]
+            dfreq += document_frequency(X)
+            tfreq += term_frequency(X)
+        if X.shape[0]:
+            blocks.append(X)
+            terms.update(zip(entry["terms"].tolist(), entry["term_cols"].tolist()))
+    if not blocks:
+        raise ValueError("❌ No valid text found in dataframe for TF-IDF.")
+
+    X = sparse.vstack(blocks, format="csr")
+    nonzero = np.flatnonzero(dfreq)
+    cols = nonzero[np.argsort(-tfreq[nonzero], kind="stable")[:max_features]]
+    cols.sort()
+    X = apply_idf(X[:, cols], dfreq[cols], X.shape[0])
+    selected = set(cols.tolist())
+    sample = sorted(t for t, c in terms.items() if c in selected)
+    return X, cols, sample
+
+
+def window_tfidf_summary(
+    since_utc: datetime,
+    until_utc: datetime,
+    max_features: int,
+    filters: Optional[Dict[str, str]] = None,
+) -> dict:
+    """Light metadata of the window's TF-IDF, for the /process/tfidf route."""
+    X, cols, sample = window_tfidf(since_utc, until_utc, max_features, filters)
+    return {
+        "docs": int(X.shape[0]),
+        "vocab_size": int(len(cols)),
+        "shape": list(X.shape),
+        "sample_terms": sample[:10],
+    }
@@ -1,23 +1,112 @@
-from typing import Iterable
+import math
+import os
+import uuid
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Union
 import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
+from app.config import (
+    PARQUET_MIN_ROW_GROUP_SIZE,
+    PARQUET_ROW_GROUP_SIZE,
+    PARQUET_ROW_GROUP_SPAN,
+    PARQUET_SORT_BY,
+)
+from app.services.storage.data_version import bump_data_version
 from app.services.storage.paths import PARQUET_PATH
+from app.services.storage.part_index import build_part_index, write_part_index
+from app.services.storage.tag_index import build_tag_index, write_tag_index
+from app.services.storage.schema import (
+    DICTIONARY_COLUMNS,
+    TWEET_ARROW_SCHEMA,
+    conform,
+    tweet_table,
+)
+
+
+def write_parquet_atomic(
+    df: Union[pl.DataFrame, pa.Table],
+    path: Path,
+    before_commit: Optional[Callable[[Path], None]] = None,
+    **kwargs,
+) -> Path:
+    """
+    Write to a temp file next to ``path`` and rename it into place. Arrow
+    tables go through pyarrow's writer (``kwargs`` are then its options).
+    ``before_commit`` is called with the temp file just before the rename.
+    """
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        if isinstance(df, pa.Table):
+            pq.write_table(df, tmp, **kwargs)
+        else:
+            df.write_parquet(tmp, **kwargs)
+        if before_commit is not None:
+            before_commit(tmp)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return path
 
 
 def to_polars_rows(items: Iterable[dict]) -> pl.DataFrame:
-    df = pl.DataFrame(list(items))
-    if df.is_empty():
-        return df
-    # Ensure proper dtypes
-    if df.get_column("timestamp").dtype != pl.Datetime(time_unit="us", time_zone="UTC"):
-        df = df.with_columns(
-            pl.col("timestamp").dt.replace_time_zone("UTC").alias("timestamp")
-        )
-    return df
+    """TWEET_SCHEMA frame from row dicts, typed on construction."""
+    # Naive datetimes are taken as UTC; missing keys become typed nulls
+    return pl.from_arrow(pa.Table.from_pylist(list(items), schema=TWEET_ARROW_SCHEMA))
+
+
+def part_file_name(job_id: str) -> str:
+    return f"part-{job_id}.parquet"
+
+
+def row_group_rows(df: pl.DataFrame) -> int:
+    # Size row groups to roughly one PARQUET_ROW_GROUP_SPAN of tweets, so the
+    # timestamp statistics line up with the windows the analysis reads
+    spans = df.select(
+        pl.col("timestamp").dt.truncate(PARQUET_ROW_GROUP_SPAN).n_unique()
+    ).item()
+    rows = math.ceil(df.height / max(1, spans))
+    return max(PARQUET_MIN_ROW_GROUP_SIZE, min(PARQUET_ROW_GROUP_SIZE, rows))
+
+
+def write_part(df: pl.DataFrame, path: Path) -> Path:
+    """
+    Commit one part file as TWEET_SCHEMA sorted by PARQUET_SORT_BY, with
+    row-group statistics, dictionary-encoded low-cardinality columns, the
+    schema version in its footer, and sidecar indexes (row groups, and
+    hashtag/mention postings) that are in place before the part becomes
+    visible.
+    """
+    df = conform(df)
+    df = df.sort([c for c in PARQUET_SORT_BY if c in df.columns])
+
+    def write_indexes(tmp: Path):
+        write_part_index(build_part_index(df, tmp), path)
+        write_tag_index(build_tag_index(df), path)
+
+    return write_parquet_atomic(
+        tweet_table(df),
+        path,
+        before_commit=write_indexes,
+        compression="zstd",
+        write_statistics=True,
+        use_dictionary=DICTIONARY_COLUMNS,
+        row_group_size=row_group_rows(df),
+    )
 
 
-def write_parquet_partitioned(df: pl.DataFrame, partition_col: str = "date") -> str:
+def write_parquet_partitioned(
+    df: pl.DataFrame, job_id: Optional[str] = None, partition_col: str = "date"
+) -> str:
+    """
+    Append ``df`` to the day partitions as one immutable part file per day.
+    Parts are committed with an atomic rename, so concurrent jobs never
+    overwrite each other and readers never see half-written files.
+    """
     if df.is_empty():
         return ""
+    job_id = job_id or uuid.uuid4().hex
     df2 = df.with_columns(
         pl.col("timestamp")
         .dt.convert_time_zone("UTC")
@@ -26,13 +115,12 @@ def write_parquet_partitioned(df: pl.DataFrame, partition_col: str = "date") ->
         .alias(partition_col)
     )
     out_dir = PARQUET_PATH
-    df2.write_parquet(out_dir / "_latest_batch.parquet")  # quick reference
-    # Partitioned write: one file per day partition to control memory
+    write_parquet_atomic(df2, out_dir / "_latest_batch.parquet")  # quick reference
+    # Partitioned write: one part per day partition to control memory
     for day, sub in df2.partition_by(partition_col, as_dict=True).items():
         day_str = day[0] if isinstance(day, tuple) else str(day)
         day_dir = out_dir / f"date={day_str}"
         day_dir.mkdir(parents=True, exist_ok=True)
-        sub.drop(partition_col).write_parquet(
-            day_dir / "tweets.parquet", compression="zstd"
-        )
+        write_part(sub.drop(partition_col), day_dir / part_file_name(job_id))
+    bump_data_version()
     return str(out_dir)
@@ -1,5 +1,7 @@
 import re
+import sys
 import unicodedata
+from functools import lru_cache
 from typing import List, Tuple
 
 URL_RE = re.compile(r"https?://\S+|www\.\S+")
@@ -24,3 +26,31 @@ def clean_text(text: str) -> str:
     t = t.replace("\n", " ")
     t = WHITESPACE_RE.sub(" ", t).strip()
     return t
+
+
+# Polars (Rust regex) equivalents of the patterns above. Rust's \s and \w
+# use different Unicode tables than Python's, so the classes are spelled out
+# from str.isspace / str.isalnum to keep both paths byte-for-byte identical.
+def _char_class(pred) -> str:
+    out, start = [], None
+    for c in range(sys.maxunicode + 2):
+        if c <= sys.maxunicode and pred(chr(c)):
+            if start is None:
+                start = c
+        elif start is not None:
+            out.append(f"\\x{{{start:X}}}-\\x{{{c - 1:X}}}")
+            start = None
+    return "".join(out)
+
+
+@lru_cache(maxsize=None)
+def polars_patterns() -> dict:
+    space = _char_class(str.isspace)
+    word = _char_class(lambda c: c.isalnum() or c == "_")
+    return {
+        "url": rf"https?://[^{space}]+|www\.[^{space}]+",
+        "whitespace": rf"[{space}]+",
+        # Matched against " " + text; the leading space replaces the lookbehind
+        "mention": r" @[A-Za-z0-9_]{1,15}",
+        "hashtag": rf" #[{word}]+",
+    }
@@ -1,9 +1,19 @@
 from datetime import datetime, timedelta, timezone
+from typing import Optional
 
 # We treat storage in UTC, but compute 24h windows from Asia/Kolkata
 IST = timezone(timedelta(hours=5, minutes=30))
 
 
+def as_utc(ts: Optional[datetime]) -> Optional[datetime]:
+    # Naive query timestamps are taken as UTC
+    if ts is None:
+        return None
+    if ts.tzinfo is None:
+        return ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc)
+
+
 def utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
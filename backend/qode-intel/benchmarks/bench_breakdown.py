@@ -0,0 +1,47 @@
+"""
+Per-hashtag signal decomposition: one filtered compute_composite per tag
+versus the single grouped pass of compute_breakdown.
+
+    python -m benchmarks.bench_breakdown [tweets] [tags]
+"""
+import sys
+import time
+
+import numpy as np
+import polars as pl
+
+from app.services.processing.signals import compute_breakdown, compute_composite
+from benchmarks.bench_signals import synthetic_tweets
+
+
+def _timed(label, fn):
+    t0 = time.perf_counter()
+    out = fn()
+    print(f"{label:>24}: {time.perf_counter() - t0:7.2f}s")
+    return out
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    k = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    tags = [f"tag{i}" for i in range(k)]
+    picks = np.random.default_rng(0).integers(0, k, size=(n, 2)).tolist()
+    df = synthetic_tweets(n).with_columns(
+        pl.Series("hashtags", [[tags[a], tags[b]] for a, b in picks])
+    )
+
+    def per_tag():
+        return {
+            t: compute_composite(df.filter(pl.col("hashtags").list.contains(t)))
+            for t in tags
+        }
+
+    a = _timed(f"{k} x compute_composite", per_tag)
+    b = _timed("compute_breakdown", lambda: compute_breakdown(df, top_k=k))
+    for t, expected in a.items():
+        got = b.filter(pl.col("key") == t).select(expected.columns)
+        assert np.allclose(got["signal"].to_numpy(), expected["signal"].to_numpy())
+
+
+if __name__ == "__main__":
+    main()
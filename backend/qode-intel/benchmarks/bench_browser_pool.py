@@ -0,0 +1,64 @@
+"""
+Startup latency and per-job overhead: launching Firefox per call (the old
+PlaywrightClient behaviour) versus leasing pages from the BrowserPool.
+Runs fully offline against the local fixture server.
+
+    python -m benchmarks.bench_browser_pool
+"""
+import asyncio
+import statistics
+import time
+
+from playwright.async_api import async_playwright
+
+from app.services.scraper.browser_pool import BrowserPool
+from benchmarks.fixture_server import base_url, serve_fixtures
+
+ROUNDS = 10
+
+
+async def launch_per_call(url: str) -> float:
+    t0 = time.perf_counter()
+    async with async_playwright() as p:
+        browser = await p.firefox.launch(headless=True)
+        page = await (await browser.new_context()).new_page()
+        await page.goto(url)
+        await browser.close()
+    return time.perf_counter() - t0
+
+
+async def pooled(pool: BrowserPool, url: str) -> float:
+    t0 = time.perf_counter()
+    async with pool.page(authenticated=False) as page:
+        await page.goto(url)
+    return time.perf_counter() - t0
+
+
+def _report(name: str, samples):
+    print(
+        f"{name:<18} median={statistics.median(samples) * 1000:8.1f} ms  "
+        f"max={max(samples) * 1000:8.1f} ms"
+    )
+
+
+async def main():
+    server = serve_fixtures()
+    url = f"{base_url(server)}/home"
+
+    cold = [await launch_per_call(url) for _ in range(ROUNDS)]
+
+    pool = BrowserPool("/nonexistent")
+    t0 = time.perf_counter()
+    await pool.start()
+    startup = time.perf_counter() - t0
+    warm = [await pooled(pool, url) for _ in range(ROUNDS)]
+    await pool.stop()
+    server.shutdown()
+
+    print(f"pool startup: {startup * 1000:.1f} ms (paid once, in app lifespan)")
+    _report("launch per call", cold)
+    _report("pooled page", warm)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
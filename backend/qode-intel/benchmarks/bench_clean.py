@@ -0,0 +1,88 @@
+"""
+Model path (clean_tweets -> dedupe_tweets -> model_dump -> to_polars_rows)
+versus the columnar clean_frame/dedupe_frame path: time and peak RSS, each
+measured in a fresh interpreter.
+
+    python -m benchmarks.bench_clean
+"""
+import random
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.models.tweet import Tweet
+from app.services.processing.clean import clean_tweets, tweets_to_frame
+from app.services.processing.dedupe import dedupe_tweets
+from app.services.processing.pipeline import clean_and_dedupe
+from app.services.storage.writer import to_polars_rows
+from app.utils.text import polars_patterns
+
+SIZES = (100_000, 500_000)
+
+
+def scraped_batch(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    words = ["nifty", "breakout", "#Nifty50", "@trader", "https://t.co/abc", "buy"]
+    start = datetime.now(timezone.utc) - timedelta(hours=24)
+    tweets = []
+    for i in range(n):
+        if tweets and rng.random() < 0.1:
+            # Overlapping scrolls hand back tweets we already have
+            tweets.append(rng.choice(tweets).model_copy())
+            continue
+        tweets.append(
+            Tweet(
+                id=str(i),
+                username=f"user{rng.randint(0, 5000)}",
+                timestamp=start + timedelta(seconds=rng.randint(0, 86400)),
+                content="  ".join(rng.choices(words, k=10)) + "\n",
+                like_count=rng.randint(0, 500),
+                hashtags=["nifty50"],
+            )
+        )
+    return tweets
+
+
+def model_path(tweets):
+    unique = dedupe_tweets(clean_tweets(tweets))
+    return to_polars_rows([u.model_dump() for u in unique])
+
+
+def columnar_path(tweets):
+    return clean_and_dedupe(tweets_to_frame(tweets))
+
+
+def run_one(path: str, n: int):
+    tweets = scraped_batch(n)
+    polars_patterns()  # built once per process; not part of the batch cost
+    base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    t0 = time.perf_counter()
+    df = (model_path if path == "model" else columnar_path)(tweets)
+    took = time.perf_counter() - t0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base
+    print(f"{took:.3f} {peak / 1024:.0f} {df.height}")
+
+
+def main():
+    for n in SIZES:
+        for path in ("model", "columnar"):
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_clean", path, str(n)],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.split()
+            took, peak, rows = float(out[0]), int(out[1]), int(out[2])
+            print(
+                f"n={n:>8,} {path:>8}: {took:6.2f}s  "
+                f"peak +{peak:5d} MiB  rows={rows:,}"
+            )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        run_one(sys.argv[1], int(sys.argv[2]))
+    else:
+        main()
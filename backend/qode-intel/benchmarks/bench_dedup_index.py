@@ -0,0 +1,72 @@
+"""
+Lookup throughput of the persistent dedup index at 10M stored signatures.
+
+    python -m benchmarks.bench_dedup_index [stored]
+"""
+import os
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from app.services.storage.dedup_index import DedupIndex
+
+QUERIES = 100_000
+
+
+def _timed(label: str, fn, per: int = 0):
+    t0 = time.perf_counter()
+    out = fn()
+    took = time.perf_counter() - t0
+    rate = f"  ({per / took:,.0f}/s)" if per else ""
+    print(f"{label:>28}: {took:7.3f}s{rate}")
+    return out
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    rng = np.random.default_rng(0)
+    path = Path(tempfile.mkdtemp(prefix="qode-dedup-")) / "dedup.npz"
+    now_us = int(datetime.now(timezone.utc).timestamp() * 1_000_000)
+
+    index = DedupIndex(path)
+    index.ids = np.sort(rng.integers(0, 2**64, n, dtype=np.uint64))
+    index.id_ts = np.full(n, now_us, dtype=np.int64)
+    index.sigs = rng.integers(0, 2**64, n, dtype=np.uint64)
+    index.sig_ts = index.id_ts.copy()
+    _timed("save", index._save)
+    print(f"{'file size':>28}: {os.path.getsize(path) / 2**20:7.0f} MiB")
+    index = _timed("load", lambda: DedupIndex(path))
+    _timed("build band views", lambda: index.bands)
+
+    # Half the queries are near-copies (2 bits flipped) of stored signatures
+    stored = index.sigs[rng.integers(0, n, QUERIES // 2)]
+    flips = np.uint64(1) << rng.integers(0, 64, (QUERIES // 2, 2)).astype(np.uint64)
+    queries = np.concatenate(
+        [
+            stored ^ flips[:, 0] ^ flips[:, 1],
+            rng.integers(0, 2**64, QUERIES // 2, dtype=np.uint64),
+        ]
+    )
+    hits = _timed(
+        "near-dup lookups",
+        lambda: index.bands.hits(queries, index.max_distance),
+        per=QUERIES,
+    )
+    print(f"{'recall on near-copies':>28}: {hits[: QUERIES // 2].mean():7.3f}")
+    print(f"{'false hits on random':>28}: {hits[QUERIES // 2 :].mean():7.5f}")
+
+    ids = np.concatenate(
+        [index.ids[rng.integers(0, n, QUERIES // 2)], queries[: QUERIES // 2]]
+    )
+    _timed("exact id lookups", lambda: index._known_ids(ids), per=QUERIES)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{'peak RSS':>28}: {peak:7.0f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+DOM extraction on the local fixture page: the old per-card evaluate path
+versus one batched in-page collect per scroll.
+
+    python -m benchmarks.bench_dom_capture
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+from playwright.async_api import async_playwright
+
+from app.services.scraper.dom_capture import ScrapeStats, collect_new_cards
+from benchmarks.fixture_server import base_url, serve_fixtures
+
+SCROLLS = 15
+SCROLL_STEP = 2000
+PER_CARD_JS = """(el) => {
+    const content = [...el.querySelectorAll("div[data-testid='tweetText']")]
+        .map(n => n.innerText).join(" ").trim();
+    const link = el.querySelector("a[href*='/status/']")?.getAttribute("href");
+    const user = el.querySelector("a[href^='/']")?.getAttribute("href") || "";
+    return { content, link, user };
+}"""
+
+
+async def per_card(page, stats: ScrapeStats, seen: set):
+    # The previous path: re-walk every article, one evaluate per card
+    for _ in range(SCROLLS):
+        cards = await page.locator("article").all()
+        stats.ipc_calls += 1
+        for card in cards:
+            data = await card.evaluate(PER_CARD_JS)
+            stats.ipc_calls += 1
+            tid = data["link"].split("/status/")[-1]
+            if tid in seen:
+                stats.duplicates_skipped += 1
+                continue
+            seen.add(tid)
+            stats.cards += 1
+        await page.evaluate(f"window.scrollBy(0, {SCROLL_STEP})")
+        stats.ipc_calls += 1
+        stats.scrolls += 1
+        await asyncio.sleep(0.2)
+
+
+async def batched(page, stats: ScrapeStats, seen: set):
+    since = datetime.now(timezone.utc) - timedelta(days=1)
+    until = datetime.now(timezone.utc) + timedelta(minutes=5)
+    for _ in range(SCROLLS):
+        await collect_new_cards(page, "fixture", since, until, seen, stats, SCROLL_STEP)
+        stats.scrolls += 1
+        await asyncio.sleep(0.2)
+
+
+async def main():
+    server = serve_fixtures()
+    url = f"{base_url(server)}/search?q=%23fixture&max_cards=2000"
+    async with async_playwright() as p:
+        browser = await p.firefox.launch(headless=True)
+        for name, run in (("per-card", per_card), ("batched", batched)):
+            page = await browser.new_page()
+            await page.goto(url)
+            await page.wait_for_selector("article")
+            stats = ScrapeStats("fixture")
+            await run(page, stats, set())
+            stats.finished = time.monotonic()
+            print(name, stats.as_dict())
+            await page.close()
+        await browser.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,64 @@
+"""
+Striding versus LTTB and min/max-envelope downsampling of multi-week
+signal series: time, spike retention and reconstruction error.
+
+    python -m benchmarks.bench_downsample
+"""
+import time
+
+import numpy as np
+
+from app.services.processing.downsample import lttb_indices, minmax_indices
+
+POINTS = 800
+SPIKES = 25
+
+
+def synthetic_series(weeks: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    n = weeks * 7 * 24 * 60  # 1m buckets
+    x = np.arange(n, dtype=np.float64)
+    y = np.tanh(np.cumsum(rng.normal(0, 0.02, n)) + 0.2 * np.sin(x / 720))
+    spikes = rng.choice(n, SPIKES, replace=False)
+    y[spikes] += rng.choice([-1, 1], SPIKES) * rng.uniform(0.8, 1.5, SPIKES)
+    return x, y, spikes
+
+
+def stride_indices(n: int, n_out: int) -> np.ndarray:
+    return np.arange(0, n, max(1, n // n_out))
+
+
+def envelope_error(y: np.ndarray, drawn: np.ndarray, columns: int) -> float:
+    # What a chart shows per pixel column is the min/max of the line there
+    cols = np.array_split(np.arange(len(y)), columns)
+    err = [
+        abs(y[c].max() - drawn[c].max()) + abs(y[c].min() - drawn[c].min())
+        for c in cols
+    ]
+    return float(np.mean(err))
+
+
+def main():
+    for weeks in (1, 4, 12):
+        x, y, spikes = synthetic_series(weeks)
+        print(f"{weeks:>2} weeks ({len(y):,} points -> {POINTS}):")
+        for name, fn in (
+            ("stride", lambda: stride_indices(len(y), POINTS)),
+            ("lttb", lambda: lttb_indices(x, y, POINTS)),
+            ("minmax", lambda: minmax_indices(y, POINTS)),
+        ):
+            t0 = time.perf_counter()
+            idx = fn()
+            took = (time.perf_counter() - t0) * 1e3
+            kept = np.isin(spikes, idx).mean()
+            drawn = np.interp(x, x[idx], y[idx])
+            env = envelope_error(y, drawn, POINTS)
+            mae = np.abs(drawn - y).mean()
+            print(
+                f"  {name:>7}: {took:7.2f}ms  spikes kept {kept:5.0%}  "
+                f"envelope error {env:.4f}  pointwise MAE {mae:.4f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
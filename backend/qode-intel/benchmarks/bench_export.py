@@ -0,0 +1,61 @@
+"""
+Bulk tweet export: collecting the window and JSON-encoding to_dict() versus
+streaming record batches as Arrow IPC, Parquet and NDJSON. The largest
+chunk is what the streaming server holds at once besides one batch.
+
+    python -m benchmarks.bench_export [tweets]
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("DATA_DIR", tempfile.mkdtemp(prefix="qode-bench-"))
+
+import polars as pl  # noqa: E402
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from app.services.storage.export import (  # noqa: E402
+    encode_batches,
+    export_schema,
+    window_batches,
+)
+from app.services.storage.loader import scan_window  # noqa: E402
+from app.services.storage.writer import write_parquet_partitioned  # noqa: E402
+from benchmarks.bench_signals import synthetic_tweets  # noqa: E402
+
+
+def _report(label, t0, chunks):
+    total, largest = sum(chunks), max(chunks)
+    print(
+        f"{label:>12}: {time.perf_counter() - t0:6.2f}s  {total / 1e6:8.1f}MB  "
+        f"largest chunk {largest / 1e6:7.1f}MB"
+    )
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    df = synthetic_tweets(n).with_columns(
+        pl.format("t{}", pl.int_range(pl.len())).alias("id")
+    )
+    write_parquet_partitioned(df, job_id="bench")
+    until = datetime.now(timezone.utc)
+    since = until - timedelta(hours=25)
+
+    t0 = time.perf_counter()
+    rows = scan_window(since, until).collect().to_dict(as_series=False)
+    body = JSONResponse(jsonable_encoder(rows)).body
+    _report("to_dict JSON", t0, [len(body)])
+    del rows, body
+
+    for fmt in ("arrow", "parquet", "ndjson"):
+        t0 = time.perf_counter()
+        batches = window_batches(since, until)
+        sizes = [len(c) for c in encode_batches(batches, export_schema(), fmt)]
+        _report(fmt, t0, sizes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Fixed 2s scroll cadence versus the AIMD limiter against a simulated server
+that tolerates a fixed request rate and answers 429 beyond it: accepted
+requests/s, throttled share and per-hashtag fairness.
+
+    python -m benchmarks.bench_rate_limiter
+"""
+import asyncio
+import time
+from collections import Counter, deque
+
+from app.services.scraper.rate_limiter import AdaptiveLimiter
+
+CAPACITY = 20.0  # requests/s the simulated site accepts
+SECONDS = 10.0
+WORKERS = {"#nifty50": 3, "#sensex": 1, "#banknifty": 1}
+
+
+class SimulatedServer:
+    """
+    Accepts ``capacity`` requests per sliding second; requests beyond that
+    get a 429. Latency grows with load.
+    """
+
+    def __init__(self, capacity: float, base_latency: float = 0.01):
+        self.capacity = capacity
+        self.base_latency = base_latency
+        self._recent = deque()
+        self.log = []  # (time, key, status)
+
+    async def request(self, key: str):
+        now = time.monotonic()
+        while self._recent and now - self._recent[0] > 1.0:
+            self._recent.popleft()
+        self._recent.append(now)
+        load = len(self._recent) / self.capacity
+        status = 429 if load > 1.0 else 200
+        latency = self.base_latency * (1 + load)
+        await asyncio.sleep(latency)
+        self.log.append((now, key, status))
+        return status, latency
+
+
+async def drive(server, limiter, workers: dict, seconds: float):
+    """Scroll loops per hashtag; ``limiter=None`` is the fixed 2s cadence."""
+    deadline = time.monotonic() + seconds
+
+    async def loop(key):
+        while time.monotonic() < deadline:
+            if limiter is None:
+                await asyncio.sleep(2)
+            else:
+                await limiter.acquire(key)
+            status, latency = await server.request(key)
+            if limiter is not None:
+                limiter.record(status=status, latency=latency)
+
+    tasks = [asyncio.create_task(loop(k)) for k, n in workers.items() for _ in range(n)]
+    await asyncio.sleep(seconds)
+    for t in tasks:
+        t.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def summarize(server, seconds: float) -> dict:
+    ok = [(t, k) for t, k, s in server.log if s == 200]
+    per_key = Counter(k for _, k in ok)
+    return {
+        "ok_per_s": len(ok) / seconds,
+        "throttled": sum(s != 200 for _, _, s in server.log) / max(1, len(server.log)),
+        "share": {k: n / max(1, len(ok)) for k, n in per_key.items()},
+    }
+
+
+def main():
+    for name, limiter in [
+        ("fixed 2s", None),
+        ("aimd", AdaptiveLimiter(rate=0.5, max_rate=100, increase=0.5)),
+    ]:
+        server = SimulatedServer(CAPACITY)
+        asyncio.run(drive(server, limiter, WORKERS, SECONDS))
+        r = summarize(server, SECONDS)
+        share = ", ".join(f"{k} {v:.0%}" for k, v in sorted(r["share"].items()))
+        print(
+            f"{name:>9}: {r['ok_per_s']:5.1f} ok req/s of {CAPACITY:.0f}, "
+            f"{r['throttled']:.1%} throttled, share {share}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+/analyze/signal.png render time: legacy pyplot path (new figure, pandas
+conversion, tight_layout per call) versus the reused Agg SignalRenderer.
+
+    python -m benchmarks.bench_render
+"""
+import io
+import statistics
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+import pandas as pd  # noqa: E402
+import polars as pl  # noqa: E402
+
+from app.services.processing.signals import compute_composite  # noqa: E402
+from app.services.processing.visualize import plot_signal  # noqa: E402
+from benchmarks.bench_signals import synthetic_tweets  # noqa: E402
+
+RUNS = 30
+TARGET_MS = 80  # p50 budget for one PNG at PLOT_MAX_POINTS
+
+
+def legacy_plot_signal(df: pl.DataFrame) -> bytes:
+    x = pd.to_datetime(df.get_column("bucket").to_pandas())
+    y = df.get_column("signal").to_numpy()
+    ci = df.get_column("ci95").to_numpy()
+    fig = plt.figure(figsize=(9, 4))
+    ax = plt.gca()
+    ax.plot(x, y, label="Composite Signal")
+    ax.fill_between(x, y - ci, y + ci, alpha=0.2, label="95% CI")
+    ax.set_xlabel("Time")
+    ax.set_ylabel("Signal (-1..1)")
+    ax.legend()
+    fig.tight_layout()
+    buf = io.BytesIO()
+    plt.savefig(buf, format="png")
+    plt.close(fig)
+    return buf.getvalue()
+
+
+def _p50_ms(fn, *args) -> float:
+    fn(*args)  # warm-up
+    samples = []
+    for _ in range(RUNS):
+        t0 = time.perf_counter()
+        fn(*args)
+        samples.append((time.perf_counter() - t0) * 1e3)
+    return statistics.median(samples)
+
+
+def signal_series(points: int) -> pl.DataFrame:
+    comp = compute_composite(synthetic_tweets(100_000))
+    reps = -(-points // comp.height)
+    out = pl.concat([comp] * reps).head(points)
+    start = comp["bucket"][0]
+    return out.with_columns(
+        pl.datetime_range(
+            start,
+            start + pl.duration(minutes=15 * (points - 1)),
+            "15m",
+            time_zone="UTC",
+            eager=True,
+        ).alias("bucket")
+    )
+
+
+def main():
+    for points in (96, 800):
+        comp = signal_series(points)
+        legacy = _p50_ms(legacy_plot_signal, comp)
+        png = _p50_ms(plot_signal, comp)
+        svg = _p50_ms(plot_signal, comp, "svg")
+        print(
+            f"{points:>4} points: legacy {legacy:6.1f}ms  "
+            f"renderer png {png:6.1f}ms  svg {svg:6.1f}ms  "
+            f"({'ok' if png <= TARGET_MS else 'over'} vs {TARGET_MS}ms target)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+30-day hourly signal: reading the rollup pyramid versus recomputing the
+composite from raw partitions.
+
+    python -m benchmarks.bench_rollups [tweets]
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("DATA_DIR", tempfile.mkdtemp(prefix="qode-bench-"))
+
+import polars as pl  # noqa: E402
+
+from app.services.processing.signals import compute_composite  # noqa: E402
+from app.services.processing.signals import finalize_stats  # noqa: E402
+from app.services.storage.loader import scan_window  # noqa: E402
+from app.services.storage.signal_store import load_signal_stats  # noqa: E402
+from app.services.storage.signal_store import update_signal_store  # noqa: E402
+from app.services.storage.writer import write_parquet_partitioned  # noqa: E402
+from benchmarks.bench_signals import synthetic_tweets  # noqa: E402
+
+DAYS = 30
+
+
+def _timed(label, fn):
+    t0 = time.perf_counter()
+    out = fn()
+    print(f"{label:>22}: {(time.perf_counter() - t0) * 1e3:8.1f}ms  {out.height} rows")
+    return out
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    until = datetime.now(timezone.utc)
+    since = until - timedelta(days=DAYS)
+    per_day = n // DAYS
+    for d in range(DAYS):
+        day = synthetic_tweets(per_day, seed=d).with_columns(
+            pl.format("{}-{}", pl.lit(d), pl.int_range(pl.len())).alias("id"),
+            pl.col("timestamp") - pl.duration(days=d),
+        )
+        write_parquet_partitioned(day, job_id=f"day{d}")
+        update_signal_store(day)
+    print(f"{per_day * DAYS:,} tweets over {DAYS} days")
+
+    pyramid = _timed(
+        "pyramid 1h", lambda: finalize_stats(load_signal_stats(since, until, "1h"))
+    )
+    _timed(
+        "pyramid 4h (rolled)",
+        lambda: finalize_stats(load_signal_stats(since, until, "4h")),
+    )
+    raw = _timed(
+        "raw partitions 1h",
+        lambda: compute_composite(scan_window(since, until), every="1h"),
+    )
+    print(f"{'buckets in both':>22}: {pyramid['bucket'].is_in(raw['bucket']).sum()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Row dicts to a frame with inferred dtypes (the old to_polars_rows) versus
+typed Arrow construction against TWEET_SCHEMA, and on-disk size of a part
+written by Polars' default writer versus write_part (dictionary-encoded
+username/lang/hashtags, schema version in the footer).
+
+    python -m benchmarks.bench_schema
+"""
+import tempfile
+import time
+from pathlib import Path
+
+import polars as pl
+
+from app.services.processing.clean import tweets_to_frame
+from app.services.storage.schema import TWEET_SCHEMA
+from app.services.storage.writer import row_group_rows, to_polars_rows, write_part
+from benchmarks.bench_clean import scraped_batch
+
+N = 200_000
+
+
+def inferred_rows(items) -> pl.DataFrame:
+    df = pl.DataFrame(list(items))
+    df = df.cast(
+        {
+            c: TWEET_SCHEMA[c]
+            for c in df.columns
+            if c in TWEET_SCHEMA and c != "timestamp"
+        }
+    )
+    return df.with_columns(pl.col("timestamp").dt.replace_time_zone("UTC"))
+
+
+def _time(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return time.perf_counter() - t0, out
+
+
+def main():
+    tweets = scraped_batch(N)
+    rows = [t.model_dump() for t in tweets]
+    for name, fn, arg in [
+        ("inferred dicts", inferred_rows, rows),
+        ("typed dicts", to_polars_rows, rows),
+        ("typed columns", tweets_to_frame, tweets),
+    ]:
+        elapsed, df = _time(fn, arg)
+        typed = "matches" if df.schema == TWEET_SCHEMA else "differs from"
+        print(f"{name:>15}: {elapsed:6.2f}s, schema {typed} TWEET_SCHEMA")
+
+    df = to_polars_rows(rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        plain, typed = Path(tmp) / "plain.parquet", Path(tmp) / "typed.parquet"
+        # Same row groups as write_part, so only the encoding differs
+        df.sort("timestamp").write_parquet(
+            plain, compression="zstd", row_group_size=row_group_rows(df)
+        )
+        elapsed, _ = _time(write_part, df, typed)
+        print(
+            f"on disk: polars writer {plain.stat().st_size / 1e6:.2f} MB, "
+            f"write_part {typed.stat().st_size / 1e6:.2f} MB ({elapsed:.2f}s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
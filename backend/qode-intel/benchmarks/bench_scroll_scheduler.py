@@ -0,0 +1,105 @@
+"""
+Lockstep BATCH_SIZE gather with a static per-hashtag quota versus the
+work-stealing ScrollScheduler, over simulated hashtag scroll streams with
+skewed yields, depths and page latencies. Reports tweets per simulated
+minute (one scroll step stands for 2s of wall clock).
+
+    python -m benchmarks.bench_scroll_scheduler
+"""
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from app.config import BROWSER_MAX_PAGES
+from app.services.scraper.scheduler import ScrollScheduler
+
+STEP = 0.005  # real seconds per simulated scroll step
+STEP_SECONDS = 2.0  # what one step costs against the live site
+LIMIT = 6000
+MAX_NO_NEW_SCROLLS = 3
+# hashtag: (tweets per step, tweets available, step latency multiplier)
+HASHTAGS = {
+    "#nifty50": (40, 5000, 1),
+    "#sensex": (25, 1500, 1),
+    "#banknifty": (15, 3000, 1),
+    "#options": (20, 2000, 3),  # slow page
+    "#stocks": (10, 600, 1),
+    "#intraday": (5, 100, 1),
+    "#niftyit": (2, 40, 1),
+    "#fii": (0, 0, 1),  # dead
+}
+
+
+NOW = datetime(2025, 8, 30, 12, tzinfo=timezone.utc)
+
+
+@dataclass(frozen=True)
+class SimTweet:
+    id: str
+    timestamp: datetime = NOW
+
+
+def simulated_stream(hashtag: str, before: Optional[datetime] = None, cap: int = LIMIT):
+    """Newest-first timeline, one tweet a second; ``before`` resumes below it."""
+    per_step, depth, slow = HASHTAGS[hashtag]
+    start = 0 if before is None else int((NOW - before).total_seconds()) + 1
+
+    async def stream():
+        pos, empty = start, 0
+        while pos - start < cap and empty < MAX_NO_NEW_SCROLLS:
+            await asyncio.sleep(STEP * slow)
+            n = min(per_step, depth - pos, cap - (pos - start))
+            if n <= 0:
+                empty += 1
+                continue
+            empty = 0
+            yield [
+                SimTweet(f"{hashtag}-{i}", NOW - timedelta(seconds=i))
+                for i in range(pos, pos + n)
+            ]
+            pos += n
+
+    return stream()
+
+
+async def lockstep(hashtags, limit, batch_size=3) -> int:
+    per = max(1, limit // len(hashtags))
+    seen = set()
+
+    async def one(h):
+        return [t async for items in simulated_stream(h, cap=per) for t in items]
+
+    for i in range(0, len(hashtags), batch_size):
+        for tweets in await asyncio.gather(*map(one, hashtags[i : i + batch_size])):
+            seen.update(t.id for t in tweets)
+    return min(len(seen), limit)
+
+
+async def scheduled(hashtags, limit, workers) -> int:
+    scheduler = ScrollScheduler(hashtags, limit, workers, simulated_stream)
+    return sum([len(batch) async for batch in scheduler.run()])
+
+
+def report(name: str, run):
+    t0 = time.perf_counter()
+    tweets = asyncio.run(run)
+    minutes = (time.perf_counter() - t0) / STEP * STEP_SECONDS / 60
+    print(f"{name:>28}: {tweets:5d} tweets, {tweets / minutes:7.0f} tweets/min")
+
+
+def main():
+    tags = list(HASHTAGS)
+    report("lockstep batch=3", lockstep(tags, LIMIT))
+    report(
+        f"lockstep batch={BROWSER_MAX_PAGES}", lockstep(tags, LIMIT, BROWSER_MAX_PAGES)
+    )
+    report(
+        f"work-stealing pages={BROWSER_MAX_PAGES}",
+        scheduled(tags, LIMIT, BROWSER_MAX_PAGES),
+    )
+
+
+if __name__ == "__main__":
+    main()
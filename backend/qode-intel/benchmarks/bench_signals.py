@@ -0,0 +1,76 @@
+"""
+Compare the per-row map_elements scorer with the native-expression engine.
+
+    python -m benchmarks.bench_signals
+"""
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+import polars as pl
+
+from app.services.processing.signals import (
+    BEAR_WORDS,
+    BULL_WORDS,
+    compute_composite,
+    engagement_weight,
+    lexical_signal,
+)
+
+
+def synthetic_tweets(n: int, seed: int = 0) -> pl.DataFrame:
+    rng = random.Random(seed)
+    vocab = sorted(BULL_WORDS | BEAR_WORDS) + [
+        "market",
+        "today",
+        "support",
+        "levels",
+        "watch",
+        "#nifty50",
+        "@trader",
+    ]
+    texts = [" ".join(rng.choices(vocab, k=12)) for _ in range(1000)]
+    start = datetime.now(timezone.utc) - timedelta(hours=24)
+    return pl.DataFrame(
+        {
+            "timestamp": [start + timedelta(seconds=i * 86400 / n) for i in range(n)],
+            "content": [texts[i % len(texts)] for i in range(n)],
+            "like_count": [rng.randint(0, 500) for _ in range(n)],
+            "retweet_count": [rng.randint(0, 50) for _ in range(n)],
+            "reply_count": [rng.randint(0, 20) for _ in range(n)],
+            "quote_count": [rng.randint(0, 5) for _ in range(n)],
+        }
+    )
+
+
+def per_row_composite(df: pl.DataFrame) -> pl.DataFrame:
+    cols = ["like_count", "retweet_count", "reply_count", "quote_count"]
+    return df.with_columns(
+        pl.col("content")
+        .map_elements(lexical_signal, return_dtype=pl.Float64)
+        .alias("lex_signal"),
+        pl.struct(cols)
+        .map_elements(engagement_weight, return_dtype=pl.Float64)
+        .alias("weight"),
+    )
+
+
+def _time(fn, *args) -> float:
+    t0 = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - t0
+
+
+def main():
+    for n in (100_000, 1_000_000):
+        df = synthetic_tweets(n)
+        legacy = _time(per_row_composite, df)
+        native = _time(compute_composite, df)
+        print(
+            f"n={n:>9,}  map_elements={legacy:7.2f}s  native={native:7.3f}s  "
+            f"speedup={legacy / native:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
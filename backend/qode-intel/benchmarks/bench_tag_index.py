@@ -0,0 +1,75 @@
+"""
+Per-hashtag 7-day signal: scanning every tweet's hashtags list versus
+reading the rows the inverted tag index points at, for a common and a rare
+tag.
+
+    python -m benchmarks.bench_tag_index [tweets]
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("DATA_DIR", tempfile.mkdtemp(prefix="qode-bench-"))
+
+import numpy as np  # noqa: E402
+import polars as pl  # noqa: E402
+
+from app.services.processing.signals import SIGNAL_COLUMNS  # noqa: E402
+from app.services.processing.signals import compute_composite  # noqa: E402
+from app.services.storage.loader import scan_window  # noqa: E402
+from app.services.storage.tag_index import scan_tagged  # noqa: E402
+from app.services.storage.writer import write_parquet_partitioned  # noqa: E402
+from benchmarks.bench_signals import synthetic_tweets  # noqa: E402
+
+DAYS = 7
+# Zipf-like popularity: "tag0" is on ~1 in 5 tweets, "tag199" on ~1 in 1000
+TAGS = [f"tag{i}" for i in range(200)]
+
+
+def _timed(label, fn):
+    t0 = time.perf_counter()
+    out = fn()
+    print(f"{label:>28}: {(time.perf_counter() - t0) * 1e3:8.1f}ms  {out.height} rows")
+    return out
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    until = datetime.now(timezone.utc)
+    since = until - timedelta(days=DAYS)
+    rng = np.random.default_rng(0)
+    weights = 1 / np.arange(1, len(TAGS) + 1)
+    weights /= weights.sum()
+    per_day = n // DAYS
+    for d in range(DAYS):
+        picks = rng.choice(len(TAGS), size=(per_day, 2), p=weights)
+        day = synthetic_tweets(per_day, seed=d).with_columns(
+            pl.format("{}-{}", pl.lit(d), pl.int_range(pl.len())).alias("id"),
+            pl.col("timestamp") - pl.duration(days=d),
+            pl.Series("hashtags", [[TAGS[a], TAGS[b]] for a, b in picks.tolist()]),
+        )
+        write_parquet_partitioned(day, job_id=f"day{d}")
+
+    for tag in ("tag0", "tag199"):
+
+        def full_scan():
+            lf = scan_window(since, until, [*SIGNAL_COLUMNS, "hashtags"])
+            return compute_composite(lf.filter(pl.col("hashtags").list.contains(tag)))
+
+        def indexed():
+            return compute_composite(
+                scan_tagged(since, until, {"hashtag": tag}, SIGNAL_COLUMNS)
+            )
+
+        if tag == "tag0":
+            # One-time reader initialisation shouldn't land on either side
+            full_scan(), indexed()
+        a = _timed(f"{tag} list.contains scan", full_scan)
+        b = _timed(f"{tag} inverted index", indexed)
+        assert a.equals(b)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+/process/tfidf at 1M docs: full TfidfVectorizer refit versus the cached
+hashing-feature store, cold (rebuild) and after one new scrape (incremental).
+
+    python -m benchmarks.bench_tfidf_incremental [docs]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("DATA_DIR", tempfile.mkdtemp(prefix="qode-bench-"))
+
+import polars as pl  # noqa: E402
+
+from app.services.processing.vectorize import tfidf_summary  # noqa: E402
+from app.services.storage import tfidf_store  # noqa: E402
+from app.services.storage.loader import scan_window  # noqa: E402
+from app.services.storage.writer import write_parquet_partitioned  # noqa: E402
+from benchmarks.bench_signals import synthetic_tweets  # noqa: E402
+
+JOBS = 20
+NEW_JOB = 10_000
+MAX_FEATURES = 20000
+
+
+def write_job(n: int, seed: int, until: datetime):
+    df = synthetic_tweets(n, seed=seed).with_columns(
+        pl.format("{}-{}", pl.lit(seed), pl.int_range(pl.len())).alias("id"),
+        (
+            pl.lit(until) - pl.duration(seconds=pl.int_range(pl.len()) * 80_000 // n)
+        ).alias("timestamp"),
+        # Vary the text so the vocabulary is realistic in size
+        (
+            pl.col("content") + " w" + (pl.int_range(pl.len()) % 50_000).cast(pl.String)
+        ).alias("content"),
+    )
+    write_parquet_partitioned(df, job_id=f"job{seed}")
+
+
+def _timed(label, fn):
+    t0 = time.perf_counter()
+    out = fn()
+    print(f"{label:>24}: {time.perf_counter() - t0:7.2f}s  {out['shape']}")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    until = datetime.now(timezone.utc)
+    since = until - timedelta(hours=24)
+    for j in range(JOBS):
+        write_job(n // JOBS, j, until)
+
+    def refit():
+        df = scan_window(since, until, columns=["content"]).collect(streaming=True)
+        return tfidf_summary(df, max_features=MAX_FEATURES)
+
+    def window():
+        tfidf_store.update_tfidf_cache(since, until)
+        return tfidf_store.window_tfidf_summary(since, until, MAX_FEATURES)
+
+    print(f"{n:,} docs in {JOBS} jobs")
+    _timed("TfidfVectorizer refit", refit)
+    shutil.rmtree(tfidf_store.TFIDF_PATH, ignore_errors=True)
+    _timed("hashing store rebuild", window)
+    _timed("cached, no new parts", window)
+    write_job(NEW_JOB, JOBS, until)
+    _timed(f"+{NEW_JOB:,} new tweets", window)
+
+
+if __name__ == "__main__":
+    main()
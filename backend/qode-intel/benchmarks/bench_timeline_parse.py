@@ -0,0 +1,52 @@
+"""
+Replay recorded SearchTimeline payloads through TimelineCapture, the same
+path page.on("response") feeds, and report parsing throughput offline.
+
+    python -m benchmarks.bench_timeline_parse
+"""
+import asyncio
+import json
+import time
+from pathlib import Path
+
+from app.services.scraper.timeline import TimelineCapture
+
+FIXTURE = Path(__file__).parent / "fixtures" / "search_timeline.json"
+URL = "https://x.com/i/api/graphql/replay/SearchTimeline"
+PAYLOADS = 2500
+
+
+class ReplayResponse:
+    """Minimal stand-in for a Playwright Response carrying a recorded body."""
+
+    status = 200
+    headers: dict = {}
+
+    def __init__(self, url: str, body: bytes):
+        self.url = url
+        self._body = body
+
+    async def json(self):
+        return json.loads(self._body)
+
+
+async def replay(body: bytes, n: int) -> int:
+    capture = TimelineCapture("nifty50")
+    for _ in range(n):
+        capture.on_response(ReplayResponse(URL, body))
+    return len(await capture.drain())
+
+
+def main():
+    body = FIXTURE.read_bytes()
+    t0 = time.perf_counter()
+    tweets = asyncio.run(replay(body, PAYLOADS))
+    elapsed = time.perf_counter() - t0
+    print(
+        f"{PAYLOADS} payloads, {tweets:,} tweets in {elapsed:.2f}s: "
+        f"{tweets / elapsed:,.0f} tweets/s, {elapsed / PAYLOADS * 1000:.2f} ms/payload"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Bytes read for 1h and 24h windows: sorted, row-group-tuned parts with
+sidecar indexes versus unsorted parts with default row groups.
+
+    python -m benchmarks.bench_window_pruning
+"""
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+os.environ.setdefault("DATA_DIR", tempfile.mkdtemp(prefix="qode-bench-"))
+
+import polars as pl  # noqa: E402
+import pyarrow.parquet as pq  # noqa: E402
+
+from app.services.processing.signals import SIGNAL_COLUMNS  # noqa: E402
+from app.services.storage import loader, writer  # noqa: E402
+
+JOBS, PER_JOB = 10, 100_000
+
+
+def synthetic_job(seed: int, end: datetime) -> pl.DataFrame:
+    rng = random.Random(seed)
+    # Scrapers return tweets in arbitrary order over the last two days
+    return writer.to_polars_rows(
+        {
+            "id": f"{seed}-{i}",
+            "username": f"user{rng.randint(0, 5000)}",
+            "timestamp": end - timedelta(seconds=rng.uniform(0, 2 * 86400)),
+            "content": "nifty breakout above resistance, buy the dip",
+            "like_count": rng.randint(0, 500),
+            "retweet_count": rng.randint(0, 50),
+            "reply_count": rng.randint(0, 20),
+            "quote_count": rng.randint(0, 5),
+            "mentions": [],
+            "hashtags": [rng.choice(["nifty50", "sensex", "banknifty"])],
+            "lang": "en",
+        }
+        for i in range(PER_JOB)
+    )
+
+
+def stats_pruned_bytes(root: Path, since, until, columns) -> int:
+    # What a reader pruning on row-group timestamp statistics has to fetch
+    total = 0
+    for path in root.glob("date=*/*.parquet"):
+        meta = pq.read_metadata(path)
+        for i in range(meta.num_row_groups):
+            rg = meta.row_group(i)
+            cols = {
+                rg.column(j).path_in_schema.split(".")[0]: rg.column(j)
+                for j in range(rg.num_columns)
+            }
+            st = cols["timestamp"].statistics
+            if st is not None and st.has_min_max:
+                if st.max < since or st.min > until:
+                    continue
+            total += sum(
+                rg.column(j).total_compressed_size
+                for j in range(rg.num_columns)
+                if rg.column(j).path_in_schema.split(".")[0] in columns
+            )
+    return total
+
+
+def main():
+    end = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    jobs = [synthetic_job(seed, end) for seed in range(JOBS)]
+
+    tuned = Path(tempfile.mkdtemp(prefix="tuned-"))
+    naive = Path(tempfile.mkdtemp(prefix="naive-"))
+    writer.PARQUET_PATH = loader.PARQUET_PATH = tuned
+    for seed, df in enumerate(jobs):
+        writer.write_parquet_partitioned(df, job_id=str(seed))
+        day = df.with_columns(
+            pl.col("timestamp").dt.date().cast(pl.String).alias("date")
+        )
+        for (d,), sub in day.partition_by("date", as_dict=True).items():
+            (naive / f"date={d}").mkdir(exist_ok=True)
+            sub.drop("date").write_parquet(
+                naive / f"date={d}" / f"part-{seed}.parquet", compression="zstd"
+            )
+
+    print(f"{JOBS * PER_JOB:,} tweets in {JOBS} jobs, signal columns only")
+    for hours in (1, 24):
+        since, until = end - timedelta(hours=hours), end
+        t0 = time.perf_counter()
+        rows = loader.scan_window(since, until, SIGNAL_COLUMNS).collect().height
+        elapsed = time.perf_counter() - t0
+        sorted_bytes = loader.planned_read_bytes(since, until, SIGNAL_COLUMNS)
+        naive_bytes = stats_pruned_bytes(naive, since, until, SIGNAL_COLUMNS)
+        print(
+            f"{hours:>2}h window: rows={rows:>8,}  sorted+indexed={sorted_bytes / 1e6:7.2f} MB"
+            f"  unsorted={naive_bytes / 1e6:7.2f} MB  scan={elapsed * 1000:6.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
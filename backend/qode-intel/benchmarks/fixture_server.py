@@ -0,0 +1,134 @@
+"""
+Local stand-in for x.com: serves benchmarks/fixtures plus a fake GraphQL
+SearchTimeline endpoint, so the scraper and the browser pool can be
+exercised offline (point X_BASE_URL at it).
+"""
+import json
+import threading
+import zlib
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES = Path(__file__).parent / "fixtures"
+CREATED_AT_FORMAT = "%a %b %d %H:%M:%S %z %Y"
+
+
+def _tweet_result(tag: str, i: int, created: datetime) -> dict:
+    tid = f"{zlib.crc32(tag.encode()) % 10**6}{i:08d}"
+    result = {
+        "__typename": "Tweet",
+        "rest_id": tid,
+        "core": {
+            "user_results": {"result": {"legacy": {"screen_name": f"user{i % 37}"}}}
+        },
+        "legacy": {
+            "id_str": tid,
+            "created_at": created.strftime(CREATED_AT_FORMAT),
+            "full_text": f"#{tag} nifty breakout {i} @desk{i % 5} https://t.co/x{i}",
+            "favorite_count": (i * 7) % 300,
+            "retweet_count": (i * 3) % 40,
+            "reply_count": i % 11,
+            "quote_count": i % 4,
+            "lang": "en",
+            "entities": {
+                "hashtags": [{"text": tag}],
+                "user_mentions": [{"screen_name": f"desk{i % 5}"}],
+            },
+        },
+    }
+    if i % 10 == 9:
+        # Some entries arrive wrapped for visibility-limited tweets
+        return {"__typename": "TweetWithVisibilityResults", "tweet": result}
+    return result
+
+
+def timeline_payload(tag: str, cursor: int, count: int, newest: datetime) -> dict:
+    """One SearchTimeline-shaped page of ``count`` tweets, newest first."""
+    entries = [
+        {
+            "entryId": f"tweet-{i}",
+            "content": {
+                "entryType": "TimelineTimelineItem",
+                "itemContent": {
+                    "itemType": "TimelineTweet",
+                    "tweet_results": {
+                        "result": _tweet_result(
+                            tag, i, newest - timedelta(seconds=37 * i)
+                        )
+                    },
+                },
+            },
+        }
+        for i in range(cursor, cursor + count)
+    ]
+    entries.append(
+        {
+            "entryId": f"cursor-bottom-{cursor + count}",
+            "content": {"cursorType": "Bottom", "value": str(cursor + count)},
+        }
+    )
+    return {
+        "data": {
+            "search_by_raw_query": {
+                "search_timeline": {
+                    "timeline": {
+                        "instructions": [
+                            {"type": "TimelineAddEntries", "entries": entries}
+                        ]
+                    }
+                }
+            }
+        }
+    }
+
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path.startswith("/i/api/graphql/"):
+            qs = parse_qs(url.query)
+            body = json.dumps(
+                timeline_payload(
+                    qs.get("tag", ["fixture"])[0],
+                    int(qs.get("cursor", ["0"])[0]),
+                    int(qs.get("count", ["20"])[0]),
+                    datetime.now(timezone.utc),
+                )
+            ).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        # /home, /login and /search all render the fixture timeline
+        if url.path in ("/home", "/login", "/search"):
+            self.path = "/search.html" + (f"?{url.query}" if url.query else "")
+        return super().do_GET()
+
+    def log_message(self, *args):
+        pass
+
+
+def serve_fixtures(port: int = 0) -> ThreadingHTTPServer:
+    """Start the fixture server in a daemon thread; returns the server."""
+    handler = partial(FixtureHandler, directory=str(FIXTURES))
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def base_url(server: ThreadingHTTPServer) -> str:
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
+
+
+if __name__ == "__main__":
+    # Regenerate the recorded payload used by tests and the replay benchmark
+    newest = datetime(2025, 8, 30, 12, 0, tzinfo=timezone.utc)
+    (FIXTURES / "search_timeline.json").write_text(
+        json.dumps(timeline_payload("nifty50", 0, 40, newest))
+    )
@@ -0,0 +1,108 @@
+"""
+/health latency while /process/tfidf builds over a large window, with the
+CPU process pool enabled versus inline (EXECUTOR_CPU_WORKERS=0).
+
+    python -m benchmarks.load_health_p99 [n_tweets]
+"""
+import asyncio
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+DATA_DIR = tempfile.mkdtemp(prefix="qode-load-")
+os.environ["DATA_DIR"] = DATA_DIR
+
+import polars as pl  # noqa: E402
+
+from app.services.storage.tfidf_store import TFIDF_PATH  # noqa: E402
+from app.services.storage.writer import to_polars_rows  # noqa: E402
+from app.services.storage.writer import write_parquet_partitioned  # noqa: E402
+from benchmarks.bench_signals import synthetic_tweets  # noqa: E402
+
+PORT = 8765
+BASE = f"http://127.0.0.1:{PORT}"
+
+
+def seed_window(n: int):
+    df = synthetic_tweets(n).with_columns(
+        pl.format("load-{}", pl.int_range(pl.len())).alias("id"),
+        pl.lit("loaduser").alias("username"),
+        pl.lit([], dtype=pl.List(pl.String)).alias("mentions"),
+        pl.lit(["nifty50"]).alias("hashtags"),
+        pl.lit("en").alias("lang"),
+    )
+    write_parquet_partitioned(to_polars_rows(df.to_dicts()), job_id="load")
+
+
+def start_server(cpu_workers: int) -> subprocess.Popen:
+    env = dict(os.environ, EXECUTOR_CPU_WORKERS=str(cpu_workers))
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(PORT)],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    for _ in range(300):
+        try:
+            httpx.get(f"{BASE}/health", timeout=1)
+            return proc
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("server did not start")
+
+
+async def hammer(client: httpx.AsyncClient, done: asyncio.Event, out: list):
+    while not done.is_set():
+        t0 = time.perf_counter()
+        await client.get("/health")
+        out.append(time.perf_counter() - t0)
+        await asyncio.sleep(0.01)
+
+
+async def measure() -> tuple:
+    latencies: list = []
+    done = asyncio.Event()
+    async with httpx.AsyncClient(base_url=BASE, timeout=600) as client:
+        # Warm the worker processes before timing, without touching TF-IDF
+        await client.get("/analyze/signal.png")
+        probes = [
+            asyncio.create_task(hammer(client, done, latencies)) for _ in range(4)
+        ]
+        t0 = time.perf_counter()
+        r = await client.post("/process/tfidf")
+        build = time.perf_counter() - t0
+        done.set()
+        await asyncio.gather(*probes)
+    r.raise_for_status()
+    q = statistics.quantiles(latencies, n=100)
+    return build, len(latencies), q[49] * 1e3, q[98] * 1e3, max(latencies) * 1e3
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    seed_window(n)
+    print(f"{n:,} tweets in {DATA_DIR}")
+    for label, workers in (("inline", 0), ("process pool", os.cpu_count() or 1)):
+        # Every run builds from scratch, not from the previous run's part cache
+        shutil.rmtree(TFIDF_PATH, ignore_errors=True)
+        proc = start_server(workers)
+        try:
+            build, count, p50, p99, worst = asyncio.run(measure())
+        finally:
+            proc.terminate()
+            proc.wait()
+        print(
+            f"{label:>12}: tfidf {build:6.1f}s  /health n={count:<5} "
+            f"p50 {p50:7.1f}ms  p99 {p99:7.1f}ms  max {worst:7.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Push fan-out under load: 500 idle SSE subscribers plus 50 active ones (half
+SSE, half WebSocket, a few of them deliberately slow) while signal events
+are published at a steady rate. Reports delivery latency of the keeping-up
+clients, what the slow ones dropped, and /health latency meanwhile. The
+server runs in-process (lifespan off) so the benchmark can publish directly.
+
+    python -m benchmarks.load_push [events_per_second] [seconds]
+"""
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("DATA_DIR", tempfile.mkdtemp(prefix="qode-load-"))
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+import websockets  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.services.broker import broker  # noqa: E402
+
+PORT = 8766
+BASE = f"http://127.0.0.1:{PORT}"
+IDLE, ACTIVE, SLOW = 500, 50, 5
+# About a day of 15m signal buckets per event, so slow readers outgrow their
+# socket buffers and the server-side mailboxes have to drop
+PAD = "x" * 16_000
+
+
+async def idle_sse(client: httpx.AsyncClient, i: int, ready: list, done):
+    async with client.stream("GET", "/push/events", params={"topics": f"job:{i}"}):
+        ready.append(i)
+        await done.wait()
+
+
+async def _record(data: str, stats: dict, slow: bool):
+    payload = json.loads(data)
+    if "t" in payload:
+        stats["latency"].append(time.perf_counter() - payload["t"])
+    elif "count" in payload:
+        stats["dropped"] += payload["count"]
+    if slow:
+        await asyncio.sleep(0.5)
+
+
+async def active_sse(client, stats: dict, slow: bool, ready: list, done):
+    async with client.stream("GET", "/push/events", params={"topics": "signal"}) as r:
+        ready.append(1)
+        async for line in r.aiter_lines():
+            if line.startswith("data: "):
+                await _record(line[6:], stats, slow)
+            if done.is_set():
+                return
+
+
+async def active_ws(stats: dict, slow: bool, ready: list, done):
+    async with websockets.connect(f"ws://127.0.0.1:{PORT}/push/ws?topics=signal") as ws:
+        ready.append(1)
+        async for message in ws:
+            msg = json.loads(message)
+            if "data" in msg:
+                await _record(json.dumps(msg["data"]), stats, slow)
+            if done.is_set():
+                return
+
+
+async def health(client, out: list, done):
+    while not done.is_set():
+        t0 = time.perf_counter()
+        await client.get("/health")
+        out.append(time.perf_counter() - t0)
+        await asyncio.sleep(0.05)
+
+
+async def main(rate: float, seconds: float):
+    server = uvicorn.Server(
+        uvicorn.Config(
+            app, port=PORT, lifespan="off", log_level="warning", backlog=2048
+        )
+    )
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    done = asyncio.Event()
+    ready: list = []
+    fast = [{"latency": [], "dropped": 0} for _ in range(ACTIVE - SLOW)]
+    slow = [{"latency": [], "dropped": 0} for _ in range(SLOW)]
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(base_url=BASE, timeout=None, limits=limits) as c:
+        tasks = [asyncio.create_task(idle_sse(c, i, ready, done)) for i in range(IDLE)]
+        for i, stats in enumerate(fast + slow):
+            is_slow = i >= len(fast)
+            if i % 2:
+                tasks.append(
+                    asyncio.create_task(active_ws(stats, is_slow, ready, done))
+                )
+            else:
+                tasks.append(
+                    asyncio.create_task(active_sse(c, stats, is_slow, ready, done))
+                )
+        while len(ready) < IDLE + ACTIVE:
+            await asyncio.sleep(0.1)
+        print(f"subscribers: {broker.metrics()['subscribers']}")
+
+        probes: list = []
+        prober = asyncio.create_task(health(c, probes, done))
+        sent, t_end = 0, time.perf_counter() + seconds
+        while time.perf_counter() < t_end:
+            broker.publish(
+                "signal", "signal", {"t": time.perf_counter(), "n": sent, "pad": PAD}
+            )
+            sent += 1
+            await asyncio.sleep(1 / rate)
+        await asyncio.sleep(1)
+        metrics = broker.metrics()
+        done.set()
+        broker.publish("signal", "signal", {})  # wake readers to notice done
+        await prober
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    server.should_exit = True
+    await serving
+
+    lat = sorted(x for s in fast for x in s["latency"])
+    q = statistics.quantiles(lat, n=100)
+    h = statistics.quantiles(probes, n=100)
+    print(f"published {sent} events at {rate:.0f}/s to {ACTIVE} active subscribers")
+    print(
+        f"  fast clients: delivered {len(lat)}/{sent * len(fast)}  "
+        f"p50 {q[49] * 1e3:6.1f}ms  p99 {q[98] * 1e3:6.1f}ms"
+    )
+    print(
+        f"  slow clients: delivered {sum(len(s['latency']) for s in slow)}  "
+        f"drop notices {sum(s['dropped'] for s in slow)} (behind buffered events)"
+    )
+    print(
+        f"  broker: {metrics['delivered']} handed to mailboxes, "
+        f"{metrics['dropped']} dropped from full ones"
+    )
+    print(f"  /health: p50 {h[49] * 1e3:6.1f}ms  p99 {h[98] * 1e3:6.1f}ms")
+
+
+if __name__ == "__main__":
+    rate = float(sys.argv[1]) if len(sys.argv) > 1 else 50
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+    asyncio.run(main(rate, seconds))
@@ -0,0 +1,9 @@
+import pytest
+
+from helpers import isolate_data_dir
+
+
+@pytest.fixture(autouse=True)
+def _isolated_data_version(tmp_path, monkeypatch):
+    # Writes bump the data version; keep that out of the real DATA_DIR
+    isolate_data_dir(tmp_path, monkeypatch.setattr)
@@ -0,0 +1,44 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import polars as pl
+
+from app.services.processing.signals import BEAR_WORDS, BULL_WORDS
+from app.services.storage import data_version, paths
+
+
+def isolate_data_dir(path, setattr=setattr):
+    """
+    Point DATA_PATH and the data version file at ``path``. The autouse
+    fixture calls it with monkeypatch.setattr; spawned processes, which
+    don't inherit that, call it themselves.
+    """
+    setattr(paths, "DATA_PATH", path)
+    setattr(data_version, "DATA_PATH", path)
+    setattr(data_version, "VERSION_FILE", path / "data_version")
+
+
+def synthetic_tweets(n: int, seed: int = 0) -> pl.DataFrame:
+    """``n`` tweets over the last 24 h, from a small market vocabulary."""
+    rng = random.Random(seed)
+    vocab = sorted(BULL_WORDS | BEAR_WORDS) + [
+        "market",
+        "today",
+        "support",
+        "levels",
+        "watch",
+        "#nifty50",
+        "@trader",
+    ]
+    texts = [" ".join(rng.choices(vocab, k=12)) for _ in range(1000)]
+    start = datetime.now(timezone.utc) - timedelta(hours=24)
+    return pl.DataFrame(
+        {
+            "timestamp": [start + timedelta(seconds=i * 86400 / n) for i in range(n)],
+            "content": [texts[i % len(texts)] for i in range(n)],
+            "like_count": [rng.randint(0, 500) for _ in range(n)],
+            "retweet_count": [rng.randint(0, 50) for _ in range(n)],
+            "reply_count": [rng.randint(0, 20) for _ in range(n)],
+            "quote_count": [rng.randint(0, 5) for _ in range(n)],
+        }
+    )
@@ -0,0 +1,134 @@
+import asyncio
+
+from app.services.scraper.browser_pool import BrowserPool
+
+
+class FakePage:
+    def __init__(self):
+        self.main_frame = object()
+        self.closed = False
+        self._handlers = []
+
+    def on(self, event, handler):
+        self._handlers.append(handler)
+
+    async def goto(self, url, **kwargs):
+        for handler in self._handlers:
+            handler(self.main_frame)
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self):
+        self.pages = []
+        self.closed = False
+
+    async def new_page(self):
+        self.pages.append(FakePage())
+        return self.pages[-1]
+
+    async def close(self):
+        self.closed = True
+        for p in self.pages:
+            p.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **kwargs):
+        return FakeContext()
+
+    async def close(self):
+        self.connected = False
+
+
+class FakePlaywright:
+    def __init__(self):
+        self.firefox = self
+
+    async def start(self):
+        return self
+
+    async def launch(self, **kwargs):
+        return FakeBrowser()
+
+    async def stop(self):
+        pass
+
+
+def _pool(**kwargs):
+    return BrowserPool("/nonexistent", playwright_factory=FakePlaywright, **kwargs)
+
+
+def test_pages_are_reused_bounded_and_recycled():
+    async def run():
+        pool = _pool(max_pages=2, page_max_navigations=2)
+        await pool.start()
+        async with pool.page(authenticated=False) as first:
+            await first.goto("/a")
+        async with pool.page(authenticated=False) as again:
+            assert again is first
+            await again.goto("/b")
+        # Two navigations: the page is retired instead of going back idle
+        assert first.is_closed()
+
+        peak = 0
+
+        async def lease():
+            nonlocal peak
+            async with pool.page(authenticated=False):
+                peak = max(peak, (await pool.health())["leased_pages"])
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*[lease() for _ in range(6)])
+        assert peak == 2
+        await pool.stop()
+
+    asyncio.run(run())
+
+
+def test_disconnected_browser_is_relaunched():
+    async def run():
+        pool = _pool()
+        await pool.start()
+        pool._browser.connected = False
+        async with pool.page(authenticated=False):
+            pass
+        assert pool.launches == 2
+        assert (await pool.health())["connected"]
+
+    asyncio.run(run())
+
+
+def test_new_login_retires_the_context_after_its_leased_pages(tmp_path):
+    state = tmp_path / "state.json"
+    state.write_text("{}")
+
+    async def run():
+        pool = BrowserPool(str(state), playwright_factory=FakePlaywright)
+        await pool.start()
+        async with pool.page() as idle:
+            pass
+        async with pool.page() as busy:
+            assert busy is idle
+            old = pool._contexts[True]
+            await pool.invalidate_auth()
+            # A scrape still scrolling on its page is not cut off
+            await busy.goto("/next")
+            assert not busy.is_closed() and not old.closed
+            async with pool.page() as fresh:
+                assert pool._contexts[True] is not old
+        assert busy.is_closed() and old.closed
+        assert not fresh.is_closed()
+
+    asyncio.run(run())
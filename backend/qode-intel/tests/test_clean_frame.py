@@ -0,0 +1,83 @@
+import random
+from datetime import datetime, timedelta, timezone
+from app.models.tweet import Tweet
+from app.services.processing.clean import clean_frame, clean_tweets, tweets_to_frame
+from app.services.processing.dedupe import dedupe_frame, dedupe_tweets
+from app.services.processing.pipeline import clean_and_dedupe, clean_and_dedupe_tweets
+
+PIECES = [
+    "Buy",
+    "$NIFTY50",
+    "#Nifty50",
+    "#निफ्टी",
+    "#bank_nifty2",
+    "@Trader_One",
+    "@abcdefghijklmnopqrst",
+    "email@host",
+    "a#b",
+    "https://t.co/x?y=1",
+    "www.example.com/p",
+    "Café",
+    " ",
+    " ",
+    "\u001c",
+    "\n",
+    "\t",
+    "  ",
+    "ﬁ",
+    "²",
+    "ΣΑΣ",
+]
+
+
+def reference_tweets(n: int = 500):
+    rng = random.Random(7)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    tweets = []
+    for i in range(n):
+        content = "".join(
+            rng.choice(PIECES) + rng.choice(["", " ", "  "]) for _ in range(8)
+        )
+        tweets.append(
+            Tweet(
+                id=str(rng.randint(0, n // 2)),
+                username=f"u{rng.randint(0, 3)}",
+                timestamp=start + timedelta(minutes=rng.randint(0, 5)),
+                content=content,
+                like_count=i,
+                lang=rng.choice(["en", None]),
+            )
+        )
+    # Same tweet scraped twice, and a reused id with different content
+    tweets.append(tweets[0].model_copy())
+    tweets.append(tweets[1].model_copy(update={"content": "different"}))
+    return tweets
+
+
+def as_rows(tweets):
+    return [
+        {
+            **t.model_dump(),
+            "mentions": sorted(t.mentions),
+            "hashtags": sorted(t.hashtags),
+        }
+        for t in tweets
+    ]
+
+
+def test_clean_frame_matches_clean_tweets():
+    tweets = reference_tweets()
+    expected = as_rows(clean_tweets(tweets))
+    assert clean_frame(tweets_to_frame(tweets)).to_dicts() == expected
+
+
+def test_clean_and_dedupe_matches_model_path():
+    tweets = reference_tweets()
+    expected = as_rows(dedupe_tweets(clean_tweets(tweets)))
+    assert clean_and_dedupe(tweets_to_frame(tweets)).to_dicts() == expected
+    assert clean_and_dedupe_tweets(tweets).to_dicts() == expected
+    # Without reused ids the vectorised path is taken
+    unique_ids = [t.model_copy(update={"id": str(i)}) for i, t in enumerate(tweets)]
+    expected = as_rows(dedupe_tweets(clean_tweets(unique_ids)))
+    out = dedupe_frame(clean_frame(tweets_to_frame(unique_ids)))
+    assert out.to_dicts() == expected
@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta, timezone
+import polars as pl
+from app.services.storage.dedup_index import DedupIndex
+
+NOW = datetime(2025, 1, 2, tzinfo=timezone.utc)
+
+
+def batch(rows):
+    return pl.DataFrame(
+        [
+            {"id": i, "content": c, "timestamp": NOW - timedelta(hours=h)}
+            for i, c, h in rows
+        ]
+    )
+
+
+def test_cross_job_exact_and_near_duplicates(tmp_path):
+    index = DedupIndex(tmp_path / "dedup.npz")
+    first = batch(
+        [
+            ("1", "nifty breaks out above 24000 resistance today buy the dip", 1),
+            ("2", "bank nifty weak ahead of the rbi policy decision tomorrow", 1),
+        ]
+    )
+    assert index.duplicates(first).tolist() == [False, False]
+    index.add(first, now=NOW)
+
+    # A reloaded index sees what earlier jobs stored
+    index = DedupIndex(tmp_path / "dedup.npz")
+    second = batch(
+        [
+            ("1", "edited text, same id", 0),
+            (
+                "3",
+                "RT @trader: Nifty breaks out above 24000 resistance today, buy the dip",
+                0,
+            ),
+            ("4", "sensex closes flat as it stocks drag and metals rally late", 0),
+            ("5", "Sensex closes flat as IT stocks drag and metals rally late!", 0),
+            ("6", "short one", 0),
+            ("7", "short one", 0),
+        ]
+    )
+    assert index.duplicates(second).tolist() == [True, True, False, True, False, False]
+
+
+def test_entries_past_horizon_are_evicted(tmp_path):
+    index = DedupIndex(tmp_path / "dedup.npz", horizon=timedelta(hours=24))
+    index.add(batch([("old", "an old tweet about the nifty fifty index", 30)]), now=NOW)
+    index.add(
+        batch([("new", "a new tweet about the sensex and banks today", 1)]), now=NOW
+    )
+    assert len(index) == 1
+    again = batch([("old", "an old tweet about the nifty fifty index", 30)])
+    assert index.duplicates(again).tolist() == [False]
+
+
+def test_filter_and_add_is_shared_through_the_file(tmp_path):
+    # Two indexes on one file stand in for two uvicorn workers
+    a = DedupIndex(tmp_path / "dedup.npz")
+    b = DedupIndex(tmp_path / "dedup.npz")
+    tweet = batch([("1", "nifty breaks out above 24000 resistance today", 0)])
+    near = batch([("2", "Nifty breaks out above 24000 resistance today!", 0)])
+    assert a.filter_and_add(tweet, now=NOW).height == 1
+    assert b.filter_and_add(near, now=NOW).is_empty()
+    assert a.filter_and_add(tweet, now=NOW).is_empty()
+
+    a.forget(tweet)  # its part failed to write
+    assert b.filter_and_add(near, now=NOW).height == 1
+    assert len(DedupIndex(tmp_path / "dedup.npz")) == 1
@@ -0,0 +1,89 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from app.services.scraper.dom_capture import (
+    COLLECT_NEW_CARDS_JS,
+    ScrapeStats,
+    card_to_tweet,
+    collect_new_cards,
+)
+
+NOW = datetime(2025, 8, 30, 12, tzinfo=timezone.utc)
+
+
+def _card(i, minutes=0, **extra):
+    return {
+        "content": f"#BankNifty breakout {i} cc @Desk",
+        "link": f"/trader{i}/status/{100 + i}?s=20",
+        "user": f"/trader{i}",
+        "time": (NOW - timedelta(minutes=minutes)).isoformat().replace("+00:00", "Z"),
+        **extra,
+    }
+
+
+def test_card_to_tweet_fields_counts_and_entities():
+    tweet = card_to_tweet(
+        _card(
+            1,
+            counts={
+                "reply": "3 Replies. Reply",
+                "retweet": "",
+                "like": "1,234 Likes. Liked",
+            },
+        ),
+        "#Nifty50",
+    )
+    assert (tweet.id, tweet.username, tweet.timestamp) == ("101", "trader1", NOW)
+    assert (tweet.reply_count, tweet.retweet_count, tweet.like_count) == (3, 0, 1234)
+    assert tweet.mentions == ["desk"]
+    assert sorted(tweet.hashtags) == ["banknifty", "nifty50"]
+    # Older serialisations without counts still parse
+    assert card_to_tweet(_card(2), "#Nifty50").like_count == 0
+    assert card_to_tweet(_card(3, time=None), "#Nifty50") is None
+
+
+class FakePage:
+    """Replays one collect result per evaluate call."""
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.calls = []
+
+    async def evaluate(self, script, arg):
+        self.calls.append((script, arg))
+        return self.results.pop(0)
+
+
+def test_collect_new_cards_counts_and_filters():
+    page = FakePage(
+        [
+            {
+                "cards": [
+                    _card(1),
+                    _card(2, minutes=60 * 30),  # outside the window
+                    _card(3, time=None),
+                    {"content": "no link", "user": "/x", "time": "2025-08-30"},
+                ],
+                "skipped": 2,
+                "height": 4000,
+            },
+            {"cards": [_card(1), _card(4)], "skipped": 0, "height": 6000},
+        ]
+    )
+    stats = ScrapeStats("#nifty50")
+    seen: set = set()
+    since, until = NOW - timedelta(hours=24), NOW
+
+    async def run():
+        first = await collect_new_cards(
+            page, "#nifty50", since, until, seen, stats, 800
+        )
+        second = await collect_new_cards(page, "#nifty50", since, until, seen, stats)
+        return first, second
+
+    (first, h1), (second, h2) = asyncio.run(run())
+    assert [t.id for t in first] == ["101"] and h1 == 4000
+    assert [t.id for t in second] == ["104"] and h2 == 6000
+    assert page.calls == [(COLLECT_NEW_CARDS_JS, 800), (COLLECT_NEW_CARDS_JS, 0)]
+    assert stats.ipc_calls == 2
+    assert (stats.cards, stats.undated, stats.duplicates_skipped) == (4, 1, 3)
@@ -0,0 +1,44 @@
+import numpy as np
+
+from app.services.processing.downsample import lttb_indices, minmax_indices
+
+
+def reference_lttb(x, y, n_out):
+    # Straight transcription of Steinarsson's algorithm
+    n = len(x)
+    every = (n - 2) / (n_out - 2)
+    out, a = [0], 0
+    for i in range(n_out - 2):
+        s, e = int(i * every) + 1, int((i + 1) * every) + 1
+        ns, ne = e, min(int((i + 2) * every) + 1, n)
+        if i == n_out - 3:
+            ns, ne = n - 1, n
+        mx, my = np.mean(x[ns:ne]), np.mean(y[ns:ne])
+        best, area_max = s, -1.0
+        for j in range(s, e):
+            area = abs((x[a] - mx) * (y[j] - y[a]) - (x[a] - x[j]) * (my - y[a]))
+            if area > area_max:
+                best, area_max = j, area
+        out.append(best)
+        a = best
+    return np.array(out + [n - 1])
+
+
+def test_lttb_matches_reference():
+    rng = np.random.default_rng(1)
+    for n, n_out in ((1000, 100), (997, 37), (50, 10)):
+        x = np.arange(n, dtype=float)
+        y = np.cumsum(rng.normal(size=n))
+        np.testing.assert_array_equal(
+            lttb_indices(x, y, n_out), reference_lttb(x, y, n_out)
+        )
+
+
+def test_minmax_keeps_spikes_and_order():
+    rng = np.random.default_rng(2)
+    y = rng.normal(size=10_000)
+    y[1234], y[8765] = 50.0, -50.0
+    idx = minmax_indices(y, 200)
+    assert len(idx) <= 200
+    assert np.all(np.diff(idx) > 0)
+    assert {1234, 8765} <= set(idx.tolist())
@@ -0,0 +1,42 @@
+import asyncio
+import os
+
+import pytest
+
+from app.services import executors
+
+
+def _pid(_=None):
+    return os.getpid()
+
+
+def _boom(message):
+    raise ValueError(message)
+
+
+def test_run_cpu_inline_without_pool():
+    executors.stop_executors()
+    assert asyncio.run(executors.run_cpu(_pid)) == os.getpid()
+    with pytest.raises(ValueError, match="inline"):
+        asyncio.run(executors.run_cpu(_boom, "inline"))
+
+
+def test_process_pool_round_trip_errors_and_shutdown():
+    executors.start_executors(cpu_workers=1, io_workers=1)
+    try:
+
+        async def run():
+            worker = await executors.run_cpu(_pid)
+            with pytest.raises(ValueError, match="from the pool"):
+                await executors.run_cpu(_boom, "from the pool")
+            io = await executors.run_io(_pid)
+            return worker, io
+
+        worker, io = asyncio.run(run())
+        assert worker != os.getpid()  # ran in the spawned process
+        assert io == os.getpid()
+    finally:
+        executors.stop_executors()
+    assert executors._cpu is None and executors._io is None
+    # After shutdown everything runs inline again
+    assert asyncio.run(executors.run_cpu(_pid)) == os.getpid()
@@ -0,0 +1,106 @@
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.services.storage import export, loader, writer
+from helpers import synthetic_tweets
+
+START = datetime(2025, 8, 30, 20, tzinfo=timezone.utc)
+
+
+def test_export_formats_stream_the_window(tmp_path, monkeypatch):
+    monkeypatch.setattr(writer, "PARQUET_PATH", tmp_path)
+    monkeypatch.setattr(loader, "PARQUET_PATH", tmp_path)
+    df = synthetic_tweets(500).with_columns(
+        pl.format("t{}", pl.int_range(pl.len())).alias("id"),
+        (pl.lit(START) + pl.duration(minutes=7 * pl.int_range(pl.len()))).alias(
+            "timestamp"
+        ),
+        pl.Series("hashtags", [["nifty"] if i % 2 else [] for i in range(500)]),
+    )
+    writer.write_parquet_partitioned(df, job_id="a")
+    since, until = START + timedelta(hours=2), START + timedelta(hours=30)
+    columns = ["id", "timestamp", "like_count"]
+    expected = loader.scan_window(since, until, columns).collect().sort("id")
+
+    batches = list(export.window_batches(since, until, columns, batch_rows=50))
+    assert len(batches) > 1 and max(b.num_rows for b in batches) <= 50
+    schema = export.export_schema(columns)
+
+    def encoded(fmt):
+        chunks = export.encode_batches(iter(batches), schema, fmt)
+        return b"".join(chunks)
+
+    arrow = pa.ipc.open_stream(encoded("arrow")).read_all()
+    parquet = pq.read_table(io.BytesIO(encoded("parquet")))
+    for table in (arrow, parquet):
+        assert pl.from_arrow(table).sort("id").equals(expected)
+    rows = [json.loads(line) for line in encoded("ndjson").splitlines()]
+    assert sorted(r["id"] for r in rows) == expected["id"].to_list()
+
+    tagged = export.window_batches(since, until, ["id"], {"hashtag": "#Nifty"})
+    got = pl.from_arrow(
+        pa.Table.from_batches(list(tagged), export.export_schema(["id"]))
+    )
+    in_window = df.filter(pl.col("timestamp").is_between(since, until))
+    assert sorted(got["id"]) == sorted(
+        in_window.filter(pl.col("hashtags").list.contains("nifty"))["id"]
+    )
+    # An empty window is still a well-formed stream
+    empty = export.window_batches(START - timedelta(days=9), START - timedelta(days=8))
+    assert (
+        pa.ipc.open_stream(
+            b"".join(export.encode_batches(empty, export.export_schema(), "arrow"))
+        )
+        .read_all()
+        .num_rows
+        == 0
+    )
+
+
+def test_tag_filters_read_only_the_indexed_row_groups(tmp_path, monkeypatch):
+    monkeypatch.setattr(writer, "PARQUET_PATH", tmp_path)
+    monkeypatch.setattr(loader, "PARQUET_PATH", tmp_path)
+    monkeypatch.setattr(writer, "PARQUET_MIN_ROW_GROUP_SIZE", 50)
+    n = 200  # one day part of four 50-row groups
+    df = synthetic_tweets(n).with_columns(
+        pl.format("t{}", pl.int_range(pl.len())).alias("id"),
+        (pl.lit(START) + pl.duration(minutes=pl.int_range(pl.len()))).alias(
+            "timestamp"
+        ),
+        # Only two stretches of the part carry the tag
+        pl.Series(
+            "hashtags", [["rare"] if 60 <= i < 70 or i >= 190 else [] for i in range(n)]
+        ),
+    )
+    writer.write_parquet_partitioned(df, job_id="a")
+    since, until = START, START + timedelta(minutes=n)
+    expected = sorted(df.filter(pl.col("hashtags").list.contains("rare"))["id"])
+
+    read = []
+    iter_batches = pq.ParquetFile.iter_batches
+
+    def spy(self, *args, row_groups=None, **kwargs):
+        read.append(row_groups)
+        return iter_batches(self, *args, row_groups=row_groups, **kwargs)
+
+    monkeypatch.setattr(pq.ParquetFile, "iter_batches", spy)
+
+    def export_ids():
+        read.clear()
+        batches = export.window_batches(
+            since, until, ["id"], {"hashtag": "rare"}, batch_rows=8
+        )
+        return sorted(i for b in batches for i in b.column("id").to_pylist())
+
+    assert export_ids() == expected
+    assert read == [[1], [3]]  # the groups holding rows 60-69 and 190-199
+    # Without the sidecar the tag column is scanned instead
+    for tags in tmp_path.glob("date=*/*.tags.npz"):
+        tags.unlink()
+    assert export_ids() == expected
+    assert len(read) == 1 and read[0] != [1]
@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+
+from app.services.jobs.ingest import ingest_stream
+
+
+def test_micro_batches_flush_on_size_timer_and_end():
+    async def stream():
+        yield list(range(3))
+        yield list(range(3, 7))  # crosses the size threshold
+        await asyncio.sleep(0.3)  # the timer flushes the remainder meanwhile
+        yield [7]
+
+    commits = []
+
+    async def commit(chunk):
+        commits.append(chunk)
+
+    n = asyncio.run(ingest_stream(stream(), commit, batch_tweets=5, flush_seconds=0.1))
+    assert commits == [[0, 1, 2, 3, 4], [5, 6], [7]]
+    assert n == 3
+
+
+def test_failed_commit_closes_the_stream():
+    closed = []
+
+    async def stream():
+        try:
+            while True:
+                yield [1, 2]
+        finally:
+            closed.append(True)
+
+    async def commit(chunk):
+        raise RuntimeError("disk full")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(ingest_stream(stream(), commit, batch_tweets=2))
+    assert closed == [True]
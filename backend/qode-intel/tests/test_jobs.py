@@ -0,0 +1,79 @@
+import asyncio
+import time
+
+from app.services.jobs.store import JobStore
+from app.services.jobs.worker import JobWorkerPool
+
+
+def test_queue_survives_restart_with_priority_dedup_and_retry(tmp_path):
+    db = str(tmp_path / "jobs.sqlite3")
+    store = JobStore(db, max_running=1)
+    low = store.enqueue(["#Nifty50", "#sensex"], 100)
+    high = store.enqueue(["#banknifty"], 100, priority=5)
+    dup = store.enqueue(["#nifty50"], 100)
+    assert dup["deduplicated"] and dup["id"] == low["id"]
+
+    store = JobStore(db, max_running=1)  # a restart or another worker
+    job = store.claim("w1")
+    assert job["id"] == high["id"]
+    assert store.claim("w2") is None  # global concurrency cap
+
+    assert store.fail(job["id"], "boom") == "queued"
+    assert store.get(job["id"])["run_after"] > time.time()
+    assert store.claim("w2")["id"] == low["id"]
+
+    store.update_progress(low["id"], stage="scraping", raw_count=10)
+    store.complete(low["id"], {"unique_count": 7})
+    done = store.get(low["id"])
+    assert done["status"] == "done" and done["progress"]["raw_count"] == 10
+    # Hashtags are released once their job is finished
+    assert not store.enqueue(["#nifty50"], 100)["deduplicated"]
+
+
+def test_expired_lease_is_requeued(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    job = store.enqueue(["#sensex"], 100)
+    store.claim("dead-worker", lease=-1)
+    assert store.requeue_expired() == 1
+    assert store.claim("w")["id"] == job["id"]
+
+
+def test_released_job_keeps_its_attempt_but_counts_the_run(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    job = store.enqueue(["#sensex"], 100)
+    first = store.claim("w1")
+    store.release(job["id"], "w1")
+    second = store.claim("w2")
+    assert first["attempts"] == second["attempts"] == 1
+    assert (first["runs"], second["runs"]) == (1, 2)
+
+
+def test_worker_pool_runs_and_cancels(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+
+    async def handler(job, report):
+        await report(stage="working")
+        if "#slow" in job["payload"]["hashtags"]:
+            await asyncio.sleep(30)
+        return {"ok": True}
+
+    async def run():
+        pool = JobWorkerPool(
+            store, handler, concurrency=2, poll_interval=0.05, lease=0.3
+        )
+        await pool.start()
+        fast = store.enqueue(["#fast"], 100)
+        slow = store.enqueue(["#slow"], 100)
+        pool.wake()
+        await asyncio.sleep(0.3)
+        store.cancel(slow["id"])
+        for _ in range(50):
+            if store.get(slow["id"])["status"] == "cancelled":
+                break
+            await asyncio.sleep(0.05)
+        await pool.stop()
+        return store.get(fast["id"]), store.get(slow["id"])
+
+    fast, slow = asyncio.run(run())
+    assert fast["status"] == "done" and fast["result"] == {"ok": True}
+    assert slow["status"] == "cancelled"
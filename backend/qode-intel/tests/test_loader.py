@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta, timezone
+
+import polars as pl
+
+from app.services.storage import loader, writer
+from app.services.storage.part_index import read_part_index
+from app.services.storage.schema import SCHEMA_VERSION, TWEET_SCHEMA, schema_version
+
+
+def _rows(start, n, lang=None):
+    return [
+        {
+            "id": f"{start.timestamp()}-{i}",
+            "username": "u",
+            "timestamp": start + timedelta(hours=i),
+            "content": f"tweet {i}",
+            "like_count": i,
+            "retweet_count": 0,
+            "reply_count": 0,
+            "quote_count": 0,
+            "mentions": [],
+            "hashtags": [],
+            "lang": lang,
+        }
+        for i in range(n)
+    ]
+
+
+def test_scan_window_filters_and_projects(tmp_path, monkeypatch):
+    monkeypatch.setattr(writer, "PARQUET_PATH", tmp_path)
+    monkeypatch.setattr(loader, "PARQUET_PATH", tmp_path)
+    start = datetime(2025, 8, 30, 12, tzinfo=timezone.utc)
+    writer.write_parquet_partitioned(writer.to_polars_rows(_rows(start, 30)), "a")
+    writer.write_parquet_partitioned(
+        writer.to_polars_rows(_rows(start + timedelta(minutes=30), 30, "en")), "b"
+    )
+
+    since, until = start + timedelta(hours=6), start + timedelta(hours=30)
+    lf = loader.scan_window(since, until, columns=["timestamp", "like_count"])
+    assert isinstance(lf, pl.LazyFrame)
+    df = lf.collect(streaming=True)
+    assert df.columns == ["timestamp", "like_count"]
+    assert df.height == 2 * 24
+    assert df["timestamp"].is_between(since, until).all()
+
+
+def test_scan_window_without_partitions_is_typed(tmp_path, monkeypatch):
+    monkeypatch.setattr(loader, "PARQUET_PATH", tmp_path)
+    now = datetime.now(timezone.utc)
+    df = loader.scan_window(now, now, columns=["content"]).collect()
+    assert df.is_empty() and df.schema == {"content": pl.String}
+
+
+def test_sidecar_index_prunes_parts_outside_window(tmp_path, monkeypatch):
+    monkeypatch.setattr(writer, "PARQUET_PATH", tmp_path)
+    monkeypatch.setattr(loader, "PARQUET_PATH", tmp_path)
+    start = datetime(2025, 8, 30, 0, tzinfo=timezone.utc)
+    writer.write_parquet_partitioned(writer.to_polars_rows(_rows(start, 6)), "early")
+    late = start + timedelta(hours=12)
+    writer.write_parquet_partitioned(writer.to_polars_rows(_rows(late, 6)), "late")
+
+    files = loader.partition_files(late, late + timedelta(hours=2))
+    assert [f.name for f in files] == ["part-late.parquet"]
+    stored = pl.read_parquet(files[0])
+    assert stored["timestamp"].is_sorted()
+    assert loader.planned_read_bytes(late, late, ["content"]) > 0
+
+
+def test_legacy_parts_are_upgraded_on_scan(tmp_path, monkeypatch):
+    monkeypatch.setattr(writer, "PARQUET_PATH", tmp_path)
+    monkeypatch.setattr(loader, "PARQUET_PATH", tmp_path)
+    start = datetime(2025, 8, 30, 0, tzinfo=timezone.utc)
+    rows = _rows(start, 6)
+    # Empty lists and an all-null lang still come out typed
+    df = writer.to_polars_rows(rows)
+    assert df.schema == TWEET_SCHEMA
+    writer.write_parquet_partitioned(df, "current")
+    stored = next(tmp_path.glob("date=*/part-current.parquet"))
+    assert schema_version(stored) == SCHEMA_VERSION
+    assert read_part_index(stored)["schema_version"] == SCHEMA_VERSION
+
+    # A v1 part: dtypes inferred from dicts, no reply_count, no version
+    legacy = pl.DataFrame([{**r, "id": f"old-{r['id']}"} for r in rows])
+    legacy.drop("reply_count").write_parquet(stored.with_name("part-old.parquet"))
+    assert legacy.schema["lang"] == pl.Null
+
+    footers = []
+    monkeypatch.setattr(
+        loader, "schema_version", lambda p: footers.append(p.name) or schema_version(p)
+    )
+    out = loader.scan_window(start, start + timedelta(hours=6)).collect()
+    assert out.schema == TWEET_SCHEMA and out.height == 12
+    # Indexed parts take their version from the sidecar
+    assert footers == ["part-old.parquet"]
+    assert (
+        out.filter(pl.col("id").str.starts_with("old"))["reply_count"].is_null().all()
+    )
@@ -0,0 +1,62 @@
+import threading
+from datetime import datetime, timezone
+
+import polars as pl
+
+from app.services.storage import compaction, writer
+from app.services.storage.part_index import live_parts
+from app.services.storage.schema import TWEET_SCHEMA
+from helpers import synthetic_tweets
+
+
+def test_jobs_append_parts_and_compaction_keeps_rows(tmp_path, monkeypatch):
+    monkeypatch.setattr(writer, "PARQUET_PATH", tmp_path)
+    df = synthetic_tweets(600)
+    for i, batch in enumerate((df[:200], df[200:400], df[400:])):
+        writer.write_parquet_partitioned(batch, job_id=f"job{i}")
+
+    def stored():
+        return pl.concat(
+            [pl.read_parquet(p) for d in tmp_path.glob("date=*") for p in live_parts(d)]
+        )
+
+    assert stored().height == df.height
+    for day_dir in tmp_path.glob("date=*"):
+        compaction.compact_partition(day_dir, min_parts=2, target_rows=10_000)
+        assert len(live_parts(day_dir)) == 1
+    # Parts are written as the full TWEET_SCHEMA, missing columns as nulls
+    assert stored().schema == TWEET_SCHEMA
+    assert stored().select(df.columns).sort("timestamp").equals(df.sort("timestamp"))
+
+
+def test_compaction_keeps_listed_parts_readable_and_runs_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(writer, "PARQUET_PATH", tmp_path)
+    noon = datetime(2025, 8, 30, 12, tzinfo=timezone.utc)
+    df = synthetic_tweets(400).with_columns(pl.lit(noon).alias("timestamp"))
+    for i in range(4):
+        writer.write_parquet_partitioned(df[i * 100 : (i + 1) * 100], job_id=f"j{i}")
+    (day_dir,) = tmp_path.glob("date=*")
+    # A scan planned before the compaction, collected after it
+    pending = pl.scan_parquet(live_parts(day_dir))
+
+    # Two workers compacting the same day at once merge each part once
+    workers = [
+        threading.Thread(
+            target=compaction.compact_partition,
+            args=(day_dir,),
+            kwargs={"min_parts": 2, "target_rows": 10_000},
+        )
+        for _ in range(2)
+    ]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    (merged,) = live_parts(day_dir)
+    assert pl.read_parquet(merged).height == 400
+    assert pending.collect().height == 400
+
+    # Retired sources are purged once the grace period is over
+    compaction.compact_partition(day_dir, min_parts=2, grace=0)
+    assert sorted(day_dir.glob("*.parquet")) == [merged]
+    assert not list(day_dir.glob("*.retired"))
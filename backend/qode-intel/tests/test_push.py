@@ -0,0 +1,112 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from app.api import routes_push
+from app.services.broker import Broker, broker
+from app.services.jobs.store import JobStore
+from app.services.jobs.worker import JobWorkerPool
+
+
+def test_fan_out_by_topic_once_per_subscriber():
+    async def main():
+        broker = Broker()
+        both = broker.subscribe(["jobs", "job:a"])
+        one = broker.subscribe(["job:b"])
+        assert broker.publish(("jobs", "job:a"), "progress", {"job_id": "a"}) == 1
+        event = await both.get(timeout=1)
+        assert event.name == "progress" and json.loads(event.data) == {"job_id": "a"}
+        assert await both.get(timeout=0.01) is None  # not delivered twice
+        assert await one.get(timeout=0.01) is None
+        one.close()
+        assert broker.subscribers("job:b") == 0
+        assert broker.publish("job:b", "progress", {}) == 0
+
+    asyncio.run(main())
+
+
+def test_slow_subscriber_drops_oldest_without_blocking():
+    async def main():
+        broker = Broker(queue_size=3)
+        with broker.subscribe(["signal"]) as slow:
+            for i in range(10):
+                broker.publish("signal", "signal", {"i": i})
+            notice = await slow.get()
+            assert notice.name == "dropped" and json.loads(notice.data)["count"] == 7
+            got = [json.loads((await slow.get()).data)["i"] for _ in range(3)]
+            assert got == [7, 8, 9]
+            assert broker.metrics()["dropped"] == 7
+        assert broker.metrics()["subscribers"] == 0
+
+    asyncio.run(main())
+
+
+class _Request:
+    """Stand-in for the Starlette request an SSE stream polls."""
+
+    async def is_disconnected(self):
+        return False
+
+
+def test_sse_route_subscribes_only_while_streaming():
+    async def main():
+        response = await routes_push.push_events(_Request(), topics="signal,job:a")
+        # A client gone before the first chunk leaves nothing behind
+        assert broker.subscribers("signal") == 0
+        chunks = response.body_iterator
+        assert await chunks.__anext__() == b"retry: 3000\n\n"
+        assert broker.subscribers("signal") == broker.subscribers("job:a") == 1
+        broker.publish("job:a", "progress", {"n": 1})
+        assert await chunks.__anext__() == b'event: progress\ndata: {"n": 1}\n\n'
+        await chunks.aclose()
+        assert broker.subscribers("signal") == broker.subscribers("job:a") == 0
+
+    asyncio.run(main())
+
+
+def test_websocket_route_delivers_and_unsubscribes():
+    app = FastAPI()
+    app.include_router(routes_push.router)
+    client = TestClient(app)
+    assert client.get("/push/events", params={"topics": "nope"}).status_code == 422
+    with pytest.raises(WebSocketDisconnect):
+        with client.websocket_connect("/push/ws?topics=nope"):
+            pass
+
+    with client.websocket_connect("/push/ws?topics=jobs") as ws:
+        ws.portal.call(broker.publish, "jobs", "status", {"status": "done"})
+        assert ws.receive_json() == {"event": "status", "data": {"status": "done"}}
+    assert broker.subscribers("jobs") == 0
+
+
+def test_worker_publishes_progress_and_status(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+
+    async def handler(job, report):
+        await report(stage="scraping", raw_count=5)
+        return {"ok": True}
+
+    async def run():
+        with broker.subscribe(["jobs"]) as sub:
+            pool = JobWorkerPool(store, handler, concurrency=1, poll_interval=0.05)
+            await pool.start()
+            job = store.enqueue(["#nifty50"], 100)
+            pool.wake()
+            events = [await sub.get(timeout=5) for _ in range(2)]
+            await pool.stop()
+        return job["id"], events
+
+    job_id, (progress, status) = asyncio.run(run())
+    assert progress.name == "progress"
+    assert json.loads(progress.data) == {
+        "job_id": job_id,
+        "stage": "scraping",
+        "raw_count": 5,
+    }
+    assert status.name == "status"
+    assert json.loads(status.data) == {"job_id": job_id, "status": "done"}
+    assert store.get(job_id)["progress"]["raw_count"] == 5
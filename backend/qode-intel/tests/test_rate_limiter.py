@@ -0,0 +1,134 @@
+import asyncio
+import heapq
+import itertools
+from collections import Counter, deque
+
+from app.services.scraper.rate_limiter import AdaptiveLimiter, TokenBucket
+
+
+class FakeClock:
+    """
+    Simulated time: ``sleep`` parks the caller on a timer, and ``run`` jumps
+    from timer to timer once every task is blocked, so seconds of traffic
+    take milliseconds and don't depend on how loaded the machine is.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self._timers = []
+        self._seq = itertools.count()
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float):
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._timers, (self.now + seconds, next(self._seq), fut))
+        await fut
+
+    async def _settle(self):
+        for _ in range(50):
+            await asyncio.sleep(0)
+
+    async def run(self, seconds: float):
+        deadline = self.now + seconds
+        await self._settle()
+        while self._timers and self._timers[0][0] <= deadline:
+            at, _, fut = heapq.heappop(self._timers)
+            self.now = max(self.now, at)
+            if not fut.done():
+                fut.set_result(None)
+            await self._settle()
+        self.now = deadline
+
+
+class SimulatedServer:
+    """Accepts ``capacity`` requests per sliding second, 429 beyond that."""
+
+    def __init__(self, clock: FakeClock, capacity: float, base_latency=0.01):
+        self.clock = clock
+        self.capacity = capacity
+        self.base_latency = base_latency
+        self._recent = deque()
+        self.log = []  # (key, status)
+
+    async def request(self, key: str):
+        now = self.clock()
+        while self._recent and now - self._recent[0] > 1.0:
+            self._recent.popleft()
+        self._recent.append(now)
+        load = len(self._recent) / self.capacity
+        latency = self.base_latency * (1 + load)
+        await self.clock.sleep(latency)
+        status = 429 if load > 1.0 else 200
+        self.log.append((key, status))
+        return status, latency
+
+
+def test_concurrent_takes_are_debited():
+    async def run():
+        clock = FakeClock()
+        bucket = TokenBucket(rate=20, capacity=1, clock=clock, sleep=clock.sleep)
+        takes = asyncio.gather(*(bucket.take() for _ in range(10)))
+        await clock.run(0.44)
+        assert not takes.done()
+        await clock.run(0.02)
+        await takes
+
+    # The first token is in the bucket, the other nine take 1/20 s each
+    asyncio.run(run())
+
+
+def test_aimd_tracks_simulated_server_and_shares_fairly():
+    async def run(seconds):
+        clock = FakeClock()
+        server = SimulatedServer(clock, capacity=20)
+        limiter = AdaptiveLimiter(
+            rate=5,
+            max_rate=100,
+            increase=1.0,
+            burst=1,
+            cut_interval=0.2,
+            clock=clock,
+            sleep=clock.sleep,
+        )
+
+        async def scroll(key):
+            while True:
+                await limiter.acquire(key)
+                status, latency = await server.request(key)
+                limiter.record(status=status, latency=latency)
+
+        loops = ["#busy", "#busy", "#busy", "#quiet"]
+        tasks = [asyncio.create_task(scroll(k)) for k in loops]
+        await clock.run(seconds)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return server, limiter
+
+    seconds = 30.0
+    server, limiter = asyncio.run(run(seconds))
+    ok = Counter(k for k, status in server.log if status == 200)
+    assert sum(ok.values()) / seconds > 10  # vs 2/s for the fixed cadence
+    assert sum(s != 200 for _, s in server.log) / len(server.log) < 0.25
+    assert limiter.counts["throttled"] > 0 and limiter.rate < 100
+    # Round-robin per hashtag: one loop gets as much as three
+    assert ok["#quiet"] / sum(ok.values()) > 0.4
+
+
+def test_token_of_a_cancelled_waiter_goes_to_the_next():
+    async def run():
+        clock = FakeClock()
+        limiter = AdaptiveLimiter(
+            rate=1, burst=1, min_rate=1, clock=clock, sleep=clock.sleep
+        )
+        await limiter.acquire("a")  # the one token in the bucket
+        late = asyncio.create_task(limiter.acquire("a"))
+        other = asyncio.create_task(limiter.acquire("b"))
+        await clock.run(0.5)  # the dispatcher waits on a token for "a"
+        late.cancel()
+        await clock.run(0.6)
+        assert other.done() and limiter.counts["granted"] == 2
+
+    asyncio.run(run())
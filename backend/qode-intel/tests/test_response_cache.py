@@ -0,0 +1,74 @@
+import asyncio
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.services import response_cache as rc
+from app.services.storage import data_version
+
+
+def test_concurrent_misses_compute_once():
+    cache = rc.ResponseCache(max_bytes=1024)
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return b"png", "image/png"
+
+    async def main():
+        return await asyncio.gather(*(cache.get("k", compute) for _ in range(50)))
+
+    bodies = asyncio.run(main())
+    assert calls == 1
+    assert {b.body for b in bodies} == {b"png"}
+    m = cache.metrics()
+    assert (m["misses"], m["coalesced"]) == (1, 49)
+
+
+def test_lru_respects_byte_budget():
+    cache = rc.ResponseCache(max_bytes=10)
+
+    async def fill(key, size):
+        async def compute():
+            return b"x" * size, "image/png"
+
+        return await cache.get(key, compute)
+
+    async def main():
+        await fill("a", 4)
+        await fill("b", 4)
+        await fill("a", 4)  # a is now most recent
+        await fill("c", 4)  # evicts b
+        await fill("huge", 11)  # never stored
+
+    asyncio.run(main())
+    assert list(cache._entries) == ["a", "c"]
+    assert cache.bytes == 8
+    assert cache.metrics()["evictions"] == 1
+
+
+def test_etag_and_version_invalidation(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_version, "VERSION_FILE", tmp_path / "data_version")
+    cache = rc.ResponseCache()
+    calls = []
+    app = FastAPI()
+
+    @app.get("/thing")
+    async def thing(request: Request):
+        async def compute():
+            calls.append(1)
+            return f"v{len(calls)}".encode(), "text/plain"
+
+        return await rc.cached_response(request, "thing", {}, compute, cache)
+
+    client = TestClient(app)
+    r = client.get("/thing")
+    etag = r.headers["etag"]
+    r2 = client.get("/thing", headers={"If-None-Match": etag})
+    assert (r2.status_code, len(calls)) == (304, 1)
+
+    data_version.bump_data_version()
+    r3 = client.get("/thing", headers={"If-None-Match": etag})
+    assert (r3.status_code, r3.text, len(calls)) == (200, "v2", 2)
@@ -0,0 +1,141 @@
+import asyncio
+import random
+import threading
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+
+import polars as pl
+import pytest
+
+from app.api import routes_scrape
+from app.models.tweet import Tweet
+from app.services.storage import loader, signal_store, tfidf_store, writer
+from app.services.storage.dedup_index import DedupIndex
+from app.utils.time import last_24h_window
+
+WORDS = "nifty sensex bank rally slump breakout support resistance rbi fed".split()
+
+
+def _tweets(prefix, n, seed):
+    rng = random.Random(seed)
+    until = last_24h_window()[1]
+    return [
+        Tweet(
+            id=f"{prefix}{i}",
+            username="u",
+            timestamp=until - timedelta(minutes=10 + i),
+            content=" ".join(rng.choices(WORDS, k=14)) + f" {prefix}{i}",
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    (tmp_path / "parquet").mkdir()
+    for module in (writer, loader, signal_store):
+        monkeypatch.setattr(module, "PARQUET_PATH", tmp_path / "parquet")
+    monkeypatch.setattr(tfidf_store, "TFIDF_PATH", tmp_path / "tfidf")
+    monkeypatch.setattr(routes_scrape, "RAW_PATH", tmp_path)
+    index = DedupIndex(tmp_path / "dedup.npz")
+    monkeypatch.setattr(routes_scrape, "get_dedup_index", lambda: index)
+    return tmp_path / "parquet"
+
+
+def _backend(*batches):
+    async def scrape_stream(hashtags, since_utc, until_utc, limit):
+        for batch in batches:
+            yield batch
+
+    return SimpleNamespace(pw=SimpleNamespace(scrape_stream=scrape_stream))
+
+
+async def _report(**progress):
+    pass
+
+
+def test_a_rerun_of_the_same_job_keeps_the_earlier_parts(store):
+    first, second = _tweets("a", 40, 1), _tweets("b", 40, 2)
+    for tweets in (first, second):
+        # Both runs carry the same job id, as a released and re-claimed job does
+        asyncio.run(
+            routes_scrape._run_job("job", ["#x"], 100, _backend(tweets), _report)
+        )
+    parts = sorted(store.glob("date=*/part-job-*.parquet"))
+    stored = pl.concat([pl.read_parquet(p) for p in parts])
+    assert sorted(stored["id"]) == sorted(t.id for t in first + second)
+
+
+def test_an_interrupted_write_releases_the_claim(store, monkeypatch):
+    class Interrupted(BaseException):
+        pass
+
+    def write(df, job_id):
+        raise Interrupted
+
+    monkeypatch.setattr(routes_scrape, "write_parquet_partitioned", write)
+    index = routes_scrape.get_dedup_index()
+    df = routes_scrape.clean_and_dedupe_tweets(_tweets("c", 20, 3))
+    with pytest.raises(Interrupted):
+        routes_scrape._commit_batch(index, df, "job-run-0000")
+    assert not index.duplicates(df).any()
+
+
+def test_a_cancelled_job_still_folds_its_written_part_into_the_rollups(
+    store, monkeypatch
+):
+    writing = threading.Event()
+    write = routes_scrape.write_parquet_partitioned
+
+    def slow_write(df, job_id):
+        writing.set()
+        time.sleep(0.2)  # the cancel arrives while the part is being written
+        return write(df, job_id=job_id)
+
+    monkeypatch.setattr(routes_scrape, "write_parquet_partitioned", slow_write)
+    signal_store.update_signal_store(
+        routes_scrape.clean_and_dedupe_tweets(_tweets("seed", 5, 4))
+    )  # the pyramid exists, so nothing rebuilds it later
+
+    async def run():
+        job = asyncio.create_task(
+            routes_scrape._run_job(
+                "job", ["#x"], 100, _backend(_tweets("d", 30, 5)), _report
+            )
+        )
+        await asyncio.to_thread(writing.wait, 5)
+        job.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await job
+
+    asyncio.run(run())
+    stored = pl.concat([pl.read_parquet(p) for p in store.glob("date=*/*.parquet")])
+    until = last_24h_window()[1]
+    stats = signal_store.load_signal_stats(until - timedelta(days=1), until)
+    assert stored.height == 30 and stats["n"].sum() == 5 + stored.height
+
+
+def test_a_rollup_rebuild_waits_for_the_batch_being_committed(store, monkeypatch):
+    written = threading.Event()
+    update = routes_scrape.update_signal_store
+
+    def slow_update(df):
+        written.set()
+        time.sleep(0.2)  # a reader bootstraps the pyramid meanwhile
+        return update(df)
+
+    monkeypatch.setattr(routes_scrape, "update_signal_store", slow_update)
+    index = routes_scrape.get_dedup_index()
+    df = routes_scrape.clean_and_dedupe_tweets(_tweets("e", 25, 6))
+    job = threading.Thread(
+        target=routes_scrape._commit_batch, args=(index, df, "job-run-0000")
+    )
+    job.start()
+    assert written.wait(5)
+    until = last_24h_window()[1]
+    stats = signal_store.load_signal_stats(until - timedelta(days=1), until)
+    job.join()
+    assert stats["n"].sum() == 25
+    stats = signal_store.load_signal_stats(until - timedelta(days=1), until)
+    assert stats["n"].sum() == 25
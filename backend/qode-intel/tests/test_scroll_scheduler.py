@@ -0,0 +1,82 @@
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from app.services.scraper.scheduler import ScrollScheduler
+
+NOW = datetime(2025, 8, 30, 12, tzinfo=timezone.utc)
+# hashtag: (tweets per step, tweets available)
+YIELDS = {"#deep": (10, 1000), "#shallow": (5, 15), "#dead": (0, 0), "#mid": (5, 200)}
+
+
+@dataclass(frozen=True)
+class Tweet:
+    id: str
+    timestamp: datetime
+
+
+def _streams(open_now, peak, streamed):
+    async def stream(hashtag, before):
+        # Newest-first, one tweet a second; ``before`` resumes below it
+        per_step, depth = YIELDS[hashtag]
+        open_now.add(hashtag)
+        peak[0] = max(peak[0], len(open_now))
+        pos = 0 if before is None else int((NOW - before).total_seconds()) + 1
+        try:
+            empty = 0
+            while empty < 3:
+                await asyncio.sleep(0.001)
+                n = min(per_step, depth - pos)
+                if n <= 0:
+                    empty += 1
+                    continue
+                batch = [
+                    Tweet(f"{hashtag}-{i}", NOW - timedelta(seconds=i))
+                    for i in range(pos, pos + n)
+                ]
+                streamed[hashtag] += [t.id for t in batch]
+                yield batch
+                pos += n
+        finally:
+            open_now.discard(hashtag)
+
+    return stream
+
+
+def test_quota_of_exhausted_hashtags_flows_to_productive_ones():
+    open_now, peak = set(), [0]
+    stream = _streams(open_now, peak, {h: [] for h in YIELDS})
+    scheduler = ScrollScheduler(list(YIELDS), 300, 2, stream)
+
+    async def run():
+        return [t.id async for batch in scheduler.run() for t in batch]
+
+    ids = asyncio.run(run())
+    assert len(ids) == len(set(ids)) == 300  # stops exactly at the limit
+    assert peak[0] <= 2 and not open_now  # bounded pages, all released
+    assert scheduler.got["#shallow"] == 15 and scheduler.got["#dead"] == 0
+    assert scheduler.got["#deep"] + scheduler.got["#mid"] == 285
+    # Far beyond the static limit // 4 split
+    assert scheduler.got["#deep"] > 2 * 75
+
+
+def test_preempted_hashtag_resumes_below_its_cursor():
+    opened, peak = [], [0]
+    streamed = {h: [] for h in YIELDS}  # ids every (re)opened stream yielded
+    stream = _streams(set(), peak, streamed)
+
+    def tracked(hashtag, before):
+        opened.append((hashtag, before))
+        return stream(hashtag, before)
+
+    # One page: #deep is preempted at its quota while #mid waits, then resumed
+    scheduler = ScrollScheduler(["#deep", "#mid"], 500, 1, tracked)
+
+    async def run():
+        return [t.id async for batch in scheduler.run() for t in batch]
+
+    assert len(asyncio.run(run())) == 500
+    assert [h for h, _ in opened] == ["#deep", "#mid", "#deep"]
+    assert opened[2][1] == NOW - timedelta(seconds=249)
+    # The resumed stream did not scroll back over what it already produced
+    assert len(streamed["#deep"]) == len(set(streamed["#deep"])) == 250 + 50
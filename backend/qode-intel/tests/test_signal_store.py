@@ -0,0 +1,109 @@
+import multiprocessing
+
+import polars as pl
+from polars.testing import assert_frame_equal
+
+from app.services.processing.signals import compute_composite, finalize_stats
+from app.services.storage import signal_store
+from helpers import isolate_data_dir, synthetic_tweets
+
+
+def test_incremental_store_matches_full_recompute(tmp_path, monkeypatch):
+    monkeypatch.setattr(signal_store, "PARQUET_PATH", tmp_path)
+    df = synthetic_tweets(3000, seed=3)
+    # Overlapping buckets across batches must merge exactly
+    for batch in (df[:1000], df[1000:1700], df[1700:]):
+        signal_store.update_signal_store(batch)
+
+    ts = df["timestamp"]
+    stats = signal_store.load_signal_stats(ts.min(), ts.max())
+    assert_frame_equal(
+        finalize_stats(stats), compute_composite(df), check_exact=False, rtol=1e-9
+    )
+
+
+def _update_in_process(path, seed):
+    # The autouse fixture's patches don't reach a spawned process
+    isolate_data_dir(path)
+    signal_store.PARQUET_PATH = path
+    df = synthetic_tweets(1500, seed=seed)
+    for batch in (df[:500], df[500:1000], df[1000:]):
+        signal_store.update_signal_store(batch)
+
+
+def test_concurrent_processes_lose_no_updates(tmp_path, monkeypatch):
+    monkeypatch.setattr(signal_store, "PARQUET_PATH", tmp_path)
+    first = synthetic_tweets(10, seed=0)
+    signal_store.update_signal_store(first)  # the pyramid exists up front
+    ctx = multiprocessing.get_context("spawn")
+    procs = [
+        ctx.Process(target=_update_in_process, args=(tmp_path, seed))
+        for seed in (1, 2, 3)
+    ]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join(timeout=120)
+        assert proc.exitcode == 0
+
+    for level in signal_store.LEVELS:
+        stats = pl.read_parquet(signal_store.rollup_file(level))
+        assert stats["n"].sum() == first.height + 3 * 1500
+
+
+def test_rebuild_removes_the_legacy_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(signal_store, "PARQUET_PATH", tmp_path / "parquet")
+    legacy = tmp_path / "processed" / "signal_15m.parquet"
+    monkeypatch.setattr(signal_store, "LEGACY_STORE_FILE", legacy)
+    legacy.parent.mkdir()
+    synthetic_tweets(10).write_parquet(legacy)
+    df = synthetic_tweets(100, seed=6)
+    day = tmp_path / "parquet" / "date=2025-08-30"
+    day.mkdir(parents=True)
+    df.write_parquet(day / "part.parquet")
+
+    stats = signal_store.load_signal_stats(*df["timestamp"][[0, -1]])
+    assert stats["n"].sum() == df.height
+    assert not legacy.exists()
+
+
+def test_empty_store_loads_empty(tmp_path, monkeypatch):
+    monkeypatch.setattr(signal_store, "PARQUET_PATH", tmp_path)
+    df = synthetic_tweets(10)
+    assert signal_store.load_signal_stats(*df["timestamp"][[0, -1]]).is_empty()
+
+
+def test_pyramid_levels_match_direct_composite(tmp_path, monkeypatch):
+    monkeypatch.setattr(signal_store, "PARQUET_PATH", tmp_path)
+    df = synthetic_tweets(5000, seed=5)
+    for batch in (df[:2000], df[2000:]):
+        signal_store.update_signal_store(batch)
+    # Rollups are served without touching raw partitions
+    assert not list(tmp_path.glob("date=*"))
+
+    ts = df["timestamp"]
+    for bucket in ("1m", "15m", "30m", "1h", "2h", "1d"):
+        stats = signal_store.load_signal_stats(ts.min(), ts.max(), bucket)
+        assert_frame_equal(
+            finalize_stats(stats),
+            compute_composite(df, every=bucket),
+            check_exact=False,
+            rtol=1e-9,
+        )
+
+
+def test_signal_delta_is_the_touched_buckets_of_the_full_series(tmp_path, monkeypatch):
+    monkeypatch.setattr(signal_store, "PARQUET_PATH", tmp_path)
+    df = synthetic_tweets(3000, seed=4)
+    signal_store.update_signal_store(df[:2000])
+    late = df[2000:2100]
+    signal_store.update_signal_store(late)
+
+    delta = signal_store.signal_delta(late, "15m")
+    touched = late["timestamp"].dt.truncate("15m").unique()
+    expected = compute_composite(df[:2100], every="15m").filter(
+        pl.col("bucket").is_in(touched)
+    )
+    assert delta.height == expected.height > 0
+    assert_frame_equal(delta, expected, check_exact=False, rtol=1e-9)
+    assert signal_store.signal_delta(df[:0]).is_empty()
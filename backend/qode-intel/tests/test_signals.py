@@ -0,0 +1,66 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import polars as pl
+
+from app.services.processing.signals import (
+    BEAR_WORDS,
+    BULL_WORDS,
+    compute_breakdown,
+    compute_composite,
+    engagement_weight,
+    engagement_weight_expr,
+    lexical_signal,
+    with_lexical_signal,
+)
+
+
+def _reference_corpus(n: int = 500) -> pl.DataFrame:
+    rng = random.Random(7)
+    vocab = sorted(BULL_WORDS | BEAR_WORDS) + ["support", "Upside", "NIFTY50", "🚀", ""]
+    start = datetime(2025, 8, 30, tzinfo=timezone.utc)
+    return pl.DataFrame(
+        {
+            "content": [
+                " ".join(rng.choice(vocab) for _ in range(rng.randint(0, 8)))
+                for _ in range(n)
+            ],
+            "timestamp": [start + timedelta(minutes=i) for i in range(n)],
+            "like_count": [rng.randint(0, 500) for _ in range(n)],
+            "retweet_count": [rng.randint(0, 50) for _ in range(n)],
+            "reply_count": [rng.randint(0, 20) for _ in range(n)],
+            "quote_count": [rng.choice([0, 1, 3, None]) for _ in range(n)],
+        }
+    )
+
+
+def test_vectorised_scorer_matches_reference():
+    df = _reference_corpus()
+    out = with_lexical_signal(df, alias="lex").with_columns(
+        engagement_weight_expr().alias("w")
+    )
+    expected_lex = [lexical_signal(t) for t in df["content"]]
+    expected_w = [engagement_weight(r) for r in df.iter_rows(named=True)]
+    assert out["lex"].to_list() == expected_lex
+    assert all(abs(a - b) < 1e-12 for a, b in zip(out["w"], expected_w))
+
+
+def test_breakdown_matches_per_key_composite():
+    df = _reference_corpus().with_columns(
+        pl.Series(
+            "hashtags",
+            [[["a"], ["b", "a"], ["c", "c"], []][i % 4] for i in range(500)],
+        ),
+        pl.Series("username", [f"u{i % 3}" for i in range(500)]),
+    )
+    out = compute_breakdown(df, by="hashtag", every="1h", top_k=2)
+    # "a" is on half the tweets, "b" and "c" on a quarter each; "c" counted once
+    assert out["key"].unique(maintain_order=True).to_list() == ["a", "b"]
+    for key in ("a", "b"):
+        expected = compute_composite(
+            df.filter(pl.col("hashtags").list.contains(key)), every="1h"
+        )
+        got = out.filter(pl.col("key") == key).select(expected.columns)
+        assert got.equals(expected)
+    authors = compute_breakdown(df.lazy(), by="author", every="1h", top_k=10)
+    assert authors.group_by("key").agg(pl.col("n").sum())["n"].sum() == 500
@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta, timezone
+
+import polars as pl
+
+from app.services.processing.signals import compute_composite
+from app.services.storage import loader, tag_index, tfidf_store, writer
+from helpers import synthetic_tweets
+
+START = datetime(2025, 8, 30, 20, tzinfo=timezone.utc)
+TAGS = [["banknifty"], ["sensex"], ["banknifty", "sensex"], []]
+
+
+def _batch(n, seed):
+    return synthetic_tweets(n, seed=seed).with_columns(
+        pl.format("{}-{}", pl.lit(seed), pl.int_range(pl.len())).alias("id"),
+        (pl.lit(START) + pl.duration(minutes=7 * pl.int_range(pl.len()))).alias(
+            "timestamp"
+        ),
+        pl.Series("hashtags", [TAGS[i % 4] for i in range(n)]),
+        pl.Series("mentions", [["desk"] if i % 3 == 0 else [] for i in range(n)]),
+    )
+
+
+def test_tag_index_reads_only_matching_rows(tmp_path, monkeypatch):
+    monkeypatch.setattr(writer, "PARQUET_PATH", tmp_path)
+    monkeypatch.setattr(loader, "PARQUET_PATH", tmp_path)
+    monkeypatch.setattr(tfidf_store, "TFIDF_PATH", tmp_path / "tfidf")
+    df = pl.concat([_batch(300, 1), _batch(200, 2)])
+    writer.write_parquet_partitioned(df[:300], job_id="a")
+    writer.write_parquet_partitioned(df[300:], job_id="b")
+    since, until = START + timedelta(hours=2), START + timedelta(hours=30)
+
+    in_window = df.filter(pl.col("timestamp").is_between(since, until))
+    for filters, expr in [
+        ({"hashtag": "#BankNifty"}, pl.col("hashtags").list.contains("banknifty")),
+        (
+            {"hashtag": "sensex", "mention": "@desk"},
+            pl.col("hashtags").list.contains("sensex")
+            & pl.col("mentions").list.contains("desk"),
+        ),
+    ]:
+        expected = in_window.filter(expr)
+        got = tag_index.scan_tagged(since, until, filters, ["id", "timestamp"])
+        assert sorted(got["id"]) == sorted(expected["id"])
+
+    assert tag_index.scan_tagged(since, until, {"hashtag": "nope"}).is_empty()
+
+    tagged = tag_index.scan_tagged(since, until, {"hashtag": "sensex"})
+    expected = in_window.filter(pl.col("hashtags").list.contains("sensex"))
+    assert compute_composite(tagged).equals(compute_composite(expected))
+
+    X, _, _ = tfidf_store.window_tfidf(since, until, 500, {"hashtag": "banknifty"})
+    assert (
+        X.shape[0]
+        == in_window.filter(pl.col("hashtags").list.contains("banknifty")).height
+    )
+
+    # Parts written before the index existed fall back to a filtered scan
+    for path in tmp_path.glob("date=*/*.tags.npz"):
+        path.unlink()
+    assert tag_index.scan_tagged(since, until, {"hashtag": "sensex"}).equals(tagged)
+    X2, _, _ = tfidf_store.window_tfidf(since, until, 500, {"hashtag": "banknifty"})
+    assert X2.shape == X.shape
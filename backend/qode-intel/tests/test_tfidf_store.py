@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import polars as pl
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+
+from app.services.processing.vectorize import TOKEN_PATTERN
+from app.services.storage import loader, tfidf_store, writer
+from helpers import synthetic_tweets
+
+
+def _batch(n, seed, start):
+    return (
+        synthetic_tweets(n, seed=seed)
+        .with_columns(
+            pl.format("{}-{}", pl.lit(seed), pl.int_range(pl.len())).alias("id"),
+            (pl.lit(start) + pl.duration(minutes=pl.int_range(pl.len()))).alias(
+                "timestamp"
+            ),
+        )
+        .select("id", "timestamp", "content")
+    )
+
+
+def _sorted_rows(X):
+    X = X.tocsr()
+    return [np.sort(X[i].data) for i in range(X.shape[0])]
+
+
+def test_incremental_tfidf_matches_full_refit(tmp_path, monkeypatch):
+    monkeypatch.setattr(writer, "PARQUET_PATH", tmp_path)
+    monkeypatch.setattr(loader, "PARQUET_PATH", tmp_path)
+    monkeypatch.setattr(tfidf_store, "TFIDF_PATH", tmp_path / "tfidf")
+    start = datetime(2025, 8, 30, 20, tzinfo=timezone.utc)
+    since, until = start + timedelta(hours=1), start + timedelta(hours=8)
+
+    first = _batch(300, 1, start)
+    writer.write_parquet_partitioned(first, job_id="a")
+    assert tfidf_store.update_tfidf_cache(since, until) == 2  # two day parts
+    second = _batch(200, 2, start + timedelta(hours=4, minutes=30))
+    writer.write_parquet_partitioned(second, job_id="b")
+    # Only the new job's part needs vectorizing
+    assert tfidf_store.update_tfidf_cache(since, until) == 1
+    # Sparse per-column totals: no 2**20-long array per part
+    for cached in (tmp_path / "tfidf").glob("*/*.npz"):
+        assert cached.stat().st_size < 64_000
+
+    X, cols, sample = tfidf_store.window_tfidf(since, until, max_features=50000)
+    texts = (
+        pl.concat([first, second])
+        .filter(pl.col("timestamp").is_between(since, until))
+        .sort("timestamp")
+        .get_column("content")
+        .to_list()
+    )
+    ref = TfidfVectorizer(token_pattern=TOKEN_PATTERN, dtype=np.float32)
+    expected = ref.fit_transform(texts)
+    assert X.shape[0] == len(texts)
+    assert len(cols) == len(ref.vocabulary_)
+    assert set(sample) <= set(ref.vocabulary_)
+    got = sorted(_sorted_rows(X), key=lambda r: tuple(r))
+    want = sorted(_sorted_rows(expected), key=lambda r: tuple(r))
+    for g, w in zip(got, want):
+        np.testing.assert_allclose(g, w, rtol=1e-5)
+
+
+def test_max_features_keeps_the_most_frequent_terms(tmp_path, monkeypatch):
+    monkeypatch.setattr(writer, "PARQUET_PATH", tmp_path)
+    monkeypatch.setattr(loader, "PARQUET_PATH", tmp_path)
+    monkeypatch.setattr(tfidf_store, "TFIDF_PATH", tmp_path / "tfidf")
+    start = datetime(2025, 8, 30, 20, tzinfo=timezone.utc)
+    since, until = start + timedelta(hours=1), start + timedelta(hours=8)
+    batch = _batch(400, 3, start)
+    writer.write_parquet_partitioned(batch, job_id="a")
+    texts = (
+        batch.filter(pl.col("timestamp").is_between(since, until))
+        .get_column("content")
+        .to_list()
+    )
+
+    # Cut where the term totals drop, so ties cannot decide the vocabulary,
+    # and where ranking by document frequency would pick other terms
+    counts = CountVectorizer(token_pattern=TOKEN_PATTERN).fit_transform(texts)
+    totals = np.asarray(counts.sum(axis=0)).ravel()
+    docs = np.asarray((counts > 0).sum(axis=0)).ravel()
+    ranked = np.sort(totals)[::-1]
+    k = next(
+        i
+        for i in range(5, len(ranked))
+        if ranked[i - 1] > ranked[i]
+        and set(np.argsort(-totals)[:i]) != set(np.argsort(-docs, kind="stable")[:i])
+    )
+
+    X, cols, sample = tfidf_store.window_tfidf(since, until, max_features=k)
+    ref = TfidfVectorizer(token_pattern=TOKEN_PATTERN, max_features=k, dtype=np.float32)
+    expected = ref.fit_transform(texts)
+    assert len(cols) == k
+    assert set(sample) <= set(ref.vocabulary_)
+    got = sorted(_sorted_rows(X), key=lambda r: tuple(r))
+    want = sorted(_sorted_rows(expected), key=lambda r: tuple(r))
+    for g, w in zip(got, want):
+        np.testing.assert_allclose(g, w, rtol=1e-5)
@@ -0,0 +1,31 @@
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+from app.services.scraper.timeline import (
+    TimelineCapture,
+    is_timeline_url,
+    parse_timeline_payload,
+)
+
+FIXTURE = Path(__file__).parents[1] / "benchmarks" / "fixtures" / "search_timeline.json"
+
+
+def test_parse_recorded_search_timeline():
+    tweets = parse_timeline_payload(json.loads(FIXTURE.read_text()), "#Nifty50")
+    assert len(tweets) == 40
+    first = tweets[0]
+    assert first.timestamp == datetime(2025, 8, 30, 12, 0, tzinfo=timezone.utc)
+    assert first.username == "user0"
+    assert (first.like_count, first.retweet_count, first.lang) == (0, 0, "en")
+    assert "nifty50" in first.hashtags and "desk0" in first.mentions
+    # Visibility-wrapped entries are unwrapped, not dropped
+    assert tweets[9].like_count == 63
+
+
+def test_capture_tracks_oldest_and_filters_urls():
+    assert is_timeline_url("https://x.com/i/api/graphql/abc/SearchTimeline?x=1")
+    assert not is_timeline_url("https://x.com/i/api/2/badge_count.json")
+    capture = TimelineCapture("nifty50")
+    tweets = capture.feed(json.loads(FIXTURE.read_text()))
+    assert capture.oldest == min(t.timestamp for t in tweets)
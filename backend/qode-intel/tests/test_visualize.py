@@ -0,0 +1,17 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.processing.signals import compute_composite
+from app.services.processing.visualize import plot_signal
+from helpers import synthetic_tweets
+
+
+def test_renders_png_and_svg_from_worker_threads():
+    comp = compute_composite(synthetic_tweets(5000))
+    with ThreadPoolExecutor(4) as pool:
+        pngs = list(pool.map(lambda _: plot_signal(comp), range(8)))
+    assert all(p.startswith(b"\x89PNG") for p in pngs)
+    # Reused figures must not accumulate artists between renders
+    assert len(set(pngs)) == 1
+    assert plot_signal(comp, "svg").lstrip().startswith(b"<?xml")
+    assert plot_signal(comp.head(1)).startswith(b"\x89PNG")
+    assert plot_signal(comp.head(0)).startswith(b"\x89PNG")